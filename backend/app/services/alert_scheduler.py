@@ -0,0 +1,364 @@
+"""Incremental alert evaluation (docs/phase-4/alert-spec.md).
+
+Each run scans only ``metrics_daily`` and ``policy_products`` rows past the
+watermarks of the previous successful run, evaluates the alert rules for that
+batch and publishes the results on the alert hub. ``metrics_daily`` is walked
+by its ``(updated_at, id)`` keyset, so a day corrected in place is evaluated
+again, like the signal engine's ``updated_at`` watermark:
+
+- Settlement Delay: new ``metrics_daily`` rows with ``settlement_delay_count``.
+- Signal Change: businesses with new rows are re-evaluated by the signal
+  engine; a changed level raises an alert.
+- New Policy: newly inserted ``policy_products``.
+
+Every run is recorded in ``data_jobs``; the JSON ``message`` of the latest
+successful run carries the watermarks, so restarts resume where they left off.
+With no saved watermark (a fresh deploy) the first run starts at the newest
+existing rows instead of alerting owners about history.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set
+
+from services.aio import run_blocking
+from services.alert_hub import AlertHub, alert_hub
+from services.pagination import keyset_condition
+from services.policy_search import policy_index
+from services.supabase_client import supabase
+
+from .signal_engine import SignalEngine, signal_engine
+
+logger = logging.getLogger("foodbiz.ai")
+
+JOB_TYPE = "alert_scan"
+SCAN_INTERVAL = float(os.getenv("ALERT_SCAN_INTERVAL_SECONDS", 300))
+BATCH_SIZE = int(os.getenv("ALERT_SCAN_BATCH_SIZE", 1000))
+MAX_BATCHES = int(os.getenv("ALERT_SCAN_MAX_BATCHES", 50))
+POLICY_ALERT_LIMIT = 5
+
+SIGNAL_LABELS = {"green": "정상", "orange": "주의", "red": "위험"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class AlertScheduler:
+    def __init__(
+        self,
+        hub: AlertHub = alert_hub,
+        engine: SignalEngine = signal_engine,
+        *,
+        interval: float = SCAN_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+        max_batches: int = MAX_BATCHES,
+    ):
+        self.hub = hub
+        self.engine = engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        # Keysets of the last row seen: (updated_at, id) for metrics_daily,
+        # (created_at, id) for policy_products (uuid ids).
+        self.watermarks: Dict[str, Any] = {
+            "metrics_daily": {"updated_at": None, "id": None},
+            "policy_products": {"created_at": None, "id": None},
+        }
+        self.reports: Deque[Dict[str, Any]] = deque(maxlen=20)
+        self._loaded = False
+        # The background loop and the admin trigger must not scan the same window twice.
+        self._run_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # --- watermarks ------------------------------------------------------------
+
+    def load_watermarks(self) -> bool:
+        """Restore the latest saved watermarks; ``False`` when none were ever saved."""
+        rows = (
+            supabase.table("data_jobs")
+            .select("message")
+            .eq("job_type", JOB_TYPE)
+            .eq("status", "success")
+            .order("finished_at", desc=True)
+            .limit(1)
+            .execute()
+            .data
+            or []
+        )
+        self._loaded = True
+        if not rows:
+            return False
+        try:
+            saved = json.loads(rows[0].get("message") or "{}").get("watermarks") or {}
+        except (TypeError, ValueError):
+            logger.warning("Ignoring unreadable alert_scan watermark: %s", rows[0].get("message"))
+            return False
+        policy_mark = saved.get("policy_products")
+        if isinstance(policy_mark, dict) and "ids" in policy_mark:
+            # Older runs stored the ids seen at created_at instead of a keyset.
+            saved["policy_products"] = {
+                "created_at": policy_mark.get("created_at"),
+                "id": max(policy_mark["ids"], default=None),
+            }
+        metrics_mark = saved.get("metrics_daily")
+        if metrics_mark is not None and not isinstance(metrics_mark, dict):
+            # Older runs stored the last id only; resume from that row's updated_at.
+            row = (
+                supabase.table("metrics_daily").select("id, updated_at").eq("id", metrics_mark).limit(1).execute().data
+                or []
+            )
+            if not row or not row[0].get("updated_at"):
+                return False  # the row is gone: start past the newest rows instead of rescanning
+            saved["metrics_daily"] = {"updated_at": str(row[0]["updated_at"]), "id": int(row[0]["id"])}
+        self.watermarks.update({key: value for key, value in saved.items() if key in self.watermarks})
+        return bool(saved)
+
+    def seed_watermarks(self) -> None:
+        """Start past every existing row, so nothing already stored raises an alert."""
+        latest_metric = (
+            supabase.table("metrics_daily")
+            .select("id, updated_at")
+            .order("updated_at", desc=True)
+            .order("id", desc=True)
+            .limit(1)
+            .execute()
+            .data
+            or []
+        )
+        latest_product = (
+            supabase.table("policy_products")
+            .select("id, created_at")
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+            .limit(1)
+            .execute()
+            .data
+            or []
+        )
+        if latest_metric:
+            self.watermarks["metrics_daily"] = {
+                "updated_at": str(latest_metric[0]["updated_at"]),
+                "id": int(latest_metric[0]["id"]),
+            }
+        if latest_product:
+            self.watermarks["policy_products"] = {
+                "created_at": str(latest_product[0]["created_at"]),
+                "id": str(latest_product[0]["id"]),
+            }
+
+    def _metrics_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        mark = self.watermarks["metrics_daily"]
+        for _ in range(self.max_batches):
+            builder = supabase.table("metrics_daily").select(
+                "id, business_id, metric_date, settlement_delay_count, updated_at"
+            )
+            if mark["updated_at"]:
+                builder = builder.or_(
+                    keyset_condition("updated_at", mark["updated_at"], mark["id"] or 0, descending=False)
+                )
+            rows = (
+                builder.order("updated_at", desc=False)
+                .order("id", desc=False)
+                .limit(self.batch_size)
+                .execute()
+                .data
+                or []
+            )
+            if not rows:
+                return
+            yield rows
+            mark = {"updated_at": str(rows[-1]["updated_at"]), "id": int(rows[-1]["id"])}
+            self.watermarks["metrics_daily"] = mark
+            if len(rows) < self.batch_size:
+                return
+
+    def _policy_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        mark = self.watermarks["policy_products"]
+        for _ in range(self.max_batches):
+            builder = supabase.table("policy_products").select("id, name, group_name, created_at")
+            if mark["created_at"]:
+                # Keyset on (created_at, id): a bulk import sharing one
+                # created_at still pages forward instead of stalling.
+                builder = builder.or_(
+                    keyset_condition("created_at", mark["created_at"], mark["id"] or "", descending=False)
+                )
+            rows = (
+                builder.order("created_at", desc=False)
+                .order("id", desc=False)
+                .limit(self.batch_size)
+                .execute()
+                .data
+                or []
+            )
+            if not rows:
+                return
+            yield rows
+            mark = {"created_at": str(rows[-1]["created_at"]), "id": str(rows[-1]["id"])}
+            self.watermarks["policy_products"] = mark
+            if len(rows) < self.batch_size:
+                return
+
+    # --- rules -----------------------------------------------------------------
+
+    def _settlement_alerts(self, rows: List[Dict[str, Any]]) -> int:
+        delayed: Dict[str, int] = {}
+        for row in rows:
+            count = int(row.get("settlement_delay_count") or 0)
+            if count > 0 and row.get("business_id"):
+                delayed[str(row["business_id"])] = delayed.get(str(row["business_id"]), 0) + count
+        for business_id, count in delayed.items():
+            self.hub.publish(
+                business_id,
+                "settlement_delay",
+                f"정산 지연 {count}건이 새로 확인됐어요. 정산 일정을 확인해 주세요.",
+                delayCount=count,
+            )
+        return len(delayed)
+
+    def _signal_alerts(self, business_ids: Set[str]) -> int:
+        alerts = 0
+        ordered = sorted(business_ids)
+        for start in range(0, len(ordered), self.batch_size):
+            for previous, record in self.engine.refresh(ordered[start:start + self.batch_size]):
+                if previous is None or previous == record["signal"]:
+                    continue
+                self.hub.publish(
+                    record["business_id"],
+                    "signal_change",
+                    f"시그널이 '{SIGNAL_LABELS.get(previous, previous)}'에서 "
+                    f"'{SIGNAL_LABELS.get(record['signal'], record['signal'])}'(으)로 바뀌었어요.",
+                    previousSignal=previous,
+                    signal=record["signal"],
+                )
+                alerts += 1
+        return alerts
+
+    def _policy_alerts(self, products: List[Dict[str, Any]]) -> int:
+        if len(products) > POLICY_ALERT_LIMIT:
+            names = ", ".join(product["name"] for product in products[:3])
+            self.hub.publish(None, "new_policy", f"새 정책 상품 {len(products)}건이 등록됐어요: {names} 외")
+            return 1
+        for product in products:
+            self.hub.publish(
+                None,
+                "new_policy",
+                f"새 정책 상품 '{product['name']}'이(가) 등록됐어요.",
+                policyId=str(product["id"]),
+            )
+        return len(products)
+
+    # --- runs ------------------------------------------------------------------
+
+    def _start_job(self) -> Optional[Any]:
+        rows = (
+            supabase.table("data_jobs")
+            .insert({"job_type": JOB_TYPE, "status": "running", "run_at": _now()})
+            .execute()
+            .data
+            or []
+        )
+        return rows[0].get("id") if rows else None
+
+    def _finish_job(self, job_id: Optional[Any], status: str, message: str) -> None:
+        values = {"status": status, "message": message, "finished_at": _now()}
+        if job_id is None:
+            supabase.table("data_jobs").insert({"job_type": JOB_TYPE, **values}).execute()
+        else:
+            supabase.table("data_jobs").update(values).eq("id", job_id).execute()
+
+    def run_once(self) -> Dict[str, Any]:
+        """Scan new rows once; blocking, so call it from a worker thread.
+
+        Concurrent calls run one after another, so a window is scanned once.
+        """
+        with self._run_lock:
+            return self._run_once()
+
+    def _run_once(self) -> Dict[str, Any]:
+        seeded = False
+        if not self._loaded and not self.load_watermarks():
+            self.seed_watermarks()
+            seeded = True
+        started = time.perf_counter()
+        checkpoint = copy.deepcopy(self.watermarks)
+        job_id = self._start_job()
+        report: Dict[str, Any] = {
+            "started_at": _now(),
+            "metrics_rows": 0,
+            "policy_rows": 0,
+            "businesses": 0,
+            "alerts": {"settlement_delay": 0, "signal_change": 0, "new_policy": 0},
+            "seeded": seeded,
+        }
+        try:
+            changed: Set[str] = set()
+            for rows in self._metrics_batches():
+                report["metrics_rows"] += len(rows)
+                report["alerts"]["settlement_delay"] += self._settlement_alerts(rows)
+                changed.update(str(row["business_id"]) for row in rows if row.get("business_id"))
+            report["businesses"] = len(changed)
+            report["alerts"]["signal_change"] = self._signal_alerts(changed)
+
+            for products in self._policy_batches():
+                policy_index.invalidate()
+                report["policy_rows"] += len(products)
+                report["alerts"]["new_policy"] += self._policy_alerts(products)
+        except Exception as error:
+            report["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            report["error"] = str(error)
+            self._finish_job(job_id, "failed", json.dumps(report, ensure_ascii=False))
+            self.reports.append(report)
+            # Rescan the whole window next time: a repeated alert beats a lost one.
+            self.watermarks = checkpoint
+            raise
+
+        report["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        report["watermarks"] = self.watermarks
+        self._finish_job(job_id, "success", json.dumps(report, ensure_ascii=False))
+        self.reports.append(report)
+        logger.info(json.dumps({"event": "alert_scan", **report}, ensure_ascii=False, default=str))
+        return report
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await run_blocking(self.run_once)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:  # pragma: no cover - keep the scheduler alive
+                logger.warning("Alert scan failed: %s", error)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "watermarks": self.watermarks,
+            "reports": list(self.reports)[::-1],
+        }
+
+
+alert_scheduler = AlertScheduler()
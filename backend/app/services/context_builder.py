@@ -1,32 +1,47 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Dict, List, Optional
 
 from app.services.metrics_service import fetch_timeseries
-from services.reviews_service import get_review_summary, list_recent_reviews
-from services.policy_service import (
+from app.services.timeseries_analytics import fetch_analytics
+from services.aio import (
+    run_blocking,
+    get_review_summary,
+    list_recent_reviews,
     list_policy_recommendations,
     list_policy_products,
 )
 from app.services import rag_indexer
-
-FINANCE_KEYWORDS = [
-    "금융",
-    "자금",
-    "대출",
-    "적금",
-    "예금",
-    "카드",
-    "보증",
-    "운영자금",
-]
+from app.services.context_cache import context_cache
+from app.services.intent_matcher import FINANCE, FINANCE_KEYWORDS, match_intents
 
 logger = logging.getLogger(__name__)
 
 
+def _get_timeout(env_name: str, default: float) -> float:
+    try:
+        return float(os.getenv(env_name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# Per-source deadlines (seconds) for build_context's concurrent fan-out.
+SOURCE_TIMEOUTS: Dict[str, float] = {
+    "metrics": _get_timeout("CONTEXT_TIMEOUT_METRICS", 2.0),
+    "analytics": _get_timeout("CONTEXT_TIMEOUT_METRICS", 2.0),
+    "reviews": _get_timeout("CONTEXT_TIMEOUT_REVIEWS", 2.0),
+    "policies": _get_timeout("CONTEXT_TIMEOUT_POLICIES", 2.0),
+    "documents": _get_timeout("CONTEXT_TIMEOUT_DOCUMENTS", 3.0),
+}
+
+_SKIPPED = object()
+
+
 @dataclass
 class ContextBundle:
     contexts: List[str] = field(default_factory=list)
@@ -38,11 +53,6 @@ class ContextBundle:
     meta: Dict[str, Any] = field(default_factory=dict)
 
 
-def _is_finance_intent(query: str) -> bool:
-    lowered = query.lower()
-    return any(keyword in lowered for keyword in FINANCE_KEYWORDS)
-
-
 def _summarise_metrics(series: List[Dict[str, Any]]) -> Optional[str]:
     if not series:
         return None
@@ -55,22 +65,121 @@ def _summarise_metrics(series: List[Dict[str, Any]]) -> Optional[str]:
     )
 
 
-def build_context(
+async def _fetch_metrics(
+    business_id: str,
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> tuple[List[Dict[str, Any]], Dict[str, Optional[float]]]:
+    return await context_cache.get_or_load(
+        business_id,
+        "metrics",
+        lambda: run_blocking(fetch_timeseries, business_id, date_from, date_to),
+        params=(date_from, date_to),
+    )
+
+
+async def _fetch_analytics(
+    business_id: str,
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> Dict[str, Optional[float]]:
+    # Cached under the metrics source so metrics invalidation drops it too.
+    return await context_cache.get_or_load(
+        business_id,
+        "metrics",
+        lambda: run_blocking(fetch_analytics, business_id, date_from, date_to),
+        params=("analytics", date_from, date_to),
+    )
+
+
+async def _fetch_reviews(business_id: str) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    async def _load() -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        summary, recent_reviews = await asyncio.gather(
+            get_review_summary(business_id),
+            list_recent_reviews(business_id, limit=3),
+        )
+        return summary, recent_reviews
+
+    return await context_cache.get_or_load(business_id, "reviews", _load)
+
+
+async def _fetch_policies(business_id: Optional[str], query: str, finance_intent: bool) -> List[Dict[str, Any]]:
+    policy_entries: List[Dict[str, Any]] = []
+    if business_id:
+        recommendations = await context_cache.get_or_load(
+            business_id,
+            "policies",
+            lambda: list_policy_recommendations(business_id),
+        )
+        if recommendations:
+            policy_entries.extend(recommendations)
+    if not policy_entries:
+        grouped_products = await list_policy_products(limit=5, query_text=query if finance_intent else None)
+        for group in grouped_products:
+            policy_entries.extend(group.get("products", []))
+    return policy_entries
+
+
+async def _fetch_documents(query: str, top_k: int, business_id: Optional[str]) -> List[Dict[str, Any]]:
+    return await run_blocking(rag_indexer.vector_search, query, top_k=top_k, business_id=business_id)
+
+
+async def _with_deadline(name: str, coro: Awaitable[Any], timeout: float) -> Any:
+    try:
+        return await asyncio.wait_for(coro, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Context source %s missed its %.1fs deadline", name, timeout)
+        return _SKIPPED
+    except Exception as exc:
+        logger.warning("Failed to build %s context: %s", name, exc)
+        return _SKIPPED
+
+
+async def build_context(
     query: str,
     business_id: Optional[str],
     *,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     top_k_docs: int = 5,
+    timeouts: Optional[Dict[str, float]] = None,
+    search_private: bool = False,
 ) -> ContextBundle:
+    """Collect metrics, reviews, policies and documents concurrently.
+
+    Each source runs under its own deadline (``SOURCE_TIMEOUTS`` merged with
+    ``timeouts``). A source that times out or fails is left out of the bundle
+    and listed in ``meta["skipped_sources"]``.
+
+    Documents come from the business's private partition only with
+    ``search_private``, which callers set once they have verified that the
+    requester owns ``business_id``; otherwise only the shared corpus is read.
+    """
     bundle = ContextBundle()
-    finance_intent = _is_finance_intent(query)
+    intent_match = match_intents(query)
+    finance_intent = intent_match.has(FINANCE)
+    deadlines = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+
+    tasks: Dict[str, Awaitable[Any]] = {}
+    if business_id:
+        tasks["metrics"] = _fetch_metrics(business_id, date_from, date_to)
+        tasks["analytics"] = _fetch_analytics(business_id, date_from, date_to)
+        tasks["reviews"] = _fetch_reviews(business_id)
+    tasks["policies"] = _fetch_policies(business_id, query, finance_intent)
+    tasks["documents"] = _fetch_documents(query, top_k_docs, business_id if search_private else None)
+
+    names = list(tasks)
+    outcomes = await asyncio.gather(
+        *(_with_deadline(name, tasks[name], deadlines[name]) for name in names)
+    )
+    results = dict(zip(names, outcomes))
+    skipped_sources = [name for name in names if results[name] is _SKIPPED]
 
     # Metrics
     series: List[Dict[str, Any]] = []
     stats: Dict[str, Optional[float]] = {"moving_avg_7": None, "pct_change_7d": None}
-    if business_id:
-        series, stats = fetch_timeseries(business_id, date_from, date_to)
+    if business_id and results["metrics"] is not _SKIPPED:
+        series, stats = results["metrics"]
         if series:
             bundle.contexts.append(_summarise_metrics(series))
             bundle.sources.append(
@@ -85,55 +194,41 @@ def build_context(
                 }
             )
         bundle.metrics = {"series": series, "stats": stats}
+    if business_id and results["analytics"] is not _SKIPPED:
+        bundle.metrics["analytics"] = results["analytics"]
 
     # Reviews
-    if business_id:
-        try:
-            summary = get_review_summary(business_id)
-            if summary and summary.get("review_count"):
-                bundle.reviews = summary
-                bundle.contexts.append(
-                    (
-                        f"[리뷰 요약] 총 {summary['review_count']}건, 평균 {summary['average_rating']:.2f}점, "
-                        f"부정 {summary['negative_count']}건"
-                    )
-                )
-                recent_reviews = list_recent_reviews(business_id, limit=3)
-                if recent_reviews:
-                    for review in recent_reviews:
-                        content = (review.get("content") or "").strip()
-                        rating = review.get("rating")
-                        if content:
-                            bundle.contexts.append(f"리뷰 ({rating}점): {content[:160]}")
-                bundle.sources.append(
-                    {
-                        "type": "sql",
-                        "name": "public.reviews",
-                        "meta": {
-                            "business_id": business_id,
-                            "review_count": str(summary.get("review_count")),
-                            "average_rating": f"{summary.get('average_rating', 0):.2f}",
-                        },
-                    }
+    if business_id and results["reviews"] is not _SKIPPED:
+        summary, recent_reviews = results["reviews"]
+        if summary and summary.get("review_count"):
+            bundle.reviews = summary
+            bundle.contexts.append(
+                (
+                    f"[리뷰 요약] 총 {summary['review_count']}건, 평균 {summary['average_rating']:.2f}점, "
+                    f"부정 {summary['negative_count']}건"
                 )
-        except Exception as exc:  # pragma: no cover
-            logger.warning("Failed to build review context: %s", exc)
+            )
+            for review in recent_reviews or []:
+                content = (review.get("content") or "").strip()
+                rating = review.get("rating")
+                if content:
+                    bundle.contexts.append(f"리뷰 ({rating}점): {content[:160]}")
+            bundle.sources.append(
+                {
+                    "type": "sql",
+                    "name": "public.reviews",
+                    "meta": {
+                        "business_id": business_id,
+                        "review_count": str(summary.get("review_count")),
+                        "average_rating": f"{summary.get('average_rating', 0):.2f}",
+                    },
+                }
+            )
 
     # Policies
     policy_meta: Dict[str, Any] = {}
-    try:
-        policy_entries: List[Dict[str, Any]] = []
-        if business_id:
-            recommendations = list_policy_recommendations(business_id)
-            if recommendations:
-                for rec in recommendations:
-                    policy_entries.append(rec)
-        if not policy_entries:
-            grouped_products = list_policy_products(limit=5, query_text=query if finance_intent else None)
-            for group in grouped_products:
-                for product in group.get("products", []):
-                    policy_entries.append(product)
-
+    if results["policies"] is not _SKIPPED:
+        policy_entries: List[Dict[str, Any]] = results["policies"]
         policy_names = [item.get("name") for item in policy_entries if item.get("name")]
         top_policy_names = [name for name in policy_names[:3] if name]
         if top_policy_names:
@@ -150,11 +245,11 @@ def build_context(
                     },
                 }
             )
-    except Exception as exc:  # pragma: no cover
-        logger.warning("Failed to build policy context: %s", exc)
 
     # Documents
-    documents = rag_indexer.vector_search(query, top_k=top_k_docs)
+    documents: List[Dict[str, Any]] = []
+    if results["documents"] is not _SKIPPED:
+        documents = results["documents"] or []
     if documents:
         bundle.documents = documents
         for doc in documents:
@@ -179,9 +274,11 @@ def build_context(
         "today": date.today().isoformat(),
         "metrics_window": len(series) if series else 0,
         "reviews_window": 30,
-        "policy_keywords": ", ".join([kw for kw in FINANCE_KEYWORDS if kw in query]),
+        "policy_keywords": ", ".join([kw for kw in intent_match.keywords if kw in FINANCE_KEYWORDS]),
         "policy_group": policy_meta.get("top_products", [None])[0] if policy_meta.get("top_products") else "",
         "top_k_docs": len(documents),
+        "skipped_sources": skipped_sources,
+        "date_hints": ", ".join(intent_match.date_hints),
     }
 
     return bundle
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def _get_float(env_name: str, default: float) -> float:
+    try:
+        return float(os.getenv(env_name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# metrics_daily is refreshed by the nightly Hometax ingestion, so it can live
+# much longer than reviews, which arrive throughout the day.
+DEFAULT_TTLS: Dict[str, float] = {
+    "metrics": _get_float("CONTEXT_CACHE_TTL_METRICS", 6 * 60 * 60),
+    "reviews": _get_float("CONTEXT_CACHE_TTL_REVIEWS", 10 * 60),
+    "policies": _get_float("CONTEXT_CACHE_TTL_POLICIES", 30 * 60),
+}
+
+CacheKey = Tuple[str, str, Tuple[Hashable, ...]]
+
+
+class ContextCache:
+    """LRU cache of context-builder source results keyed by business and source.
+
+    Entries expire after the TTL of their source and the cache never holds
+    more than ``max_entries`` items; the least recently used entry is evicted
+    first. Writes that change a business's data should call ``invalidate``.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, source: str, field: str, amount: int = 1) -> None:
+        counters = self._counters.setdefault(source, {"hits": 0, "misses": 0, "evictions": 0})
+        counters[field] += amount
+
+    def get(self, business_id: str, source: str, params: Tuple[Hashable, ...] = ()) -> Tuple[bool, Any]:
+        key = (business_id, source, params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._count(source, "misses")
+                return False, None
+            self._entries.move_to_end(key)
+            self._count(source, "hits")
+            return True, entry[1]
+
+    def set(self, business_id: str, source: str, value: Any, params: Tuple[Hashable, ...] = ()) -> None:
+        ttl = self.ttls.get(source, 0)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        key = (business_id, source, params)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                (_biz, evicted_source, _params), _entry = self._entries.popitem(last=False)
+                self._count(evicted_source, "evictions")
+
+    async def get_or_load(
+        self,
+        business_id: str,
+        source: str,
+        loader: Callable[[], Awaitable[Any]],
+        params: Tuple[Hashable, ...] = (),
+    ) -> Any:
+        hit, value = self.get(business_id, source, params)
+        if hit:
+            return value
+        value = await loader()
+        self.set(business_id, source, value, params)
+        return value
+
+    def invalidate(self, business_id: Optional[str] = None, source: Optional[str] = None) -> int:
+        """Drop entries for a business and/or source; no arguments clears everything."""
+        with self._lock:
+            if business_id is None and source is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            stale = [
+                key
+                for key in self._entries
+                if (business_id is None or key[0] == business_id) and (source is None or key[1] == source)
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sources = {name: dict(counters) for name, counters in self._counters.items()}
+            size = len(self._entries)
+        hits = sum(counters["hits"] for counters in sources.values())
+        misses = sum(counters["misses"] for counters in sources.values())
+        lookups = hits + misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "sources": sources,
+        }
+
+
+# data_jobs.job_type keywords mapped to the cached source they refresh.
+_JOB_SOURCES: Dict[str, str] = {
+    "review": "reviews",
+    "policy": "policies",
+}
+
+
+def source_for_job(job_type: Optional[str]) -> str:
+    """Map a ``data_jobs.job_type`` to the cache source its ingestion refreshes."""
+    lowered = (job_type or "").lower()
+    for keyword, source in _JOB_SOURCES.items():
+        if keyword in lowered:
+            return source
+    return "metrics"
+
+
+context_cache = ContextCache(max_entries=int(_get_float("CONTEXT_CACHE_MAX_ENTRIES", 2048)))
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from app.services.intent_matcher import SQL_TIME_SERIES, IntentMatch, match_intents
+
+VECTOR_SEARCH = "VECTOR_SEARCH"
+
+
+def classify(query: str) -> IntentMatch:
+    """Return every intent and date hint detected in ``query`` in one pass."""
+    return match_intents(query or "")
+
+
+def route(query: str) -> str:
+    """Pick the retrieval path: SQL timeseries for sales/trend questions, vector search otherwise."""
+    if classify(query).has(SQL_TIME_SERIES):
+        return SQL_TIME_SERIES
+    return VECTOR_SEARCH
@@ -0,0 +1,238 @@
+"""Background RAG index builds recorded in ``data_jobs``.
+
+``POST /rag/index`` returns a job id immediately; the build runs in a worker
+thread and reports files parsed, chunks embedded and an ETA through
+``GET /rag/index/jobs/{job_id}``. Only one build per persist directory runs
+at a time: submitting while one is active returns the active job and marks a
+rerun as pending, because the running build may already have scanned past the
+change that prompted the submit. One follow-up build starts when it finishes,
+however many submits arrived meanwhile.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.aio import run_blocking
+from services.supabase_client import supabase
+
+from . import rag_indexer
+
+logger = logging.getLogger("foodbiz.ai")
+
+JOB_TYPE = "rag_index"
+MAX_HISTORY = 50
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class IndexJob:
+    __slots__ = (
+        "id", "docs_dir", "persist_dir", "options", "status", "progress", "report", "error",
+        "created_at", "finished_at", "_started", "_embed_started", "_ended",
+    )
+
+    def __init__(self, job_id: str, docs_dir: str, persist_dir: str, options: Optional[Dict[str, Any]] = None):
+        self.id = job_id
+        self.docs_dir = docs_dir
+        self.persist_dir = persist_dir
+        self.options = options or {}
+        self.status = "running"
+        self.progress: Dict[str, Any] = {}
+        self.report: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = _now()
+        self.finished_at: Optional[str] = None
+        self._started = time.monotonic()
+        self._embed_started: Optional[float] = None
+        self._ended: Optional[float] = None
+
+    def update(self, progress: Dict[str, Any]) -> None:
+        """Progress callback; runs on the build thread."""
+        if progress.get("stage") == "embedding" and self._embed_started is None:
+            self._embed_started = time.monotonic()
+        self.progress = progress
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = _now()
+        self._ended = time.monotonic()
+
+    def eta_seconds(self) -> Optional[float]:
+        progress = self.progress
+        if self.status != "running" or not progress:
+            return None
+        now = time.monotonic()
+        if progress.get("stage") == "embedding" and self._embed_started is not None:
+            done, total, since = progress["chunks_embedded"], progress["chunks_total"], self._embed_started
+        else:
+            done, total, since = progress.get("files_parsed", 0), progress.get("files_total", 0), self._started
+        if not done:
+            return None  # no rate to extrapolate from yet
+        return round((now - since) / done * max(0, total - done), 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "docs_dir": self.docs_dir,
+            "persist_dir": self.persist_dir,
+            "progress": self.progress,
+            "eta_seconds": self.eta_seconds(),
+            "elapsed_seconds": round((self._ended or time.monotonic()) - self._started, 1),
+            "report": self.report,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IndexJobManager:
+    def __init__(self, build: Callable[..., Dict[str, Any]] = rag_indexer.build_index):
+        self.build = build
+        self._jobs: "OrderedDict[str, IndexJob]" = OrderedDict()
+        self._active: Dict[str, IndexJob] = {}
+        self._rerun: Dict[str, Tuple[str, str, Dict[str, Any]]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    # --- data_jobs -------------------------------------------------------------
+
+    def _record_start(self, docs_dir: str, persist_dir: str) -> str:
+        message = json.dumps({"docs_dir": docs_dir, "persist_dir": persist_dir}, ensure_ascii=False)
+        try:
+            rows = (
+                supabase.table("data_jobs")
+                .insert({"job_type": JOB_TYPE, "status": "running", "message": message, "run_at": _now()})
+                .execute()
+                .data
+                or []
+            )
+        except Exception as error:  # pragma: no cover - the build must not depend on Supabase
+            logger.warning("Could not record rag_index job: %s", error)
+            rows = []
+        if rows and rows[0].get("id") is not None:
+            return str(rows[0]["id"])
+        return f"local-{uuid.uuid4().hex[:12]}"
+
+    def _record_finish(self, job: IndexJob) -> None:
+        if job.id.startswith("local-"):
+            return
+        message = {"docs_dir": job.docs_dir, "persist_dir": job.persist_dir, "report": job.report, "error": job.error}
+        try:
+            supabase.table("data_jobs").update(
+                {"status": job.status, "message": json.dumps(message, ensure_ascii=False), "finished_at": job.finished_at}
+            ).eq("id", job.id).execute()
+        except Exception as error:  # pragma: no cover
+            logger.warning("Could not finish rag_index job %s: %s", job.id, error)
+
+    # --- jobs ------------------------------------------------------------------
+
+    async def submit(self, docs_dir: str, persist_dir: str, **options: Any) -> Dict[str, Any]:
+        """Start a build, or return the one already running for ``persist_dir``.
+
+        ``options`` (e.g. ``partitioned=True``) are passed on to the build.
+        A submit that lands on a running build queues one follow-up build
+        (``rerun_pending``) with the latest arguments.
+        """
+        key = os.path.abspath(persist_dir)
+        active = self._active.get(key)
+        if active is None:
+            job_id = await run_blocking(self._record_start, docs_dir, persist_dir)
+            active = self._active.get(key)  # another submit may have won while we awaited
+        if active is not None:
+            self._rerun[key] = (docs_dir, persist_dir, options)
+            return {**active.to_dict(), "already_running": True, "rerun_pending": True}
+        job = IndexJob(job_id, docs_dir, persist_dir, options)
+        self._active[key] = job
+        self._jobs[job.id] = job
+        while len(self._jobs) > MAX_HISTORY:
+            self._jobs.popitem(last=False)
+        self._tasks[job.id] = asyncio.create_task(self._run(job, key))
+        return {**job.to_dict(), "already_running": False, "rerun_pending": False}
+
+    async def _run(self, job: IndexJob, key: str) -> None:
+        try:
+            job.report = await run_blocking(
+                self.build, docs_dir=job.docs_dir, persist_dir=job.persist_dir, on_progress=job.update, **job.options
+            )
+            job.finish("success")
+        except Exception as error:
+            job.finish("failed", str(error))
+            logger.warning("RAG index build %s failed: %s", job.id, error)
+        finally:
+            self._active.pop(key, None)
+        rerun = self._rerun.pop(key, None)
+        if rerun is not None:
+            docs_dir, persist_dir, options = rerun
+            await self.submit(docs_dir, persist_dir, **options)
+        await run_blocking(self._record_finish, job)
+        self._tasks.pop(job.id, None)
+        logger.info(json.dumps({"event": "rag_index", **job.to_dict()}, ensure_ascii=False, default=str))
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Jobs from an earlier process (or evicted from memory) are read back from ``data_jobs``."""
+        if job_id.startswith("local-"):
+            return None
+        try:
+            rows = (
+                supabase.table("data_jobs")
+                .select("id, status, message, run_at, finished_at")
+                .eq("id", job_id)
+                .eq("job_type", JOB_TYPE)
+                .limit(1)
+                .execute()
+                .data
+                or []
+            )
+        except Exception:
+            return None
+        if not rows:
+            return None
+        row = rows[0]
+        try:
+            message = json.loads(row.get("message") or "{}")
+        except (TypeError, ValueError):
+            message = {}
+        status = row.get("status")
+        if status == "running":
+            status = "interrupted"  # not running in this process, so its worker is gone
+        return {
+            "job_id": str(row["id"]),
+            "status": status,
+            "docs_dir": message.get("docs_dir"),
+            "persist_dir": message.get("persist_dir"),
+            "progress": {},
+            "eta_seconds": None,
+            "report": message.get("report"),
+            "error": message.get("error"),
+            "created_at": row.get("run_at"),
+            "finished_at": row.get("finished_at"),
+        }
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return job.to_dict() if job is not None else None
+
+    async def wait(self, job_id: str) -> None:
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": [job.to_dict() for job in self._active.values()],
+            "recent": [job.to_dict() for job in reversed(self._jobs.values())][:10],
+        }
+
+
+index_jobs = IndexJobManager()
@@ -0,0 +1,191 @@
+"""Versioned, immutable snapshots of a persist directory.
+
+Layout::
+
+    <persist_dir>/CURRENT              name of the live snapshot
+    <persist_dir>/snapshots.json       registry: status, created/retired times, build report
+    <persist_dir>/snapshots/v000042/   one complete index (manifest + vector store files)
+
+A build clones the live snapshot into a new directory with hard links, applies
+its changes there and then publishes it by atomically replacing ``CURRENT``.
+Only the NumPy vector store and the lexical index are snapshotted: both
+replace their files rather than writing into them, so a clone costs no disk.
+Chroma writes in place and is not versioned (see ``rag_indexer``). Readers
+resolve ``CURRENT`` once per query and keep using the store they opened, so
+they never see a half-written index. Retired snapshots stay on disk for a
+grace period, and the most recent ones are kept for ``rollback``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+POINTER = "CURRENT"
+REGISTRY = "snapshots.json"
+SNAPSHOT_DIR = "snapshots"
+GRACE_SECONDS = float(os.getenv("RAG_SNAPSHOT_GRACE_SECONDS", 600))
+KEEP = max(1, int(os.getenv("RAG_SNAPSHOT_KEEP", 2)))
+
+
+class SnapshotError(ValueError):
+    """Raised for unknown snapshot versions or rollbacks with nothing to roll back to."""
+
+
+def _write_atomic(path: str, text: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp_path, path)
+
+
+def snapshot_path(persist_dir: str, version: str) -> str:
+    return os.path.join(persist_dir, SNAPSHOT_DIR, version)
+
+
+def current_version(persist_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(persist_dir, POINTER), encoding="utf-8") as handle:
+            version = handle.read().strip()
+    except OSError:
+        return None
+    return version or None
+
+
+def current_path(persist_dir: str) -> Optional[str]:
+    version = current_version(persist_dir)
+    return snapshot_path(persist_dir, version) if version else None
+
+
+def load_registry(persist_dir: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(persist_dir, REGISTRY), encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {"next": 1, "snapshots": {}}
+
+
+def _save_registry(persist_dir: str, registry: Dict[str, Any]) -> None:
+    _write_atomic(os.path.join(persist_dir, REGISTRY), json.dumps(registry, ensure_ascii=False, indent=1))
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def begin(persist_dir: str, clone_from: Optional[str] = None, *, link: bool = False) -> Tuple[str, str]:
+    """Reserve a new snapshot directory, optionally seeded from ``clone_from``.
+
+    ``link`` hard-links the files instead of copying them; only safe for
+    stores that replace files rather than writing into them.
+    """
+    registry = load_registry(persist_dir)
+    version = f"v{registry['next']:06d}"
+    registry["next"] += 1
+    path = snapshot_path(persist_dir, version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if clone_from and os.path.isdir(clone_from):
+        shutil.copytree(clone_from, path, copy_function=_link_or_copy if link else shutil.copy2)
+    else:
+        os.makedirs(path)
+    registry["snapshots"][version] = {"status": "building", "created_at": time.time(), "retired_at": None}
+    _save_registry(persist_dir, registry)
+    return version, path
+
+
+def abort(persist_dir: str, version: str) -> None:
+    shutil.rmtree(snapshot_path(persist_dir, version), ignore_errors=True)
+    registry = load_registry(persist_dir)
+    registry["snapshots"].pop(version, None)
+    _save_registry(persist_dir, registry)
+
+
+def _swap(persist_dir: str, registry: Dict[str, Any], version: str) -> None:
+    now = time.time()
+    previous = current_version(persist_dir)
+    if previous and previous in registry["snapshots"] and previous != version:
+        registry["snapshots"][previous].update(status="retired", retired_at=now)
+    registry["snapshots"][version].update(status="live", retired_at=None, published_at=now)
+    _save_registry(persist_dir, registry)
+    _write_atomic(os.path.join(persist_dir, POINTER), version)  # the swap readers observe
+
+
+def publish(persist_dir: str, version: str, report: Optional[Dict[str, Any]] = None) -> None:
+    registry = load_registry(persist_dir)
+    if version not in registry["snapshots"]:
+        raise SnapshotError(f"Unknown snapshot {version}")
+    if report is not None:
+        registry["snapshots"][version]["report"] = report
+    _swap(persist_dir, registry, version)
+
+
+def rollback(persist_dir: str, version: Optional[str] = None) -> str:
+    """Make ``version`` (default: the most recently retired snapshot) live again."""
+    registry = load_registry(persist_dir)
+    live = current_version(persist_dir)
+    if version is None:
+        retired = [
+            (entry.get("published_at") or entry["created_at"], name)
+            for name, entry in registry["snapshots"].items()
+            if entry["status"] == "retired"
+        ]
+        if not retired:
+            raise SnapshotError("No previous snapshot to roll back to")
+        version = max(retired)[1]
+    entry = registry["snapshots"].get(version)
+    if entry is None or entry["status"] == "building" or not os.path.isdir(snapshot_path(persist_dir, version)):
+        raise SnapshotError(f"Snapshot {version} is not available")
+    if version != live:
+        _swap(persist_dir, registry, version)
+    return version
+
+
+def collect_garbage(
+    persist_dir: str,
+    *,
+    grace_seconds: float = GRACE_SECONDS,
+    keep: int = KEEP,
+    now: Optional[float] = None,
+) -> List[str]:
+    """Delete retired snapshots past the grace period, beyond the ``keep`` most recent.
+
+    Call with the build lock held: ``building`` entries are then leftovers of
+    crashed builds and are removed once they are older than the grace period.
+    """
+    now = time.time() if now is None else now
+    registry = load_registry(persist_dir)
+    live = current_version(persist_dir)
+    retired = sorted(
+        (name for name, entry in registry["snapshots"].items() if entry["status"] == "retired"),
+        key=lambda name: registry["snapshots"][name].get("published_at") or registry["snapshots"][name]["created_at"],
+        reverse=True,
+    )
+    protected = {live, *retired[: max(0, keep - 1)]}
+    removed = []
+    for name, entry in list(registry["snapshots"].items()):
+        if name in protected:
+            continue
+        since = entry["retired_at"] if entry["status"] == "retired" else entry["created_at"]
+        if since is not None and now - since >= grace_seconds:
+            shutil.rmtree(snapshot_path(persist_dir, name), ignore_errors=True)
+            del registry["snapshots"][name]
+            removed.append(name)
+    if removed:
+        _save_registry(persist_dir, registry)
+    return removed
+
+
+def list_snapshots(persist_dir: str) -> Dict[str, Any]:
+    registry = load_registry(persist_dir)
+    return {
+        "current": current_version(persist_dir),
+        "snapshots": [
+            {"version": name, **entry}
+            for name, entry in sorted(registry["snapshots"].items(), reverse=True)
+        ],
+    }
@@ -0,0 +1,155 @@
+"""Single-pass keyword matcher for query intents and date hints.
+
+All keyword dictionaries are compiled into one Aho-Corasick automaton over
+normalised text (NFC, lower-cased, whitespace removed so "저번 주" and
+"저번주" match alike). Matching walks the query once, so the cost depends on
+the query length and not on how many keywords are registered.
+"""
+from __future__ import annotations
+
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+SQL_TIME_SERIES = "SQL_TIME_SERIES"
+FINANCE = "finance"
+REVIEWS = "reviews"
+POLICY = "policy"
+
+FINANCE_KEYWORDS = [
+    "금융",
+    "자금",
+    "대출",
+    "적금",
+    "예금",
+    "카드",
+    "보증",
+    "운영자금",
+]
+
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    SQL_TIME_SERIES: [
+        "매출",
+        "순매출",
+        "추이",
+        "추세",
+        "전주",
+        "전월",
+        "판매량",
+        "매상",
+        "sales",
+        "trend",
+    ],
+    FINANCE: FINANCE_KEYWORDS,
+    REVIEWS: ["리뷰", "후기", "평점", "별점", "review"],
+    POLICY: ["정책", "지원금", "보조금", "지원사업", "정책자금", "자격", "신청"],
+}
+
+DATE_HINTS: Dict[str, str] = {
+    "오늘": "today",
+    "어제": "yesterday",
+    "이번 주": "this_week",
+    "이번주": "this_week",
+    "금주": "this_week",
+    "지난주": "last_week",
+    "저번 주": "last_week",
+    "전주": "last_week",
+    "이번 달": "this_month",
+    "이번달": "this_month",
+    "지난달": "last_month",
+    "저번 달": "last_month",
+    "전월": "last_month",
+    "최근 7일": "last_7_days",
+    "일주일": "last_7_days",
+    "최근 30일": "last_30_days",
+    "한 달": "last_30_days",
+    "올해": "this_year",
+    "작년": "last_year",
+}
+
+
+def normalize(text: str) -> str:
+    return "".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    intents: FrozenSet[str]
+    date_hints: Tuple[str, ...]
+    keywords: Tuple[str, ...]
+
+    def has(self, intent: str) -> bool:
+        return intent in self.intents
+
+
+class IntentMatcher:
+    """Aho-Corasick automaton mapping keywords to (kind, label) payloads."""
+
+    def __init__(
+        self,
+        intent_keywords: Mapping[str, Iterable[str]],
+        date_hints: Optional[Mapping[str, str]] = None,
+    ):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[Tuple[str, str, str], ...]] = [()]
+        for intent, keywords in intent_keywords.items():
+            for keyword in keywords:
+                self._add(keyword, ("intent", intent, keyword))
+        for phrase, hint in (date_hints or {}).items():
+            self._add(phrase, ("date", hint, phrase))
+        self._build_failure_links()
+
+    def _add(self, keyword: str, payload: Tuple[str, str, str]) -> None:
+        node = 0
+        for char in normalize(keyword):
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = next_node
+        if node and payload not in self._out[node]:
+            self._out[node] = self._out[node] + (payload,)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def match(self, query: str) -> IntentMatch:
+        intents = set()
+        date_hints: List[str] = []
+        keywords: List[str] = []
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for char in normalize(query):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for kind, label, keyword in out[node]:
+                if kind == "intent":
+                    intents.add(label)
+                    if keyword not in keywords:
+                        keywords.append(keyword)
+                elif label not in date_hints:
+                    date_hints.append(label)
+        return IntentMatch(frozenset(intents), tuple(date_hints), tuple(keywords))
+
+
+default_matcher = IntentMatcher(INTENT_KEYWORDS, DATE_HINTS)
+
+
+def match_intents(query: str) -> IntentMatch:
+    return default_matcher.match(query)
@@ -0,0 +1,315 @@
+"""BM25 index over the same chunks as a ``VectorStore``.
+
+Chunks are tokenised into the character bigrams ``services.policy_search``
+uses for the product catalog, so an exact product name ("사잇돌 대출") matches
+without a morphological analyzer. Postings are kept as CSR arrays (term ->
+rows, term frequencies) in one ``lexical.npz`` next to the vector files; the
+indexer writes it through the same add/update/delete/flush calls as the
+store, and ``flush`` replaces the file rather than writing into it, so
+hard-linked snapshots stay intact.
+
+``search`` returns chunk ids with their BM25 score and ``coverage``: the
+idf-weighted share of the query's bigrams the chunk contains. Coverage near
+1 means the query's rare terms all occur in the chunk, which is what the
+retrieval fast path keys on. A partitioned search reads per-partition
+postings, built once per write like ``NumpyVectorStore``'s partition rows.
+It only touches that tenant's chunks, and its idf and average length come
+from them alone, so other tenants' documents never shift its scores.
+"""
+from __future__ import annotations
+
+import functools
+import math
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from services.policy_search import BM25_B, BM25_K1, ngrams
+
+from .vector_store import PARTITION_KEY
+
+FILE_NAME = "lexical.npz"
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _Postings(NamedTuple):
+    """CSR postings over ``rows`` (all rows when ``None``).
+
+    ``terms`` lists the vocabulary ids present when the postings cover a
+    subset of the vocabulary; ``indptr`` is then indexed by their position.
+    """
+
+    indptr: np.ndarray
+    docs: np.ndarray
+    tfs: np.ndarray
+    lengths: np.ndarray
+    rows: Optional[np.ndarray] = None
+    terms: Optional[np.ndarray] = None
+
+    def span(self, term_id: Optional[int]) -> Tuple[int, int]:
+        if term_id is None:
+            return 0, 0
+        if self.terms is not None:
+            slot = int(np.searchsorted(self.terms, term_id))
+            if slot == len(self.terms) or self.terms[slot] != term_id:
+                return 0, 0
+            term_id = slot
+        return int(self.indptr[term_id]), int(self.indptr[term_id + 1])
+
+
+class LexicalIndex:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.uint16)
+        self._ids = np.zeros(0, dtype="S64")
+        self._lengths = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._partitions = np.zeros(0, dtype=np.int32)
+        self._partition_names: List[str] = []
+        self._partition_codes: Dict[str, int] = {}
+        self._by_partition: Optional[Dict[int, _Postings]] = None
+        # Rows added since the last merge: (row, term counts).
+        self._pending: List[Tuple[int, Counter]] = []
+        self._row_of: Optional[Dict[bytes, int]] = None
+        self._stale = False  # postings still list deleted rows or miss pending ones
+        self._dirty = False  # unsaved changes
+        self._lock = threading.RLock()
+        self._load()
+
+    # --- persistence -----------------------------------------------------------
+
+    def _path(self, name: str = FILE_NAME) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self) -> None:
+        try:
+            data = np.load(self._path())
+        except (OSError, ValueError):
+            return
+        with data:
+            self._terms = data["terms"].tolist()
+            self._indptr = data["indptr"]
+            self._docs = data["docs"]
+            self._tfs = data["tfs"]
+            self._ids = data["ids"]
+            self._lengths = data["lengths"]
+            self._partitions = data["partitions"]
+            self._partition_names = data["partition_names"].tolist()
+        self._term_ids = {term: index for index, term in enumerate(self._terms)}
+        self._partition_codes = {name: code for code, name in enumerate(self._partition_names)}
+        self._alive = np.ones(len(self._ids), dtype=bool)
+
+    @_locked
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        self._merge()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(f"{FILE_NAME}.tmp"), "wb") as handle:
+            np.savez(
+                handle,
+                terms=np.array(self._terms, dtype=str),
+                indptr=self._indptr,
+                docs=self._docs,
+                tfs=self._tfs,
+                ids=self._ids,
+                lengths=self._lengths,
+                partitions=self._partitions,
+                partition_names=np.array(self._partition_names, dtype=str),
+            )
+        os.replace(self._path(f"{FILE_NAME}.tmp"), self._path())
+        self._dirty = False
+
+    def _merge(self) -> None:
+        """Fold pending rows into the postings and drop deleted rows, renumbering the rest."""
+        if not self._stale:
+            return
+        terms = np.repeat(np.arange(len(self._terms), dtype=np.int64), np.diff(self._indptr))
+        docs, tfs = self._docs.astype(np.int64), self._tfs
+        if self._pending:
+            new_terms, new_docs, new_tfs = [], [], []
+            for row, counts in self._pending:
+                for term, tf in counts.items():
+                    term_id = self._term_ids.get(term)
+                    if term_id is None:
+                        term_id = self._term_ids[term] = len(self._terms)
+                        self._terms.append(term)
+                    new_terms.append(term_id)
+                    new_docs.append(row)
+                    new_tfs.append(min(tf, 65_535))
+            terms = np.concatenate([terms, np.array(new_terms, dtype=np.int64)])
+            docs = np.concatenate([docs, np.array(new_docs, dtype=np.int64)])
+            tfs = np.concatenate([tfs, np.array(new_tfs, dtype=np.uint16)])
+        keep = self._alive[docs]
+        renumber = np.cumsum(self._alive) - 1
+        terms, docs, tfs = terms[keep], renumber[docs[keep]], tfs[keep]
+        # Terms whose every chunk is gone leave the vocabulary.
+        used = np.bincount(terms, minlength=len(self._terms)) > 0
+        self._terms = [term for term, keep_term in zip(self._terms, used) if keep_term]
+        self._term_ids = {term: index for index, term in enumerate(self._terms)}
+        terms = (np.cumsum(used) - 1)[terms]
+        order = np.lexsort((docs, terms))
+        self._docs = docs[order].astype(np.int32)
+        self._tfs = tfs[order]
+        self._indptr = np.concatenate([[0], np.cumsum(np.bincount(terms, minlength=len(self._terms)))]).astype(np.int64)
+        self._ids = self._ids[self._alive]
+        self._lengths = self._lengths[self._alive]
+        self._partitions = self._partitions[self._alive]
+        self._alive = np.ones(len(self._ids), dtype=bool)
+        self._pending = []
+        self._row_of = None
+        self._by_partition = None
+        self._stale = False
+
+    # --- writes ----------------------------------------------------------------
+
+    def _rows(self) -> Dict[bytes, int]:
+        if self._row_of is None:
+            self._row_of = {bytes(key): row for row, key in enumerate(self._ids) if self._alive[row]}
+        return self._row_of
+
+    def _partition_code(self, metadata: Dict[str, Any]) -> int:
+        name = metadata.get(PARTITION_KEY)
+        if name is None:
+            return -1
+        name = str(name)
+        code = self._partition_codes.get(name)
+        if code is None:
+            code = self._partition_codes[name] = len(self._partition_names)
+            self._partition_names.append(name)
+        return code
+
+    @_locked
+    def add(self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        if not ids:
+            return
+        self.delete(ids)
+        rows = self._rows()
+        start = len(self._ids)
+        counts = [Counter(ngrams(text)) for text in texts]
+        self._ids = np.concatenate([self._ids, np.array([key.encode("ascii") for key in ids], dtype="S64")])
+        self._lengths = np.concatenate(
+            [self._lengths, np.array([sum(count.values()) for count in counts], dtype=np.int32)]
+        )
+        self._partitions = np.concatenate(
+            [self._partitions, np.array([self._partition_code(metadata) for metadata in metadatas], dtype=np.int32)]
+        )
+        self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+        for offset, (key, count) in enumerate(zip(ids, counts)):
+            rows[key.encode("ascii")] = start + offset
+            self._pending.append((start + offset, count))
+        self._stale = self._dirty = True
+
+    @_locked
+    def update_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        rows = self._rows()
+        for key, metadata in zip(ids, metadatas):
+            row = rows.get(key.encode("ascii"))
+            if row is not None and self._partitions[row] != self._partition_code(metadata):
+                self._partitions[row] = self._partition_code(metadata)
+                self._by_partition = None
+                self._dirty = True
+
+    @_locked
+    def delete(self, ids: List[str]) -> None:
+        rows = self._rows()
+        for key in ids:
+            row = rows.pop(key.encode("ascii"), None)
+            if row is not None:
+                self._alive[row] = False
+                self._stale = self._dirty = True
+
+    # --- reads -----------------------------------------------------------------
+
+    def _partition_postings(self) -> Dict[int, _Postings]:
+        """Postings of every partition, split from the merged postings once per write."""
+        if self._by_partition is None:
+            self._by_partition = {}
+            order = np.argsort(self._partitions, kind="stable")
+            codes, starts = np.unique(self._partitions[order], return_index=True)
+            members = dict(zip(codes.tolist(), np.split(order, starts[1:])))
+            terms = np.repeat(np.arange(len(self._terms), dtype=np.int64), np.diff(self._indptr))
+            owners = self._partitions[self._docs]
+            order = np.lexsort((self._docs, terms, owners))
+            codes, starts = np.unique(owners[order], return_index=True)
+            for code, block in zip(codes.tolist(), np.split(order, starts[1:])):
+                if code < 0:
+                    continue
+                rows = members[code]
+                term_ids, term_starts = np.unique(terms[block], return_index=True)
+                self._by_partition[code] = _Postings(
+                    indptr=np.append(term_starts, len(block)).astype(np.int64),
+                    docs=np.searchsorted(rows, self._docs[block]).astype(np.int32),
+                    tfs=self._tfs[block],
+                    lengths=self._lengths[rows],
+                    rows=rows,
+                    terms=term_ids,
+                )
+        return self._by_partition
+
+    @_locked
+    def count(self) -> int:
+        return int(self._alive.sum())
+
+    @_locked
+    def search(
+        self, query: str, top_k: int, *, partition: Optional[str] = None
+    ) -> List[Tuple[str, float, float]]:
+        """Best ``(chunk id, BM25 score, coverage)`` matches, best first."""
+        self._merge()
+        grams = set(ngrams(query))
+        if not len(self._ids) or not grams or top_k <= 0:
+            return []
+        if partition is None:
+            postings = _Postings(self._indptr, self._docs, self._tfs, self._lengths)
+        else:
+            postings = self._partition_postings().get(self._partition_codes.get(str(partition), -1))
+            if postings is None:
+                return []
+        total = len(postings.lengths)
+        average = float(postings.lengths.mean()) or 1.0
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * postings.lengths / average)
+        scores = np.zeros(total)
+        matched = np.zeros(total)
+        possible = 0.0
+        for gram in grams:
+            start, end = postings.span(self._term_ids.get(gram))
+            idf = math.log(1 + (total - (end - start) + 0.5) / ((end - start) + 0.5))
+            possible += idf  # unknown grams count at full idf: the query asks for something no chunk has
+            if start == end:
+                continue
+            docs, tfs = postings.docs[start:end], postings.tfs[start:end].astype(np.float64)
+            scores[docs] += idf * tfs * (BM25_K1 + 1) / (tfs + norms[docs])
+            matched[docs] += idf
+        candidates = np.flatnonzero(scores)
+        if candidates.size > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        keys = self._ids[candidates if postings.rows is None else postings.rows[candidates]]
+        return [
+            (key.decode("ascii"), round(float(scores[row]), 4), round(float(matched[row] / possible), 4))
+            for key, row in zip(keys, candidates)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"chunks": self.count(), "terms": len(self._terms), "postings": int(len(self._docs))}
+
+
+def open_lexical_index(persist_dir: str) -> LexicalIndex:
+    """Lexical index stored alongside the vector store of ``persist_dir``."""
+    return LexicalIndex(os.path.join(persist_dir, "lexical"))
@@ -0,0 +1,480 @@
+"""Batch policy eligibility matching.
+
+Each ``policy_products`` row is compiled once into structured predicates
+parsed from its free-text ``eligibility``, ``limit_amount`` and ``term``:
+industry and region requirements, annual/monthly sales bounds, business age
+bounds and a "no delinquency" flag. Clauses that cannot be checked against
+our data (credit scores, documents) are kept as ``unverified`` and surfaced in
+the rationale instead of silently passing or failing.
+
+Businesses (industry, region, 30-day sales, settlement delays) are then
+evaluated against every product at once as a ``businesses x products``
+matrix, the top ``k`` eligible products per business are ranked, and the
+results replace the engine-written rows of ``policy_recommendations`` in bulk.
+Sales rules cannot be checked for a business without sales data; like
+unverified clauses they are surfaced in the rationale and lower the score,
+instead of the business passing every sales cap as if it sold nothing.
+"""
+from __future__ import annotations
+
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.metrics_service import iter_metrics_summaries
+from services.supabase_client import supabase
+
+# Product-side wording -> category, and business industry wording -> categories.
+INDUSTRY_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "음식점": ("음식", "식당", "외식", "요식", "한식", "중식", "일식", "양식", "분식", "주점", "호프", "치킨", "카페", "커피", "베이커리", "제과"),
+    "카페": ("카페", "커피", "베이커리", "제과", "디저트"),
+    "주점": ("주점", "호프", "술집", "맥주", "포차"),
+    "도소매": ("도소매", "소매", "도매", "편의점", "마트", "슈퍼"),
+    "제조업": ("제조",),
+    "서비스업": ("서비스", "미용", "세탁", "수리"),
+}
+PRODUCT_INDUSTRY_TERMS: Dict[str, Tuple[str, ...]] = {
+    "음식점": ("음식점", "외식업", "요식업", "음식업"),
+    "카페": ("카페",),
+    "주점": ("주점",),
+    "도소매": ("도소매", "소매업", "도매업"),
+    "제조업": ("제조업", "제조"),
+    "서비스업": ("서비스업",),
+}
+SIDO = ("서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주")
+CITY_TO_SIDO = {
+    "수원": "경기", "용인": "경기", "수지": "경기", "성남": "경기", "분당": "경기", "고양": "경기",
+    "부천": "경기", "안양": "경기", "화성": "경기", "평택": "경기", "창원": "경남", "김해": "경남",
+    "천안": "충남", "청주": "충북", "전주": "전북", "포항": "경북", "춘천": "강원",
+}
+REGIONS = SIDO + tuple(CITY_TO_SIDO)
+GENERAL_TERMS = ("소상공인", "중소기업", "개인사업자", "자영업", "사업자")
+WORKING_CAPITAL_TERMS = ("운영자금", "운전자금", "긴급", "경영안정", "신용대출")
+AGE_TERMS = ("창업", "업력", "운영", "영업", "가맹점", "개업")
+
+_UNITS = {"억": 1e8, "천만": 1e7, "백만": 1e6, "만": 1e4, "천": 1e3}
+_MONEY = re.compile(r"(?:\d[\d,]*(?:\.\d+)?\s*(?:억|천만|백만|만|천)\s*)+원?|\d[\d,]*\s*원")
+_MONEY_PART = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(억|천만|백만|만|천)?")
+_YEARS = re.compile(r"(\d+)\s*년\s*(이상|초과|이내|이하|미만)")
+_TERM = re.compile(r"(\d+)\s*(년|개월)")
+_CLAUSES = re.compile(r"(?<!\d),|,(?!\d)|[/;·]|\s및\s|\s또는\s")
+
+DEFAULT_TOP_K = 3
+CHUNK_SIZE = 5000
+WRITE_CHUNK_SIZE = 1000
+
+
+def parse_krw(text: Optional[str]) -> Optional[float]:
+    """First money amount in ``text`` in KRW: "2천만원" -> 2e7, "1억 5천만원" -> 1.5e8."""
+    match = _MONEY.search(text or "")
+    if not match:
+        return None
+    total = 0.0
+    for number, unit in _MONEY_PART.findall(match.group(0)):
+        total += float(number.replace(",", "")) * _UNITS.get(unit, 1.0)
+    return total or None
+
+
+def parse_term_months(text: Optional[str]) -> Optional[float]:
+    match = _TERM.search(text or "")
+    if not match:
+        return None
+    value = float(match.group(1))
+    return value * 12 if match.group(2) == "년" else value
+
+
+def industry_categories(text: Optional[str], vocabulary: Dict[str, Tuple[str, ...]] = INDUSTRY_CATEGORIES) -> set:
+    text = text or ""
+    return {category for category, terms in vocabulary.items() if any(term in text for term in terms)}
+
+
+def region_tokens(text: Optional[str]) -> set:
+    text = text or ""
+    tokens = {region for region in REGIONS if region in text}
+    return tokens | {CITY_TO_SIDO[token] for token in tokens if token in CITY_TO_SIDO}
+
+
+@dataclass
+class ProductPredicates:
+    policy_id: str
+    name: str
+    industries: frozenset = frozenset()
+    regions: frozenset = frozenset()
+    min_annual_sales: float = -math.inf
+    max_annual_sales: float = math.inf
+    min_monthly_sales: float = -math.inf
+    max_monthly_sales: float = math.inf
+    min_age_years: float = -math.inf
+    max_age_years: float = math.inf
+    no_delay: bool = False
+    working_capital: bool = False
+    limit_amount: Optional[float] = None
+    term_months: Optional[float] = None
+    unverified: Tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def verified_conditions(self) -> int:
+        return sum(
+            (
+                bool(self.industries),
+                bool(self.regions),
+                math.isfinite(self.min_annual_sales) or math.isfinite(self.max_annual_sales),
+                math.isfinite(self.min_monthly_sales) or math.isfinite(self.max_monthly_sales),
+                self.no_delay,
+            )
+        )
+
+
+def compile_product(row: Dict[str, Any]) -> ProductPredicates:
+    eligibility = row.get("eligibility") or ""
+    predicates = ProductPredicates(
+        policy_id=str(row.get("id")),
+        name=row.get("name") or "",
+        industries=frozenset(industry_categories(eligibility, PRODUCT_INDUSTRY_TERMS)),
+        regions=frozenset(region_tokens(eligibility)),
+        working_capital=any(term in f"{row.get('name') or ''} {eligibility}" for term in WORKING_CAPITAL_TERMS),
+        limit_amount=parse_krw(row.get("limit_amount")),
+        term_months=parse_term_months(row.get("term")),
+    )
+    unverified: List[str] = []
+    for clause in (part.strip() for part in _CLAUSES.split(eligibility)):
+        if not clause:
+            continue
+        recognised = bool(
+            industry_categories(clause, PRODUCT_INDUSTRY_TERMS)
+            or region_tokens(clause)
+            or any(term in clause for term in GENERAL_TERMS)
+        )
+        amount = parse_krw(clause)
+        if amount is not None and any(word in clause for word in ("매출", "소득")):
+            monthly = "월" in clause
+            if any(word in clause for word in ("이상", "초과")):
+                if monthly:
+                    predicates.min_monthly_sales = amount
+                else:
+                    predicates.min_annual_sales = amount
+                recognised = True
+            elif any(word in clause for word in ("이하", "미만", "이내")):
+                if monthly:
+                    predicates.max_monthly_sales = amount
+                else:
+                    predicates.max_annual_sales = amount
+                recognised = True
+        years = _YEARS.search(clause)
+        if years and any(term in clause for term in AGE_TERMS):
+            if years.group(2) in ("이상", "초과"):
+                predicates.min_age_years = float(years.group(1))
+            else:
+                predicates.max_age_years = float(years.group(1))
+            recognised = True
+        if "연체" in clause or "체납" in clause:
+            predicates.no_delay = True
+            recognised = True
+        if not recognised:
+            unverified.append(clause)
+    predicates.unverified = tuple(unverified)
+    return predicates
+
+
+def _format_krw(amount: float) -> str:
+    if amount >= 1e8:
+        return f"{amount / 1e8:.1f}억원"
+    return f"{amount / 1e4:,.0f}만원"
+
+
+class CompiledCatalog:
+    """Column arrays over all product predicates, ready for broadcasting."""
+
+    def __init__(self, products: Sequence[ProductPredicates]):
+        self.products = list(products)
+        self.industries = sorted(INDUSTRY_CATEGORIES)
+        self.regions = list(REGIONS)
+        count = len(self.products)
+        self.industry_req = np.zeros((count, len(self.industries)), dtype=np.float32)
+        self.region_req = np.zeros((count, len(self.regions)), dtype=np.float32)
+        for index, product in enumerate(self.products):
+            for category in product.industries:
+                self.industry_req[index, self.industries.index(category)] = 1
+            for region in product.regions:
+                self.region_req[index, self.regions.index(region)] = 1
+        self.has_industry = self.industry_req.any(axis=1)
+        self.has_region = self.region_req.any(axis=1)
+
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(product, name) for product in self.products], dtype=np.float64)
+
+        self.min_annual = column("min_annual_sales")
+        self.max_annual = column("max_annual_sales")
+        self.min_monthly = column("min_monthly_sales")
+        self.max_monthly = column("max_monthly_sales")
+        self.min_age = column("min_age_years")
+        self.max_age = column("max_age_years")
+        self.no_delay = np.array([product.no_delay for product in self.products], dtype=bool)
+        self.working_capital = np.array([product.working_capital for product in self.products], dtype=bool)
+        self.limit = np.array(
+            [product.limit_amount if product.limit_amount else np.nan for product in self.products]
+        )
+        self.has_sales_rule = [
+            any(math.isfinite(value) for value in (product.min_annual_sales, product.max_annual_sales))
+            for product in self.products
+        ]
+        self.sales_rules = np.array(
+            [
+                (math.isfinite(product.min_annual_sales) or math.isfinite(product.max_annual_sales))
+                + (math.isfinite(product.min_monthly_sales) or math.isfinite(product.max_monthly_sales))
+                for product in self.products
+            ],
+            dtype=np.float64,
+        )
+        self.limit_text = [_format_krw(product.limit_amount) if product.limit_amount else "" for product in self.products]
+        self.rationale_parts = [_static_rationale(product) for product in self.products]
+        term_years = np.array([(product.term_months or 0) / 12 for product in self.products])
+        # Per-product score prior: specific, checkable products rank above vague ones.
+        self.prior = (
+            1.0
+            + 0.2 * np.array([product.verified_conditions for product in self.products])
+            - 0.2 * np.array([len(product.unverified) for product in self.products])
+            + 0.1 * np.minimum(term_years, 10) / 10
+        )
+
+
+@dataclass
+class BusinessFrame:
+    ids: List[str]
+    industry_hot: np.ndarray  # (n, categories) float32
+    region_hot: np.ndarray  # (n, regions) float32
+    monthly_sales: np.ndarray  # NaN when the business has no sales data
+    delays: np.ndarray
+    age_years: np.ndarray  # NaN when the opening date is unknown
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def business_frame(catalog: CompiledCatalog, rows: Sequence[Dict[str, Any]]) -> BusinessFrame:
+    """``rows`` carry id, industry, region, net_sales (30d), settlement_delay, age_years."""
+    count = len(rows)
+    industry_hot = np.zeros((count, len(catalog.industries)), dtype=np.float32)
+    region_hot = np.zeros((count, len(catalog.regions)), dtype=np.float32)
+    industry_index = {name: i for i, name in enumerate(catalog.industries)}
+    region_index = {name: i for i, name in enumerate(catalog.regions)}
+    # Industry/region wording repeats heavily across a fleet, so parse each distinct string once.
+    industry_cache: Dict[Optional[str], List[int]] = {}
+    region_cache: Dict[Optional[str], List[int]] = {}
+    for i, row in enumerate(rows):
+        industry, region = row.get("industry"), row.get("region")
+        if industry not in industry_cache:
+            industry_cache[industry] = [industry_index[c] for c in industry_categories(industry)]
+        if region not in region_cache:
+            region_cache[region] = [region_index[r] for r in region_tokens(region)]
+        industry_hot[i, industry_cache[industry]] = 1
+        region_hot[i, region_cache[region]] = 1
+    return BusinessFrame(
+        ids=[str(row["id"]) for row in rows],
+        industry_hot=industry_hot,
+        region_hot=region_hot,
+        monthly_sales=np.array(
+            [np.nan if row.get("net_sales") is None else float(row["net_sales"]) for row in rows]
+        ),
+        delays=np.array([int(row.get("settlement_delay") or 0) for row in rows]),
+        age_years=np.array(
+            [np.nan if row.get("age_years") is None else float(row["age_years"]) for row in rows]
+        ),
+    )
+
+
+def score_matrix(catalog: CompiledCatalog, frame: BusinessFrame) -> np.ndarray:
+    """``(businesses, products)`` scores; ineligible pairs are ``-inf``."""
+    eligible = ~catalog.has_industry[None, :] | ((frame.industry_hot @ catalog.industry_req.T) > 0)
+    eligible &= ~catalog.has_region[None, :] | ((frame.region_hot @ catalog.region_req.T) > 0)
+
+    monthly = frame.monthly_sales[:, None]
+    sales_known = ~np.isnan(monthly)
+    annual = monthly * 12
+    eligible &= ~sales_known | ((annual >= catalog.min_annual[None, :]) & (annual <= catalog.max_annual[None, :]))
+    eligible &= ~sales_known | ((monthly >= catalog.min_monthly[None, :]) & (monthly <= catalog.max_monthly[None, :]))
+
+    age = frame.age_years[:, None]
+    age_known = ~np.isnan(age)
+    eligible &= ~age_known | ((age >= catalog.min_age[None, :]) & (age <= catalog.max_age[None, :]))
+    eligible &= ~catalog.no_delay[None, :] | (frame.delays == 0)[:, None]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # A limit of about three months of sales is treated as a full fit.
+        fit = np.clip(catalog.limit[None, :] / (3 * monthly), 0, 1)
+    fit = np.where(np.isnan(fit), 0.25, fit)
+    needs_cash = (frame.delays > 0)[:, None] & catalog.working_capital[None, :]
+    # The prior counts each sales rule as verified (+0.2); without sales data it is unverified (-0.2).
+    unchecked = ~sales_known * catalog.sales_rules[None, :]
+    scores = (catalog.prior[None, :] + 0.5 * fit + 0.3 * needs_cash - 0.4 * unchecked).astype(np.float32)
+    scores[~eligible] = -np.inf
+    return scores
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and scores of the best ``k`` products per business, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.zeros((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def _static_rationale(product: ProductPredicates) -> Tuple[str, str]:
+    """Business-independent rationale parts, computed once per product."""
+    head: List[str] = []
+    if product.industries:
+        head.append(f"업종 조건({', '.join(sorted(product.industries))}) 충족")
+    if product.regions:
+        head.append(f"지역 조건({', '.join(sorted(product.regions))}) 충족")
+    tail = f"별도 확인 필요: {', '.join(product.unverified)}" if product.unverified else ""
+    return " · ".join(head), tail
+
+
+def rationale(catalog: CompiledCatalog, product_index: int, monthly: float, delays: int) -> str:
+    product = catalog.products[product_index]
+    head, tail = catalog.rationale_parts[product_index]
+    parts = [head] if head else []
+    if math.isnan(monthly):
+        if catalog.sales_rules[product_index]:
+            tail = f"{tail}, 매출 기준(매출 정보 없음)" if tail else "별도 확인 필요: 매출 기준(매출 정보 없음)"
+    elif catalog.has_sales_rule[product_index]:
+        parts.append(f"연 환산 매출 {_format_krw(monthly * 12)}로 매출 기준 충족")
+    if delays > 0 and product.working_capital:
+        parts.append(f"정산 지연 {delays}건으로 운영자금 우선 추천")
+    if product.limit_amount and monthly > 0:
+        parts.append(f"한도 {catalog.limit_text[product_index]} (월 매출의 {product.limit_amount / monthly:.1f}배)")
+    if tail:
+        parts.append(tail)
+    return " · ".join(parts) or "기본 자격 조건 충족"
+
+
+def match(
+    catalog: CompiledCatalog,
+    frame: BusinessFrame,
+    *,
+    k: int = DEFAULT_TOP_K,
+    chunk_size: int = CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """Ranked recommendation rows for every business in ``frame``."""
+    rows: List[Dict[str, Any]] = []
+    if not catalog.products:
+        return rows
+    for start in range(0, len(frame), chunk_size):
+        view = BusinessFrame(
+            ids=frame.ids[start:start + chunk_size],
+            industry_hot=frame.industry_hot[start:start + chunk_size],
+            region_hot=frame.region_hot[start:start + chunk_size],
+            monthly_sales=frame.monthly_sales[start:start + chunk_size],
+            delays=frame.delays[start:start + chunk_size],
+            age_years=frame.age_years[start:start + chunk_size],
+        )
+        indices, scores = top_k(score_matrix(catalog, view), k)
+        finite = np.isfinite(scores)
+        rounded = np.round(scores, 4).tolist()
+        indices_list = indices.tolist()
+        monthly_list = view.monthly_sales.tolist()
+        delay_list = view.delays.tolist()
+        for row, business_id in enumerate(view.ids):
+            for rank in range(indices.shape[1]):
+                if not finite[row, rank]:
+                    break
+                product_index = indices_list[row][rank]
+                rows.append(
+                    {
+                        "business_id": business_id,
+                        "policy_id": catalog.products[product_index].policy_id,
+                        "priority": rank + 1,
+                        "score": rounded[row][rank],
+                        "rationale": rationale(catalog, product_index, monthly_list[row], delay_list[row]),
+                    }
+                )
+    return rows
+
+
+def _paged(table: str, columns: str, page_size: int = 1000) -> Iterable[List[Dict[str, Any]]]:
+    offset = 0
+    while True:
+        page = (
+            supabase.table(table)
+            .select(columns)
+            .order("id", desc=False)
+            .range(offset, offset + page_size - 1)
+            .execute()
+            .data
+            or []
+        )
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+
+def _age_years(opened_on: Optional[str]) -> Optional[float]:
+    if not opened_on:
+        return None
+    opened = np.datetime64(str(opened_on)[:10], "D")
+    return float((np.datetime64("today", "D") - opened).astype(int)) / 365.25
+
+
+def rebuild_recommendations(k: int = DEFAULT_TOP_K) -> Dict[str, Any]:
+    """Recompute engine recommendations for every business and write them in bulk."""
+    started = time.perf_counter()
+    products = [
+        compile_product(row)
+        for page in _paged("policy_products", "id, name, eligibility, limit_amount, term")
+        for row in page
+    ]
+    catalog = CompiledCatalog(products)
+
+    businesses: List[Dict[str, Any]] = []
+    for page in _paged("businesses", "id, industry, region, opened_on"):
+        summaries = {
+            summary["business_id"]: summary
+            for chunk in iter_metrics_summaries([str(row["id"]) for row in page])
+            for summary in chunk
+        }
+        for row in page:
+            summary = summaries.get(str(row["id"]), {})
+            businesses.append(
+                {
+                    **row,
+                    "net_sales": summary.get("net_sales"),
+                    "settlement_delay": summary.get("settlement_delay"),
+                    "age_years": _age_years(row.get("opened_on")),
+                }
+            )
+    loaded = time.perf_counter()
+
+    frame = business_frame(catalog, businesses)
+    rows = match(catalog, frame, k=k)
+    matched = time.perf_counter()
+
+    by_business: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_business.setdefault(row["business_id"], []).append(row)
+    for start in range(0, len(frame.ids), WRITE_CHUNK_SIZE):
+        chunk_ids = frame.ids[start:start + WRITE_CHUNK_SIZE]
+        payload = [row for business_id in chunk_ids for row in by_business.get(business_id, [])]
+        supabase.rpc(
+            "replace_policy_recommendations",
+            {"target_businesses": chunk_ids, "payload": payload},
+        ).execute()
+
+    return {
+        "businesses": len(frame),
+        "products": len(products),
+        "recommendations": len(rows),
+        "unverified_clauses": sum(len(product.unverified) for product in products),
+        "load_ms": round((loaded - started) * 1000, 2),
+        "match_ms": round((matched - loaded) * 1000, 2),
+        "write_ms": round((time.perf_counter() - matched) * 1000, 2),
+    }
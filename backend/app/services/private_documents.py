@@ -0,0 +1,85 @@
+"""Files a business uploads for its private document partition.
+
+Each business gets ``<RAG_PRIVATE_DOCS_DIR>/<business_id>/``; the private
+index is built from that tree with ``partitioned=True`` (see
+``rag_indexer``), so chat for a business searches its own files alongside the
+shared policy corpus and never another business's.
+"""
+from __future__ import annotations
+
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from . import rag_indexer
+
+MAX_UPLOAD_BYTES = int(float(os.getenv("RAG_PRIVATE_MAX_MB", 20)) * 2**20)
+
+_BUSINESS_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class DocumentError(ValueError):
+    """Raised for unusable business ids, file names, types or sizes."""
+
+
+def _business_dir(business_id: str, docs_dir: Optional[str]) -> str:
+    if not _BUSINESS_ID.match(business_id or ""):
+        raise DocumentError("Invalid business id")
+    return os.path.join(docs_dir or rag_indexer.DEFAULT_PRIVATE_DOCS_DIR, business_id)
+
+
+def _file_name(filename: Optional[str]) -> str:
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    if not name or name.startswith("."):
+        raise DocumentError("Invalid file name")
+    if not name.lower().endswith(rag_indexer.EXTENSIONS):
+        raise DocumentError(f"Unsupported file type; allowed: {', '.join(rag_indexer.EXTENSIONS)}")
+    return name
+
+
+def _describe(path: str) -> Dict[str, Any]:
+    stat = os.stat(path)
+    return {
+        "name": os.path.basename(path),
+        "size": stat.st_size,
+        "uploaded_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+    }
+
+
+def save_document(business_id: str, filename: Optional[str], data: bytes, docs_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Store (or replace) one file; the caller schedules the index build."""
+    directory = _business_dir(business_id, docs_dir)
+    name = _file_name(filename)
+    if not data:
+        raise DocumentError("Empty file")
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise DocumentError(f"File exceeds {MAX_UPLOAD_BYTES // 2**20} MB")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    # Written under a name the indexer skips, then renamed: a build never reads half a file.
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_path, path)
+    return _describe(path)
+
+
+def list_documents(business_id: str, docs_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    directory = _business_dir(business_id, docs_dir)
+    if not os.path.isdir(directory):
+        return []
+    return [
+        _describe(os.path.join(directory, name))
+        for name in sorted(os.listdir(directory))
+        if name.lower().endswith(rag_indexer.EXTENSIONS) and not name.startswith(".")
+    ]
+
+
+def delete_document(business_id: str, filename: str, docs_dir: Optional[str] = None) -> bool:
+    path = os.path.join(_business_dir(business_id, docs_dir), _file_name(filename))
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
@@ -0,0 +1,781 @@
+"""Document vector index for the RAG path (docs/phase-3/rag-design.md).
+
+Indexing is incremental. A manifest next to the vector store records, per
+file, its size/mtime, content hash and the hashes of its chunks. A rebuild
+only reads files whose stat changed, only splits files whose content changed,
+and only embeds chunks whose hash is not in the index yet. Vectors are keyed
+by chunk hash, so identical chunks in different documents share one
+embedding, and a vector is deleted once no file references it any more.
+
+Changed files stream through a pipeline: a process pool reads, extracts and
+splits them (pypdf is CPU-bound), and their new chunks flow through a bounded
+queue to an embedding thread that writes batches to the store as they fill.
+At most a few files and queued batches are held in memory at any time, so
+peak memory does not grow with the corpus.
+
+Businesses' own documents (contracts, leases, invoices) live in a separate,
+partitioned index: ``<private docs>/<business_id>/...`` is indexed with the
+business id as each chunk's ``tenant``, and chunk ids are namespaced by it so
+no vector is shared across businesses. ``vector_search`` queries the shared
+corpus and, given a business, that business's partition, and merges the two.
+
+Every snapshot also carries a BM25 ``lexical_index`` over the same chunks.
+In the default ``hybrid`` retrieval mode the lexical and vector rankings are
+combined with reciprocal-rank fusion, and a query whose best lexical match
+covers nearly all of its (idf-weighted) terms, typically one naming a
+product exactly, is answered from the lexical index without embedding it.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from services.embedding_cache import embedding_cache
+
+from . import index_snapshots
+from .lexical_index import LexicalIndex, open_lexical_index
+from .vector_store import PARTITION_KEY, VectorStore, open_vector_store, snapshot_capable, store_label
+
+try:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    try:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter  # type: ignore
+    except ModuleNotFoundError:
+        RecursiveCharacterTextSplitter = None
+
+DEFAULT_DOCS_DIR = os.getenv("RAG_DOCS_DIR", "docs/policies")
+DEFAULT_PERSIST_DIR = os.getenv("RAG_VECTOR_DB_PATH", "data/chroma")
+DEFAULT_PRIVATE_DOCS_DIR = os.getenv("RAG_PRIVATE_DOCS_DIR", "docs/private")
+DEFAULT_PRIVATE_PERSIST_DIR = os.getenv("RAG_PRIVATE_DB_PATH", "data/private")
+MANIFEST_NAME = "index_manifest.json"
+MANIFEST_VERSION = 2  # 2: snapshots carry a lexical index; older ones are re-indexed once
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 150
+EMBED_BATCH_SIZE = 64
+EXTENSIONS = (".md", ".txt", ".pdf")
+PAGE_CHARS = 3000  # text files are counted in pages of this many characters
+MAX_DEFAULT_INGEST_WORKERS = 2  # each worker process re-imports numpy, langchain and the app
+INGEST_QUEUE_BATCHES = max(1, int(os.getenv("RAG_INGEST_QUEUE_BATCHES", 8)))
+RETRIEVAL_MODES = ("hybrid", "vector", "lexical")
+RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "hybrid").lower()
+LEXICAL_FAST_PATH = float(os.getenv("RAG_LEXICAL_FAST_PATH", 0.9))  # coverage to skip embedding; >1 disables
+RRF_K = 60
+FUSION_DEPTH = 20  # candidates taken from each ranking before fusion
+IN_PLACE = "in-place"  # ``_stores`` version of indexes that are not snapshotted
+
+
+def _default_ingest_workers() -> int:
+    """``RAG_INGEST_WORKERS``, else the CPUs this process may use, capped for small containers.
+
+    ``os.cpu_count()`` reports the host's cores, not a container's quota, so
+    it would size the pool for the machine rather than the instance's memory.
+    """
+    configured = int(os.getenv("RAG_INGEST_WORKERS", 0))
+    if configured > 0:
+        return configured
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - not available on macOS/Windows
+        available = 1
+    return max(1, min(available, MAX_DEFAULT_INGEST_WORKERS))
+
+
+INGEST_WORKERS = _default_ingest_workers()
+
+EmbedDocumentsFn = Callable[[List[str]], List[Sequence[float]]]
+EmbedQueryFn = Callable[[str], Sequence[float]]
+SplitFn = Callable[[str], List[str]]
+ProgressFn = Callable[[Dict[str, Any]], None]
+
+_splitter = None
+_stores: Dict[str, Tuple[str, VectorStore, LexicalIndex]] = {}
+_stores_lock = threading.Lock()
+_build_locks: Dict[str, threading.Lock] = {}
+_retrieval_stats = {"vector": 0, "lexical": 0, "hybrid": 0, "lexical_fast_path": 0, "query_embeddings": 0}
+
+
+def default_embed_documents(texts: List[str]) -> List[Sequence[float]]:
+    return embedding_cache.embed(texts)
+
+
+def default_embed_query(text: str) -> Sequence[float]:
+    return embedding_cache.embed_query(text)
+
+
+def default_split(text: str) -> List[str]:
+    if RecursiveCharacterTextSplitter is None:
+        raise RuntimeError("RecursiveCharacterTextSplitter is unavailable; install langchain")
+    global _splitter
+    if _splitter is None:
+        _splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    return _splitter.split_text(text)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def chunk_hash(text: str, tenant: Optional[str] = None) -> str:
+    """Vector id of a chunk; a tenant's chunks never collide with the shared corpus or other tenants."""
+    if tenant is not None:
+        text = f"{tenant}\x00{text}"
+    return content_hash(text.encode("utf-8"))
+
+
+def tenant_of(rel_path: str) -> str:
+    """Partitioned indexes keep each tenant's files under a directory named after it."""
+    return rel_path.split("/", 1)[0]
+
+
+def build_lock(persist_dir: str) -> threading.Lock:
+    """One build at a time per persist directory; different indexes build in parallel."""
+    key = os.path.abspath(persist_dir)
+    with _stores_lock:
+        lock = _build_locks.get(key)
+        if lock is None:
+            lock = _build_locks[key] = threading.Lock()
+        return lock
+
+
+class IndexBusyError(RuntimeError):
+    """Raised when a rollback is requested while a build holds the directory."""
+
+
+def _in_place_indexes(persist_dir: str, *, create: bool = False) -> Optional[Tuple[VectorStore, LexicalIndex]]:
+    """Indexes kept directly in ``persist_dir``, opened once so there is one client per directory."""
+    key = os.path.abspath(persist_dir)
+    with _stores_lock:
+        cached = _stores.get(key)
+        if cached is not None and cached[0] == IN_PLACE:
+            return cached[1], cached[2]
+        if not create and not os.path.exists(_manifest_path(persist_dir)):
+            return None  # never built
+        store, lexical = open_vector_store(persist_dir), open_lexical_index(persist_dir)
+        _stores[key] = (IN_PLACE, store, lexical)
+        return store, lexical
+
+
+def live_indexes(persist_dir: str) -> Optional[Tuple[VectorStore, LexicalIndex]]:
+    """Vector store and lexical index of the snapshot ``CURRENT`` points at, opened once per version.
+
+    Callers keep the returned objects for the whole query, so a swap that
+    happens meanwhile only affects later queries. Backends that cannot be
+    snapshotted (Chroma) are served in place.
+    """
+    if not snapshot_capable(store_label()):
+        return _in_place_indexes(persist_dir)
+    version = index_snapshots.current_version(persist_dir)
+    if version is None:
+        return None
+    key = os.path.abspath(persist_dir)
+    with _stores_lock:
+        cached = _stores.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+    path = index_snapshots.snapshot_path(persist_dir, version)
+    store, lexical = open_vector_store(path), open_lexical_index(path)
+    with _stores_lock:
+        _stores[key] = (version, store, lexical)
+    return store, lexical
+
+
+def live_store(persist_dir: str) -> Optional[VectorStore]:
+    live = live_indexes(persist_dir)
+    return live[0] if live is not None else None
+
+
+def rollback(persist_dir: str = DEFAULT_PERSIST_DIR, version: Optional[str] = None) -> Dict[str, Any]:
+    """Point the index back at ``version`` (default: the previous snapshot)."""
+    if not snapshot_capable(store_label()):
+        raise index_snapshots.SnapshotError("Snapshots are only kept for the numpy vector backend")
+    lock = build_lock(persist_dir)
+    if not lock.acquire(blocking=False):
+        raise IndexBusyError("An index build is running for this directory; retry when it finishes.")
+    try:
+        index_snapshots.rollback(persist_dir, version)
+        with _stores_lock:
+            _stores.pop(os.path.abspath(persist_dir), None)  # the next query opens the restored version
+    finally:
+        lock.release()
+    return index_snapshots.list_snapshots(persist_dir)
+
+
+# --- manifest ------------------------------------------------------------------
+
+
+def _manifest_path(persist_dir: str) -> str:
+    return os.path.join(persist_dir, MANIFEST_NAME)
+
+
+def load_manifest(persist_dir: Optional[str], backend: Optional[str] = None) -> Dict[str, Any]:
+    """The manifest of ``persist_dir``; empty if it was written for another backend."""
+    empty = {"version": MANIFEST_VERSION, "backend": backend, "files": {}}
+    if persist_dir is None:
+        return empty
+    try:
+        with open(_manifest_path(persist_dir), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return empty
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("backend") != backend:
+        return empty  # switching backends re-indexes everything (the embedding cache makes that cheap)
+    return manifest
+
+
+def save_manifest(persist_dir: str, manifest: Dict[str, Any]) -> None:
+    os.makedirs(persist_dir, exist_ok=True)
+    path = _manifest_path(persist_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)  # readers never see a half-written manifest
+
+
+# --- documents -----------------------------------------------------------------
+
+
+def iter_documents(docs_dir: str) -> Iterable[Tuple[str, os.stat_result]]:
+    """Yield ``(relative path, stat)`` for every indexable file, in a stable order."""
+    for root, dirs, files in os.walk(docs_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(EXTENSIONS):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, docs_dir).replace(os.sep, "/"), os.stat(path)
+
+
+def read_pages(path: str, raw: bytes) -> Tuple[str, int]:
+    """Text of a document and its page count."""
+    if path.lower().endswith(".pdf"):
+        from io import BytesIO
+
+        from pypdf import PdfReader  # type: ignore
+
+        pages = PdfReader(BytesIO(raw)).pages
+        return "\n".join(page.extract_text() or "" for page in pages), len(pages)
+    text = raw.decode("utf-8", errors="replace")
+    return text, max(1, math.ceil(len(text) / PAGE_CHARS))
+
+
+def parse_document(
+    docs_dir: str, rel_path: str, known_sha: Optional[str], split: SplitFn, partitioned: bool = False
+) -> Dict[str, Any]:
+    """Hash, extract and split one file; runs in an ingestion worker process.
+
+    ``texts`` is None when the content still hashes to ``known_sha``.
+    """
+    started = time.perf_counter()
+    with open(os.path.join(docs_dir, rel_path), "rb") as handle:
+        raw = handle.read()
+    parsed: Dict[str, Any] = {"sha256": content_hash(raw), "texts": None, "chunks": None, "pages": 0}
+    if parsed["sha256"] != known_sha:
+        text, parsed["pages"] = read_pages(rel_path, raw)
+        parsed["texts"] = [chunk for chunk in split(text) if chunk.strip()]
+        tenant = tenant_of(rel_path) if partitioned else None
+        parsed["chunks"] = [chunk_hash(chunk, tenant) for chunk in parsed["texts"]]
+    parsed["seconds"] = time.perf_counter() - started
+    return parsed
+
+
+def _chunk_metadata(
+    docs_dir: str, sources: List[str], uploaded_at: Dict[str, str], partitioned: bool = False
+) -> Dict[str, Any]:
+    primary = sources[0]
+    metadata = {
+        "source": f"{docs_dir.rstrip('/')}/{primary}",
+        "uploaded_at": uploaded_at[primary],
+        "duplicates": len(sources) - 1,
+    }
+    if partitioned:
+        metadata[PARTITION_KEY] = tenant_of(primary)
+    return metadata
+
+
+def _references(entries: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Chunk hash -> files containing it, in path order."""
+    owners: Dict[str, List[str]] = {}
+    for rel_path in sorted(entries):
+        for digest in entries[rel_path]["chunks"]:
+            sources = owners.setdefault(digest, [])
+            if not sources or sources[-1] != rel_path:
+                sources.append(rel_path)
+    return owners
+
+
+# --- pipeline ------------------------------------------------------------------
+
+
+class _Stage:
+    """Throughput counters of one pipeline stage."""
+
+    __slots__ = ("pages", "items", "busy", "first", "last")
+
+    def __init__(self) -> None:
+        self.pages = 0
+        self.items = 0
+        self.busy = 0.0
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+
+    def add(self, pages: int, items: int, busy: float, started: float, ended: float) -> None:
+        self.pages += pages
+        self.items += items
+        self.busy += busy
+        self.first = started if self.first is None else min(self.first, started)
+        self.last = ended
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = (self.last - self.first) if self.first is not None and self.last is not None else 0.0
+        return {
+            "pages": self.pages,
+            "items": self.items,
+            "busy_seconds": round(self.busy, 3),
+            "wall_seconds": round(wall, 3),
+            "pages_per_second": round(self.pages / wall, 1) if wall > 0 else None,
+        }
+
+
+def _picklable(fn: Callable[..., Any]) -> bool:
+    try:
+        pickle.dumps(fn)
+    except Exception:
+        return False
+    return True
+
+
+_Candidate = Tuple[str, os.stat_result, Optional[Dict[str, Any]]]  # (path, stat, manifest entry)
+
+
+def _parse_stream(
+    docs_dir: str, candidates: List[_Candidate], split: SplitFn, workers: int, partitioned: bool = False
+) -> Iterable[Tuple[_Candidate, Dict[str, Any]]]:
+    """Yield ``(candidate, parsed)`` in order with at most ``2 * workers`` files in flight.
+
+    Splitters that cannot be pickled (lambdas, closures) run in this process.
+    """
+    workers = min(workers, len(candidates))
+    if workers <= 1 or not _picklable(split):
+        for candidate in candidates:
+            rel_path, _, entry = candidate
+            yield candidate, parse_document(docs_dir, rel_path, entry and entry["sha256"], split, partitioned)
+        return
+    # spawn, not fork: the server process has live threads (and so may the caller).
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    pending: deque = deque()
+    try:
+        for candidate in candidates:
+            rel_path, _, entry = candidate
+            known_sha = entry and entry["sha256"]
+            pending.append(
+                (candidate, pool.submit(parse_document, docs_dir, rel_path, known_sha, split, partitioned))
+            )
+            if len(pending) >= 2 * workers:
+                candidate, future = pending.popleft()
+                yield candidate, future.result()
+        while pending:
+            candidate, future = pending.popleft()
+            yield candidate, future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+_Chunk = Tuple[str, str, Dict[str, Any]]  # (chunk hash, text, metadata)
+
+
+class _Embedder:
+    """Embeds and stores chunk batches on a thread fed through a bounded queue.
+
+    ``add`` blocks while the queue is full, which in turn holds back parsing.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        lexical: Optional[LexicalIndex],
+        embed_documents: EmbedDocumentsFn,
+        on_embedded: Callable[[int], None],
+        max_batches: Optional[int] = None,
+    ):
+        self.store = store
+        self.lexical = lexical
+        self.embed_documents = embed_documents
+        self.on_embedded = on_embedded
+        self.stage = _Stage()
+        self.embedded = 0
+        self.error: Optional[BaseException] = None
+        self._queue: "queue.Queue[Optional[Tuple[int, List[_Chunk]]]]" = queue.Queue(max_batches or INGEST_QUEUE_BATCHES)
+        self._batch: List[_Chunk] = []
+        self._pages = 0
+        self._thread = threading.Thread(target=self._run, name="rag-embed", daemon=True)
+        self._thread.start()
+
+    def add(self, pages: int, items: List[_Chunk]) -> None:
+        if self.error is not None:
+            raise self.error
+        self._pages += pages  # counted with the batch holding the file's first new chunk
+        for item in items:
+            self._batch.append(item)
+            if len(self._batch) >= EMBED_BATCH_SIZE:
+                self._put()
+
+    def _put(self) -> None:
+        self._queue.put((self._pages, self._batch))
+        self._batch, self._pages = [], 0
+
+    def close(self) -> None:
+        """Embed what is left and wait; re-raises an embedding or store error."""
+        if self._batch:
+            self._put()
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def cancel(self) -> None:
+        if self._thread.is_alive():
+            self.error = self.error or RuntimeError("cancelled")
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue  # keep draining so a blocked ``add`` can return and see the error
+            pages, batch = item
+            started = time.perf_counter()
+            try:
+                ids = [digest for digest, _, _ in batch]
+                texts = [text for _, text, _ in batch]
+                metadatas = [metadata for _, _, metadata in batch]
+                self.store.upsert(ids, self.embed_documents(texts), texts, metadatas)
+                if self.lexical is not None:
+                    self.lexical.add(ids, texts, metadatas)
+            except BaseException as error:
+                self.error = error
+                continue
+            ended = time.perf_counter()
+            self.stage.add(pages, len(batch), ended - started, started, ended)
+            self.embedded += len(batch)
+            self.on_embedded(self.embedded)
+
+
+# --- build ---------------------------------------------------------------------
+
+
+def build_index(
+    docs_dir: str = DEFAULT_DOCS_DIR,
+    persist_dir: str = DEFAULT_PERSIST_DIR,
+    *,
+    store: Optional[Any] = None,
+    embed_documents: Optional[EmbedDocumentsFn] = None,
+    split: Optional[SplitFn] = None,
+    on_progress: Optional[ProgressFn] = None,
+    workers: int = INGEST_WORKERS,
+    partitioned: bool = False,
+    lexical: Optional[LexicalIndex] = None,
+) -> Dict[str, Any]:
+    """Bring the vector index in line with ``docs_dir`` and report what changed.
+
+    ``added`` counts newly embedded chunks, ``removed`` deleted vectors and
+    ``skipped`` chunks that were already indexed (including duplicates).
+    ``stages`` gives pages per second for parsing and embedding.
+    ``on_progress`` receives counters after every file and embedding batch.
+    ``partitioned`` indexes ``docs_dir/<tenant>/...`` with per-tenant chunk
+    ids and ``tenant`` metadata; files directly in ``docs_dir`` are ignored.
+
+    With the NumPy backend, changes are written to a new snapshot that goes
+    live in one pointer swap (see ``index_snapshots``). Chroma, which writes
+    into its files and cannot be cloned cheaply, and a caller-supplied
+    ``store`` (and optional ``lexical`` index) are written in place instead,
+    with the manifest kept directly in ``persist_dir``.
+    """
+    started = time.perf_counter()
+    embed_documents = embed_documents or default_embed_documents
+    split = split or default_split
+    progress = {"stage": "scanning", "files_total": 0, "files_parsed": 0, "chunks_total": 0, "chunks_embedded": 0}
+    progress_lock = threading.Lock()
+
+    def report_progress(**changes: Any) -> None:
+        with progress_lock:  # the embedding thread reports too
+            progress.update(changes)
+            current = dict(progress)
+        if on_progress is not None:
+            on_progress(current)
+
+    backend = getattr(store, "label", None) if store is not None else store_label()
+    with build_lock(persist_dir):
+        if store is None and not snapshot_capable(backend):
+            store, lexical = _in_place_indexes(persist_dir, create=True)
+        index_dir = persist_dir if store is not None else index_snapshots.current_path(persist_dir)
+        manifest = load_manifest(index_dir, backend)
+        previous: Dict[str, Dict[str, Any]] = manifest["files"]
+        files: Dict[str, Dict[str, Any]] = {}
+        candidates: List[_Candidate] = []
+        for rel_path, stat in iter_documents(docs_dir):
+            if partitioned and "/" not in rel_path:
+                continue  # belongs to no tenant
+            entry = previous.get(rel_path)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                files[rel_path] = entry
+            else:
+                candidates.append((rel_path, stat, entry))
+        report_progress(files_total=len(files) + len(candidates), files_parsed=len(files))
+
+        snapshot, target_dir = None, persist_dir
+
+        def target_store() -> VectorStore:
+            nonlocal snapshot, target_dir, store, lexical
+            if store is None:
+                # Unchanged files' vectors come along by hard-linked clone; readers keep the live snapshot.
+                snapshot, target_dir = index_snapshots.begin(persist_dir, index_dir if previous else None, link=True)
+                store, lexical = open_vector_store(target_dir), open_lexical_index(target_dir)
+            return store
+
+        changed_files = set()
+        before: Optional[Dict[str, List[str]]] = None
+        scheduled: Dict[str, str] = {}  # newly embedded chunk -> file its provisional metadata names
+        parse_stage = _Stage()
+        embedder: Optional[_Embedder] = None
+        try:
+            parse_started = time.perf_counter()
+            for (rel_path, stat, entry), parsed in _parse_stream(docs_dir, candidates, split, workers, partitioned):
+                report_progress(files_parsed=progress["files_parsed"] + 1)
+                if parsed["texts"] is None:  # touched, not edited
+                    files[rel_path] = {**entry, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                    continue
+                changed_files.add(rel_path)
+                files[rel_path] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": parsed["sha256"],
+                    "uploaded_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+                    "chunks": parsed["chunks"],
+                }
+                parse_stage.add(parsed["pages"], 1, parsed["seconds"], parse_started, time.perf_counter())
+                if before is None:
+                    before = _references(previous)
+                # Embed as soon as a chunk is first seen; the final source/duplicates
+                # metadata is only known after the scan and is patched up below.
+                metadata = _chunk_metadata(
+                    docs_dir, [rel_path], {rel_path: files[rel_path]["uploaded_at"]}, partitioned
+                )
+                fresh = []
+                for digest, text in zip(parsed["chunks"], parsed["texts"]):
+                    if digest not in before and digest not in scheduled:
+                        scheduled[digest] = rel_path
+                        fresh.append((digest, text, metadata))
+                if fresh:
+                    if embedder is None:
+                        embedder = _Embedder(
+                            target_store(), lexical, embed_documents, lambda done: report_progress(chunks_embedded=done)
+                        )
+                    embedder.add(parsed["pages"], fresh)
+
+            total_chunks = sum(len(entry["chunks"]) for entry in files.values())
+            if not changed_files and files.keys() == previous.keys():
+                # Nothing to embed or delete: skip the reference bookkeeping entirely.
+                if files != previous and index_dir is not None:
+                    save_manifest(index_dir, {**manifest, "files": files})
+                return _report(manifest.get("indexed_chunks", 0), 0, 0, total_chunks, files, 0, 0, started)
+
+            report_progress(stage="embedding", chunks_total=len(scheduled))
+            if embedder is not None:
+                embedder.close()
+            before = _references(previous) if before is None else before
+            after = _references(files)
+            removed = [digest for digest in before if digest not in after]
+            # Chunks that stay indexed but whose owning files changed only need new metadata,
+            # as do new chunks that turned out to be shared with other files.
+            relabelled = [
+                digest
+                for digest, sources in after.items()
+                if digest in before and (before[digest] != sources or sources[0] in changed_files)
+            ]
+            relabelled += [digest for digest, source in scheduled.items() if after[digest] != [source]]
+
+            target = target_store()
+            indexes = [target] if lexical is None else [target, lexical]
+            if relabelled:
+                uploaded_at = {rel_path: entry["uploaded_at"] for rel_path, entry in files.items()}
+                metadatas = [_chunk_metadata(docs_dir, after[digest], uploaded_at, partitioned) for digest in relabelled]
+                for index in indexes:
+                    index.update_metadata(relabelled, metadatas)
+            for index in indexes:
+                if removed:
+                    index.delete(removed)
+                index.flush()
+            save_manifest(
+                target_dir,
+                {"version": MANIFEST_VERSION, "backend": backend, "indexed_chunks": len(after), "files": files},
+            )
+            report = _report(
+                len(after),
+                len(scheduled),
+                len(removed),
+                total_chunks - len(scheduled),
+                files,
+                len(changed_files),
+                len(set(previous) - set(files)),
+                started,
+                stages={
+                    "parse": parse_stage.to_dict(),
+                    "embed": (embedder.stage if embedder is not None else _Stage()).to_dict(),
+                },
+            )
+            if snapshot is not None:
+                index_snapshots.publish(persist_dir, snapshot, report)
+                with _stores_lock:
+                    _stores[os.path.abspath(persist_dir)] = (snapshot, target, lexical)
+                report["snapshot"] = snapshot
+                report["collected"] = index_snapshots.collect_garbage(persist_dir)
+        except BaseException:
+            if embedder is not None:
+                embedder.cancel()
+            if snapshot is not None:
+                index_snapshots.abort(persist_dir, snapshot)
+            raise
+    return report
+
+
+def _report(
+    indexed: int,
+    added: int,
+    removed: int,
+    skipped: int,
+    files: Dict[str, Any],
+    files_changed: int,
+    files_removed: int,
+    started: float,
+    *,
+    stages: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    report = {
+        "indexed_chunks": indexed,
+        "added": added,
+        "removed": removed,
+        "skipped": skipped,
+        "files": len(files),
+        "files_changed": files_changed,
+        "files_removed": files_removed,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    if stages is not None:
+        report["stages"] = stages
+    return report
+
+
+def _rrf(rankings: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Reciprocal-rank fusion; hits are identified by chunk id, so a chunk found by both retrievers merges."""
+    fused: Dict[str, Dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking):
+            key = chunk_hash(hit["page_content"], hit["metadata"].get(PARTITION_KEY))
+            entry = fused.setdefault(key, {**hit, "score": 0.0})
+            entry["score"] += 1.0 / (RRF_K + rank + 1)
+    for entry in fused.values():
+        entry["score"] = round(entry["score"], 6)
+    return sorted(fused.values(), key=lambda hit: hit["score"], reverse=True)
+
+
+def _lexical_hits(
+    lexical: LexicalIndex, store: VectorStore, query: str, depth: int, partition: Optional[str]
+) -> Tuple[List[Dict[str, Any]], float]:
+    """Lexical matches resolved to chunks, plus the coverage of the best one."""
+    matches = lexical.search(query, depth, partition=partition)
+    chunks = store.get([key for key, _, _ in matches]) if matches else []
+    hits = [
+        {**chunk, "score": score}
+        for (_, score, _), chunk in zip(matches, chunks)
+        if chunk is not None
+    ]
+    return hits, (matches[0][2] if matches else 0.0)
+
+
+def vector_search(
+    query: str,
+    top_k: int = 4,
+    persist_dir: str = DEFAULT_PERSIST_DIR,
+    *,
+    business_id: Optional[str] = None,
+    private_dir: str = DEFAULT_PRIVATE_PERSIST_DIR,
+    mode: Optional[str] = None,
+    store: Optional[Any] = None,
+    private_store: Optional[Any] = None,
+    embed_query: Optional[EmbedQueryFn] = None,
+) -> List[Dict[str, Any]]:
+    """Top-k chunks as ``{"page_content", "metadata", "score"}`` dicts.
+
+    With ``business_id`` the business's private partition is searched too
+    (filtered inside the index) and both result lists are merged.
+
+    ``mode`` (default ``RAG_RETRIEVAL_MODE``) is ``vector`` (cosine scores),
+    ``lexical`` (BM25 only, never embeds) or ``hybrid``: BM25 and vector
+    rankings fused by reciprocal rank, skipping the embedding when the best
+    lexical match's coverage reaches ``LEXICAL_FAST_PATH``. Fused results are
+    scored by RRF. Injected stores have no lexical index and search by vector.
+    """
+    mode = (mode or RETRIEVAL_MODE).lower()
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode: {mode}")
+    if not query or not query.strip():
+        return []
+    lexical = private_lexical = None
+    if store is None:
+        store, lexical = live_indexes(persist_dir) or (None, None)
+    if business_id and private_store is None:
+        private_store, private_lexical = live_indexes(private_dir) or (None, None)
+    if not business_id:
+        private_store = None
+    if store is None and private_store is None:
+        return []  # nothing indexed yet
+
+    rankings: List[List[Dict[str, Any]]] = []
+    coverage = 0.0
+    if mode != "vector":
+        for index, vectors, partition in ((lexical, store, None), (private_lexical, private_store, business_id)):
+            if index is not None and vectors is not None:
+                hits, best = _lexical_hits(index, vectors, query, FUSION_DEPTH, partition)
+                rankings.append(hits)
+                coverage = max(coverage, best)
+    if mode == "lexical" or (rankings and coverage >= LEXICAL_FAST_PATH):
+        with _stores_lock:
+            _retrieval_stats["lexical" if mode == "lexical" else "lexical_fast_path"] += 1
+        return (rankings[0] if len(rankings) == 1 else _rrf(rankings))[:top_k]
+
+    depth = top_k if not rankings else max(top_k, FUSION_DEPTH)
+    embedding = (embed_query or default_embed_query)(query)
+    hits = store.query(embedding, depth) if store is not None else []
+    if private_store is not None:
+        hits += private_store.query(embedding, depth, partition=business_id)
+        hits.sort(key=lambda hit: hit["score"], reverse=True)
+    with _stores_lock:
+        _retrieval_stats["query_embeddings"] += 1
+        _retrieval_stats["hybrid" if rankings else "vector"] += 1
+    if not rankings:
+        return hits[:top_k]
+    return _rrf([*rankings, hits])[:top_k]
+
+
+def retrieval_stats() -> Dict[str, Any]:
+    """How queries were answered since startup; ``lexical_fast_path`` ones cost no embedding."""
+    with _stores_lock:
+        stats: Dict[str, Any] = dict(_retrieval_stats)
+    searches = stats["vector"] + stats["lexical"] + stats["hybrid"] + stats["lexical_fast_path"]
+    stats["fast_path_rate"] = round(stats["lexical_fast_path"] / searches, 4) if searches else 0.0
+    stats["mode"] = RETRIEVAL_MODE
+    return stats
@@ -0,0 +1,385 @@
+"""Fleet-wide Signal Index (docs/phase-5/signal-spec.md).
+
+Every rule is evaluated for a whole batch of businesses with NumPy group
+reductions over flat ``metrics_daily`` arrays:
+
+1. Profit margin versus the industry average margin.
+2. Month-over-month sales growth (last 30 days versus the 30 before, relative
+   to each business's latest metric date).
+3. Settlement delays. ``metrics_daily`` only records a delay *count*, so the
+   amount thresholds of the spec are applied to counts
+   (``DELAY_RED_COUNT``).
+
+``SignalEngine.run`` recomputes only businesses with ``metrics_daily`` rows
+inserted or updated since the previous run (an ``updated_at`` watermark, so a
+re-ingested day counts as a change) and keeps the latest result per business in
+memory, so reading one business's signal is a dict lookup. Each run is recorded
+in ``data_jobs`` with its watermark, as the alert scheduler does, so a restart
+resumes instead of re-evaluating the whole fleet.
+
+Industry averages are taken over the whole fleet: the margins persisted in
+``business_signals`` seed the peer set once per process, so a small
+``refresh`` batch is judged against the same baseline as a full run.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from services.supabase_client import supabase
+
+logger = logging.getLogger("foodbiz.ai")
+
+JOB_TYPE = "signal_recompute"
+
+GREEN, ORANGE, RED = 0, 1, 2
+LEVEL_NAMES = ("green", "orange", "red")
+
+WINDOW_DAYS = 30
+DEFAULT_INDUSTRY_MARGIN = float(os.getenv("SIGNAL_DEFAULT_INDUSTRY_MARGIN", 0.15))
+DELAY_RED_COUNT = int(os.getenv("SIGNAL_DELAY_RED_COUNT", 3))
+MIN_INDUSTRY_SAMPLE = 5
+ID_CHUNK_SIZE = 200
+PAGE_SIZE = 1000
+
+
+@dataclass
+class SignalBatch:
+    business_ids: np.ndarray  # unique ids, index = business code
+    margin: np.ndarray
+    growth: np.ndarray
+    delay_count: np.ndarray
+    margin_level: np.ndarray
+    growth_level: np.ndarray
+    delay_level: np.ndarray
+    signal: np.ndarray
+
+    def records(self, industry_margin: np.ndarray, evaluated_at: str) -> List[Dict[str, Any]]:
+        return [
+            {
+                "business_id": str(self.business_ids[i]),
+                "signal": LEVEL_NAMES[self.signal[i]],
+                "margin_level": LEVEL_NAMES[self.margin_level[i]],
+                "growth_level": LEVEL_NAMES[self.growth_level[i]],
+                "delay_level": LEVEL_NAMES[self.delay_level[i]],
+                "profit_margin": _float_or_none(self.margin[i]),
+                "industry_margin": _float_or_none(industry_margin[i]),
+                "sales_growth": _float_or_none(self.growth[i]),
+                "settlement_delay_count": int(self.delay_count[i]),
+                "evaluated_at": evaluated_at,
+            }
+            for i in range(self.business_ids.shape[0])
+        ]
+
+
+def _float_or_none(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+def evaluate_signals(
+    business_ids: np.ndarray,
+    metric_days: np.ndarray,
+    net_sales: np.ndarray,
+    cost_of_goods: np.ndarray,
+    delay_counts: np.ndarray,
+    industry_margin_of: Optional[np.ndarray] = None,
+) -> tuple[SignalBatch, np.ndarray]:
+    """Evaluate all three rules for every business in the flat row arrays.
+
+    ``metric_days`` are integer day numbers (e.g. ``datetime64[D]`` as int).
+    ``industry_margin_of`` gives the industry average margin per *unique*
+    business (aligned with the sorted unique ids); when omitted,
+    ``DEFAULT_INDUSTRY_MARGIN`` is used. Returns the batch and the margin
+    baseline that was applied.
+    """
+    unique_ids, codes = np.unique(business_ids, return_inverse=True)
+    count = unique_ids.shape[0]
+
+    latest = np.full(count, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(latest, codes, metric_days.astype(np.int64))
+    age = latest[codes] - metric_days
+    current = (age >= 0) & (age < WINDOW_DAYS)
+    previous = (age >= WINDOW_DAYS) & (age < 2 * WINDOW_DAYS)
+
+    sales_now = np.bincount(codes, weights=np.where(current, net_sales, 0.0), minlength=count)
+    cost_now = np.bincount(codes, weights=np.where(current, cost_of_goods, 0.0), minlength=count)
+    sales_before = np.bincount(codes, weights=np.where(previous, net_sales, 0.0), minlength=count)
+    delays_now = np.bincount(codes, weights=np.where(current, delay_counts, 0.0), minlength=count)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        margin = np.where(sales_now > 0, (sales_now - cost_now) / sales_now, np.nan)
+        growth = np.where(sales_before > 0, (sales_now - sales_before) / sales_before, np.nan)
+
+    baseline = (
+        np.full(count, DEFAULT_INDUSTRY_MARGIN)
+        if industry_margin_of is None
+        else np.where(np.isnan(industry_margin_of), DEFAULT_INDUSTRY_MARGIN, industry_margin_of)
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.where(baseline > 0, margin / baseline, np.nan)
+    margin_level = np.select([ratio < 0.5, ratio <= 0.8], [RED, ORANGE], default=GREEN)
+    margin_level = np.where(np.isnan(ratio), GREEN, margin_level)
+
+    growth_level = np.select([growth < -0.15, growth < 0], [RED, ORANGE], default=GREEN)
+    growth_level = np.where(np.isnan(growth), GREEN, growth_level)
+
+    delay_level = np.select([delays_now >= DELAY_RED_COUNT, delays_now > 0], [RED, ORANGE], default=GREEN)
+
+    signal = np.maximum(np.maximum(margin_level, growth_level), delay_level)
+    batch = SignalBatch(
+        business_ids=unique_ids,
+        margin=margin,
+        growth=growth,
+        delay_count=delays_now.astype(np.int64),
+        margin_level=margin_level.astype(np.int8),
+        growth_level=growth_level.astype(np.int8),
+        delay_level=delay_level.astype(np.int8),
+        signal=signal.astype(np.int8),
+    )
+    return batch, baseline
+
+
+def industry_margins(margins: np.ndarray, industries: np.ndarray) -> Dict[str, float]:
+    """Mean margin per industry, skipping businesses without sales and tiny samples."""
+    valid = ~np.isnan(margins)
+    labels, codes = np.unique(industries[valid], return_inverse=True)
+    sums = np.bincount(codes, weights=margins[valid], minlength=labels.shape[0])
+    counts = np.bincount(codes, minlength=labels.shape[0])
+    return {
+        str(label): float(sums[i] / counts[i])
+        for i, label in enumerate(labels)
+        if counts[i] >= MIN_INDUSTRY_SAMPLE
+    }
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _paged(builder_factory) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        page = builder_factory().range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        offset += PAGE_SIZE
+
+
+class SignalEngine:
+    def __init__(self):
+        self._signals: Dict[str, Dict[str, Any]] = {}
+        self._margins: Dict[str, float] = {}
+        self._industries: Dict[str, str] = {}
+        self._watermark: Optional[str] = None
+        self._watermark_loaded = False
+        self._fleet_loaded = False
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def get(self, business_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._signals.get(business_id)
+        if cached is not None:
+            return cached
+        row = (
+            supabase.table("business_signals")
+            .select("*")
+            .eq("business_id", business_id)
+            .limit(1)
+            .execute()
+            .data
+            or []
+        )
+        if row:
+            with self._lock:
+                self._signals[business_id] = row[0]
+            return row[0]
+        return None
+
+    def _load_watermark(self) -> Optional[str]:
+        """Watermark of the latest successful run recorded in ``data_jobs``."""
+        rows = (
+            supabase.table("data_jobs")
+            .select("message")
+            .eq("job_type", JOB_TYPE)
+            .eq("status", "success")
+            .order("finished_at", desc=True)
+            .limit(1)
+            .execute()
+            .data
+            or []
+        )
+        if not rows:
+            return None
+        try:
+            return json.loads(rows[0].get("message") or "{}").get("watermark")
+        except (TypeError, ValueError):
+            logger.warning("Ignoring unreadable %s watermark: %s", JOB_TYPE, rows[0].get("message"))
+            return None
+
+    def _load_fleet(self) -> None:
+        """Seed peer margins and industries from the persisted signals, once per process."""
+        if self._fleet_loaded:
+            return
+        signals = _paged(
+            lambda: supabase.table("business_signals").select("business_id, profit_margin").order("business_id")
+        )
+        businesses = _paged(lambda: supabase.table("businesses").select("id, industry").order("id"))
+        with self._lock:
+            for row in signals:
+                if row.get("business_id") and row.get("profit_margin") is not None:
+                    self._margins.setdefault(str(row["business_id"]), float(row["profit_margin"]))
+            for business in businesses:
+                self._industries.setdefault(str(business["id"]), business.get("industry") or "")
+            self._fleet_loaded = True
+
+    def _changed_businesses(self) -> tuple[List[str], Optional[str]]:
+        def factory():
+            builder = supabase.table("metrics_daily").select("business_id, updated_at")
+            if self._watermark:
+                builder = builder.gt("updated_at", self._watermark)
+            return builder.order("updated_at", desc=False)
+
+        rows = _paged(factory)
+        changed = list(dict.fromkeys(str(row["business_id"]) for row in rows if row.get("business_id")))
+        watermark = max((str(row["updated_at"]) for row in rows if row.get("updated_at")), default=self._watermark)
+        return changed, watermark
+
+    def _load_rows(self, business_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        since = (date.today() - timedelta(days=2 * WINDOW_DAYS + 7)).isoformat()
+        rows: List[Dict[str, Any]] = []
+        for start in range(0, len(business_ids), ID_CHUNK_SIZE):
+            chunk = list(business_ids[start:start + ID_CHUNK_SIZE])
+            rows.extend(
+                _paged(
+                    lambda: supabase.table("metrics_daily")
+                    .select("business_id, metric_date, net_sales, cost_of_goods, settlement_delay_count")
+                    .in_("business_id", chunk)
+                    .gte("metric_date", since)
+                    .order("metric_date", desc=False)
+                )
+            )
+            for business in (
+                supabase.table("businesses").select("id, industry").in_("id", chunk).execute().data or []
+            ):
+                self._industries[str(business["id"])] = business.get("industry") or ""
+        return rows
+
+    def evaluate_rows(self, rows: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Evaluate raw ``metrics_daily`` rows and fold the results into the store."""
+        rows = [row for row in rows if row.get("business_id") and row.get("metric_date")]
+        if not rows:
+            return []
+        ids = np.array([str(row["business_id"]) for row in rows])
+        days = np.array([str(row["metric_date"])[:10] for row in rows], dtype="datetime64[D]").astype(np.int64)
+        net = np.array([float(row.get("net_sales") or 0) for row in rows])
+        cost = np.array([float(row.get("cost_of_goods") or 0) for row in rows])
+        delays = np.array([float(row.get("settlement_delay_count") or 0) for row in rows])
+
+        # First pass gives fresh margins; industry averages use the whole fleet's latest margins.
+        batch, _ = evaluate_signals(ids, days, net, cost, delays)
+        with self._lock:
+            for business_id, margin in zip(batch.business_ids, batch.margin):
+                self._margins[str(business_id)] = float(margin)
+            fleet_ids = list(self._margins)
+            fleet_margins = np.array([self._margins[b] for b in fleet_ids])
+            fleet_industries = np.array([self._industries.get(b, "") for b in fleet_ids])
+        averages = industry_margins(fleet_margins, fleet_industries)
+        baseline = np.array(
+            [averages.get(self._industries.get(str(b), ""), np.nan) for b in batch.business_ids]
+        )
+        batch, applied = evaluate_signals(ids, days, net, cost, delays, industry_margin_of=baseline)
+
+        records = batch.records(applied, datetime.utcnow().isoformat())
+        with self._lock:
+            for record in records:
+                self._signals[record["business_id"]] = record
+        return records
+
+    def refresh(self, business_ids: Sequence[str]) -> List[tuple[Optional[str], Dict[str, Any]]]:
+        """Re-evaluate the given businesses and persist them.
+
+        Returns ``(previous_signal, record)`` pairs so callers can react to
+        level changes; ``previous_signal`` is ``None`` for first evaluations.
+        """
+        business_ids = list(dict.fromkeys(business_ids))
+        if not business_ids:
+            return []
+        with self._lock:
+            previous = {b: (self._signals.get(b) or {}).get("signal") for b in business_ids}
+        # After a restart the memory store is empty; the persisted signals are
+        # the previous levels, so level changes still surface.
+        missing = [b for b, signal in previous.items() if signal is None]
+        for start in range(0, len(missing), ID_CHUNK_SIZE):
+            for row in (
+                supabase.table("business_signals")
+                .select("business_id, signal")
+                .in_("business_id", missing[start:start + ID_CHUNK_SIZE])
+                .execute()
+                .data
+                or []
+            ):
+                previous[str(row["business_id"])] = row.get("signal")
+        self._load_fleet()
+        records = self.evaluate_rows(self._load_rows(business_ids))
+        for start in range(0, len(records), PAGE_SIZE):
+            supabase.table("business_signals").upsert(
+                records[start:start + PAGE_SIZE], on_conflict="business_id"
+            ).execute()
+        return [(previous.get(record["business_id"]), record) for record in records]
+
+    def _start_job(self) -> Optional[Any]:
+        rows = (
+            supabase.table("data_jobs")
+            .insert({"job_type": JOB_TYPE, "status": "running", "run_at": _now()})
+            .execute()
+            .data
+            or []
+        )
+        return rows[0].get("id") if rows else None
+
+    def _finish_job(self, job_id: Optional[Any], status: str, message: str) -> None:
+        values = {"status": status, "message": message, "finished_at": _now()}
+        if job_id is None:
+            supabase.table("data_jobs").insert({"job_type": JOB_TYPE, **values}).execute()
+        else:
+            supabase.table("data_jobs").update(values).eq("id", job_id).execute()
+
+    def run(self, full: bool = False) -> Dict[str, Any]:
+        """Recompute signals for businesses whose metrics changed since the last run."""
+        with self._run_lock:
+            if not self._watermark_loaded:
+                self._watermark = self._load_watermark()
+                self._watermark_loaded = True
+            if full:
+                self._watermark = None
+            started = time.perf_counter()
+            job_id = self._start_job()
+            try:
+                changed, watermark = self._changed_businesses()
+                results = self.refresh(changed)
+            except Exception as error:
+                duration_ms = round((time.perf_counter() - started) * 1000, 2)
+                self._finish_job(job_id, "failed", json.dumps({"error": str(error), "duration_ms": duration_ms}))
+                raise
+            self._watermark = watermark
+            report = {
+                "evaluated": len(results),
+                "watermark": watermark,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+            self._finish_job(job_id, "success", json.dumps(report))
+            return report
+
+
+signal_engine = SignalEngine()
@@ -0,0 +1,165 @@
+"""Vectorised multi-metric analytics over ``metrics_daily``.
+
+Rows are laid onto a dense daily calendar (missing days are NaN) and every
+statistic is computed with array operations, so a multi-year range costs a
+handful of NumPy passes rather than a Python loop per row.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from services.supabase_client import supabase
+
+METRIC_COLUMNS = ("gross_sales", "net_sales", "cost_of_goods", "tax_amount", "settlement_delay_count")
+MOVING_WINDOWS = (7, 28, 90)
+WEEKDAY_LABELS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+PAGE_SIZE = 1000  # PostgREST caps a single response at 1000 rows by default
+
+
+@dataclass
+class MetricsFrame:
+    dates: np.ndarray  # datetime64[D], one entry per calendar day
+    columns: Dict[str, np.ndarray]  # float64, NaN where the day has no row
+
+    def __len__(self) -> int:
+        return int(self.dates.shape[0])
+
+
+def frame_from_rows(rows: Iterable[Mapping[str, Any]]) -> MetricsFrame:
+    rows = [row for row in rows if row.get("metric_date")]
+    if not rows:
+        return MetricsFrame(np.array([], dtype="datetime64[D]"), {c: np.array([]) for c in METRIC_COLUMNS})
+
+    raw_dates = np.array([str(row["metric_date"])[:10] for row in rows], dtype="datetime64[D]")
+    start = raw_dates.min()
+    length = int((raw_dates.max() - start).astype(int)) + 1
+    offsets = (raw_dates - start).astype(int)
+
+    columns: Dict[str, np.ndarray] = {}
+    for column in METRIC_COLUMNS:
+        values = np.array([row.get(column) for row in rows], dtype=object)
+        values[values == None] = np.nan  # noqa: E711 - elementwise None check
+        dense = np.full(length, np.nan)
+        dense[offsets] = values.astype(float)
+        columns[column] = dense
+    return MetricsFrame(start + np.arange(length), columns)
+
+
+def load_metrics_frame(business_id: str, date_from: Optional[date], date_to: Optional[date]) -> MetricsFrame:
+    rows: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        builder = (
+            supabase.table("metrics_daily")
+            .select("metric_date, " + ", ".join(METRIC_COLUMNS))
+            .eq("business_id", business_id)
+        )
+        if date_from:
+            builder = builder.gte("metric_date", date_from.isoformat())
+        if date_to:
+            builder = builder.lte("metric_date", date_to.isoformat())
+        page = builder.order("metric_date", desc=False).range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
+    return frame_from_rows(rows)
+
+
+def _moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over the last ``window`` days, ignoring missing days."""
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    upper = np.arange(1, values.shape[0] + 1)
+    lower = np.maximum(upper - window, 0)
+    window_counts = counts[upper] - counts[lower]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(window_counts > 0, (sums[upper] - sums[lower]) / window_counts, np.nan)
+
+
+def _period_change(values: np.ndarray, period: int) -> Optional[float]:
+    """Relative change of the last ``period`` days' total versus the period before."""
+    if values.shape[0] < 2 * period:
+        return None
+    current = np.nansum(values[-period:])
+    previous = np.nansum(values[-2 * period:-period])
+    if previous == 0:
+        return None
+    return float((current - previous) / previous)
+
+
+def _last_valid(values: np.ndarray) -> Optional[float]:
+    valid = np.flatnonzero(~np.isnan(values))
+    return float(values[valid[-1]]) if valid.size else None
+
+
+def _clean(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return None if np.isnan(value) or np.isinf(value) else value
+
+
+def compute_analytics(frame: MetricsFrame, windows: Sequence[int] = MOVING_WINDOWS) -> Dict[str, Optional[float]]:
+    """Flat statistics suitable for ``RagQueryResponse.calculations``."""
+    if len(frame) == 0:
+        return {}
+    net = frame.columns["net_sales"]
+    gross = frame.columns["gross_sales"]
+    cost = frame.columns["cost_of_goods"]
+    tax = frame.columns["tax_amount"]
+    delays = frame.columns["settlement_delay_count"]
+
+    stats: Dict[str, Optional[float]] = {}
+    for window in windows:
+        stats[f"moving_avg_{window}"] = _last_valid(_moving_average(net, window))
+
+    stats["wow_change"] = _period_change(net, 7)
+    stats["mom_change"] = _period_change(net, 28)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        margin = np.where(net > 0, (net - cost) / net, np.nan)
+    stats["margin_latest"] = _last_valid(margin)
+    stats["margin_avg"] = _clean(np.nanmean(margin)) if np.any(~np.isnan(margin)) else None
+    stats["margin_avg_28"] = _last_valid(_moving_average(margin, 28))
+
+    valid_net = net[~np.isnan(net)]
+    if valid_net.size >= 2 and valid_net.std() > 0:
+        z_scores = (net - valid_net.mean()) / valid_net.std()
+        stats["zscore_latest"] = _last_valid(z_scores)
+        stats["anomaly_days"] = float(np.count_nonzero(np.abs(z_scores) >= 2))
+    else:
+        stats["zscore_latest"] = None
+        stats["anomaly_days"] = 0.0
+
+    # Weekday seasonality: mean net sales per weekday relative to the overall mean.
+    weekdays = (frame.dates.astype("datetime64[D]").view("int64") - 4) % 7  # 1970-01-01 was a Thursday
+    valid = ~np.isnan(net)
+    weekday_sums = np.bincount(weekdays[valid], weights=net[valid], minlength=7)
+    weekday_counts = np.bincount(weekdays[valid], minlength=7)
+    overall = valid_net.mean() if valid_net.size else 0.0
+    for index, label in enumerate(WEEKDAY_LABELS):
+        if weekday_counts[index] and overall:
+            stats[f"weekday_index_{label}"] = float(weekday_sums[index] / weekday_counts[index] / overall)
+        else:
+            stats[f"weekday_index_{label}"] = None
+
+    stats["gross_sales_total"] = _clean(np.nansum(gross))
+    stats["net_sales_total"] = _clean(np.nansum(net))
+    stats["tax_amount_total"] = _clean(np.nansum(tax))
+    stats["settlement_delay_total"] = _clean(np.nansum(delays))
+    stats["days_with_data"] = float(np.count_nonzero(valid))
+    return {key: _clean(value) for key, value in stats.items()}
+
+
+def fetch_analytics(
+    business_id: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> Dict[str, Optional[float]]:
+    return compute_analytics(load_metrics_frame(business_id, date_from, date_to))
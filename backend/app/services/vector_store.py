@@ -0,0 +1,657 @@
+"""Vector store backends for the document index.
+
+``rag_indexer`` talks to a ``VectorStore``; the backend is chosen with
+``RAG_VECTOR_BACKEND``:
+
+- ``chroma``: a persistent Chroma collection (the original setup).
+- ``numpy``: unit-normalised vectors in a memory-mapped float16 or int8
+  matrix with file sidecars for ids, texts and metadata. Queries are exact
+  top-k matrix products over row blocks; with ``RAG_VECTOR_HNSW`` an hnswlib
+  graph answers approximately instead. Loading maps the files and reads only
+  the id list, so a cold start costs milliseconds rather than a client boot.
+  Corpora under ``RAG_VECTOR_HOT_MB`` also keep a dequantised float32 copy
+  in memory after the first query; larger ones stream the mapped matrix.
+
+Both backends can partition an index by the ``tenant`` metadata field. A
+query with ``partition`` only scores that tenant's chunks: Chroma pushes it
+down as a ``where`` filter, the NumPy backend keeps a per-row partition code
+and a posting list of rows per tenant, so the cost of a partitioned query
+depends on the tenant's own chunk count, not on how many tenants share the
+index.
+
+Writes to the NumPy backend are buffered in memory and made durable by
+``flush()``, which rewrites the files under temporary names and renames them
+into place. That is what lets ``index_snapshots`` clone it with hard links;
+Chroma writes into its files, so it is updated in place, with a read/write
+lock keeping queries out of the middle of a write.
+"""
+from __future__ import annotations
+
+import abc
+import contextlib
+import functools
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import chromadb  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    chromadb = None
+
+try:
+    import hnswlib  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    hnswlib = None
+
+COLLECTION_NAME = "foodbiz_docs"
+QUERY_BLOCK_ROWS = 65_536
+COMPACT_RATIO = 0.2  # compact on flush once this share of rows is deleted
+HOT_MATRIX_MB = int(os.getenv("RAG_VECTOR_HOT_MB", 512))
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+PARTITION_KEY = "tenant"
+
+
+class VectorStore(abc.ABC):
+    """Interface shared by the backends; vectors are addressed by chunk hash."""
+
+    backend = "base"
+
+    @property
+    def label(self) -> str:
+        """Identifies the on-disk format; the indexer re-indexes when it changes."""
+        return self.backend
+
+    @abc.abstractmethod
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: Sequence[Sequence[float]],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        ...
+
+    @abc.abstractmethod
+    def update_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        ...
+
+    @abc.abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        ...
+
+    @abc.abstractmethod
+    def query(
+        self, embedding: Sequence[float], top_k: int, *, partition: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Top-k as ``{"page_content", "metadata", "score"}`` dicts, best first.
+
+        ``partition`` restricts the search to chunks whose ``tenant`` metadata
+        equals it; the filter is applied inside the index, before ranking.
+        """
+
+    @abc.abstractmethod
+    def get(self, ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """``{"page_content", "metadata"}`` per id, None for ids not in the store."""
+
+    @abc.abstractmethod
+    def count(self) -> int:
+        ...
+
+    def flush(self) -> None:
+        """Make buffered writes durable; a no-op for stores that write through."""
+
+
+def snapshot_capable(label: Optional[str]) -> bool:
+    """Whether a store with this ``label`` only replaces its files, so snapshots can hard-link them."""
+    return bool(label and label.startswith("numpy"))
+
+
+class _ReadWriteLock:
+    """Any number of readers, or one writer."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+
+    @contextlib.contextmanager
+    def read(self):
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        with self._condition:
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class ChromaVectorStore(VectorStore):
+    backend = "chroma"
+
+    def __init__(self, persist_dir: str):
+        if chromadb is None:
+            raise RuntimeError("chromadb is unavailable; install chromadb")
+        client = chromadb.PersistentClient(path=persist_dir)
+        self.collection = client.get_or_create_collection(COLLECTION_NAME, metadata={"hnsw:space": "cosine"})
+        self._lock = _ReadWriteLock()
+
+    def upsert(self, ids, embeddings, texts, metadatas) -> None:
+        vectors = np.asarray(embeddings, dtype=np.float64).tolist()
+        with self._lock.write():
+            self.collection.upsert(ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas)
+
+    def update_metadata(self, ids, metadatas) -> None:
+        with self._lock.write():
+            self.collection.update(ids=ids, metadatas=metadatas)
+
+    def delete(self, ids) -> None:
+        with self._lock.write():
+            self.collection.delete(ids=ids)
+
+    def query(self, embedding, top_k, *, partition=None) -> List[Dict[str, Any]]:
+        options = {"where": {PARTITION_KEY: partition}} if partition is not None else {}
+        with self._lock.read():
+            result = self.collection.query(
+                query_embeddings=[np.asarray(embedding, dtype=np.float64).tolist()],
+                n_results=top_k,
+                include=["documents", "metadatas", "distances"],
+                **options,
+            )
+        return [
+            {"page_content": text, "metadata": metadata or {}, "score": round(1.0 - float(distance), 4)}
+            for text, metadata, distance in zip(
+                result["documents"][0], result["metadatas"][0], result["distances"][0]
+            )
+        ]
+
+    def get(self, ids) -> List[Optional[Dict[str, Any]]]:
+        with self._lock.read():
+            result = self.collection.get(ids=ids, include=["documents", "metadatas"])
+        found = {
+            key: {"page_content": text, "metadata": metadata or {}}
+            for key, text, metadata in zip(result["ids"], result["documents"], result["metadatas"])
+        }
+        return [found.get(key) for key in ids]
+
+    def count(self) -> int:
+        with self._lock.read():
+            return self.collection.count()
+
+
+def _quantize(vectors: np.ndarray, dtype: str) -> tuple[np.ndarray, np.ndarray]:
+    """Row-normalise, then store as float16 or as int8 with a per-row scale."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms == 0, 1.0, norms)
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.rint(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+    return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+
+
+def _write_blobs(path: str, values: List[bytes]) -> None:
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in values], out=offsets[1:])
+    with open(f"{path}.bin.tmp", "wb") as handle:
+        handle.write(b"".join(values))
+    with open(f"{path}.idx.tmp", "wb") as handle:
+        np.save(handle, offsets)
+
+
+class _Blobs:
+    """Variable-length byte strings (texts, metadata JSON) read lazily from a mapped file."""
+
+    def __init__(self, path: str):
+        self.offsets = np.load(f"{path}.idx", mmap_mode="r")
+        size = int(self.offsets[-1]) if len(self.offsets) else 0
+        self.data = np.memmap(f"{path}.bin", dtype=np.uint8, mode="r") if size else np.zeros(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return max(0, len(self.offsets) - 1)
+
+    def __getitem__(self, row: int) -> bytes:
+        return self.data[int(self.offsets[row]):int(self.offsets[row + 1])].tobytes()
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class NumpyVectorStore(VectorStore):
+    backend = "numpy"
+
+    @property
+    def label(self) -> str:
+        return f"numpy:{self.dtype}"
+    # meta.json is replaced last, after every file it describes.
+    FILES = (
+        "vectors.npy", "scales.npy", "ids.npy", "partitions.npy",
+        "texts.bin", "texts.idx", "metadata.bin", "metadata.idx", "meta.json",
+    )
+
+    def __init__(self, directory: str, *, dtype: str = "float16", hnsw: bool = False):
+        if dtype not in ("float16", "int8"):
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        if hnsw and hnswlib is None:
+            raise RuntimeError("hnswlib is unavailable; install hnswlib or disable RAG_VECTOR_HNSW")
+        self.directory = directory
+        self.dtype = dtype
+        self.use_hnsw = hnsw
+        self.dim: Optional[int] = None
+        # Persisted rows (memory-mapped) ...
+        self._vectors: Optional[np.ndarray] = None
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._ids = np.zeros(0, dtype="S64")
+        self._texts: Optional[_Blobs] = None
+        self._metadata: Optional[_Blobs] = None
+        # ... plus rows appended since the last flush.
+        self._new_vectors: List[np.ndarray] = []
+        self._new_scales: List[np.ndarray] = []
+        self._new_ids: List[bytes] = []
+        self._new_texts: List[bytes] = []
+        self._new_metadata: List[bytes] = []
+        self._metadata_overrides: Dict[int, bytes] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        # Partition code per row (-1: none); names live in meta.json.
+        self._partitions = np.zeros(0, dtype=np.int32)
+        self._partition_names: List[str] = []
+        self._partition_codes: Dict[str, int] = {}
+        self._postings: Optional[Dict[int, np.ndarray]] = None
+        self._row_of: Optional[Dict[bytes, int]] = None
+        self._hnsw = None
+        self._hot: Optional[np.ndarray] = None
+        self._dirty = False
+        # Builds write while requests query, so public methods hold this lock.
+        self._lock = threading.RLock()
+        self._load()
+
+    # --- persistence -----------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self) -> None:
+        try:
+            with open(self._path("meta.json"), encoding="utf-8") as handle:
+                meta = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if meta.get("dtype") != self.dtype:
+            raise RuntimeError(
+                f"{self.directory} holds {meta.get('dtype')} vectors; rebuild the index to switch to {self.dtype}"
+            )
+        self.dim = int(meta["dim"])
+        self._vectors = np.load(self._path("vectors.npy"), mmap_mode="r")
+        self._scales = np.load(self._path("scales.npy"))
+        self._ids = np.load(self._path("ids.npy"))
+        self._texts = _Blobs(self._path("texts"))
+        self._metadata = _Blobs(self._path("metadata"))
+        self._alive = self._ids != b""  # rows deleted before the last flush keep an empty id
+        self._partition_names = list(meta.get("partitions", []))
+        self._partition_codes = {name: code for code, name in enumerate(self._partition_names)}
+        if os.path.exists(self._path("partitions.npy")):
+            self._partitions = np.load(self._path("partitions.npy"))
+        else:  # written before partitions existed
+            self._partitions = np.full(len(self._ids), -1, dtype=np.int32)
+        self._postings = None
+        self._row_of = None
+        self._hot = None
+        if self.use_hnsw:
+            self._load_hnsw()
+
+    def _persisted(self) -> int:
+        return len(self._ids)
+
+    def _all_vectors(self) -> np.ndarray:
+        blocks = [] if self._vectors is None else [np.asarray(self._vectors)]
+        blocks.extend(self._new_vectors)
+        if not blocks:
+            return np.zeros((0, self.dim or 0), dtype=self.dtype)
+        return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+    def _row_text(self, row: int) -> bytes:
+        persisted = self._persisted()
+        return self._texts[row] if row < persisted else self._new_texts[row - persisted]
+
+    def _row_metadata(self, row: int) -> bytes:
+        if row in self._metadata_overrides:
+            return self._metadata_overrides[row]
+        persisted = self._persisted()
+        return self._metadata[row] if row < persisted else self._new_metadata[row - persisted]
+
+    def _row_id(self, row: int) -> bytes:
+        persisted = self._persisted()
+        return bytes(self._ids[row]) if row < persisted else self._new_ids[row - persisted]
+
+    @_locked
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        rows = np.flatnonzero(self._alive)
+        total = len(self._alive)
+        # Deleted rows are dropped on flush only when they are a noticeable share.
+        if total and (total - len(rows)) / total < COMPACT_RATIO:
+            rows = np.arange(total)
+        vectors = self._all_vectors()[rows]
+        scales = np.concatenate([self._scales, *self._new_scales])[rows]
+        ids = np.array([self._row_id(int(row)) for row in rows], dtype="S64")
+        alive = self._alive[rows]
+        partitions = self._partitions[rows]
+        with open(self._path("vectors.npy.tmp"), "wb") as handle:
+            np.save(handle, vectors)
+        with open(self._path("scales.npy.tmp"), "wb") as handle:
+            np.save(handle, scales)
+        with open(self._path("ids.npy.tmp"), "wb") as handle:
+            # Tombstoned rows that survive compaction keep an empty id.
+            np.save(handle, np.where(alive, ids, np.array(b"", dtype="S64")))
+        with open(self._path("partitions.npy.tmp"), "wb") as handle:
+            np.save(handle, partitions)
+        _write_blobs(self._path("texts"), [self._row_text(int(row)) for row in rows])
+        _write_blobs(self._path("metadata"), [self._row_metadata(int(row)) for row in rows])
+        with open(self._path("meta.json.tmp"), "w", encoding="utf-8") as handle:
+            json.dump(
+                {"dim": self.dim, "dtype": self.dtype, "rows": int(len(rows)), "partitions": self._partition_names},
+                handle,
+                ensure_ascii=False,
+            )
+        for name in self.FILES:
+            os.replace(self._path(f"{name}.tmp"), self._path(name))
+
+        self._new_vectors, self._new_scales, self._new_ids = [], [], []
+        self._new_texts, self._new_metadata, self._metadata_overrides = [], [], {}
+        self._dirty = False
+        self._load()  # remaps the new files; a stale hnsw.bin is rebuilt there
+
+    # --- hnsw ------------------------------------------------------------------
+
+    def _dense(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        vectors = self._all_vectors() if rows is None else self._all_vectors()[rows]
+        scales = np.concatenate([self._scales, *self._new_scales]) if self._new_scales else self._scales
+        scales = scales if rows is None else scales[rows]
+        return vectors.astype(np.float32) * scales[:, None]
+
+    def _build_hnsw(self, save: bool = False) -> None:
+        total = len(self._alive)
+        if not total:
+            self._hnsw = None
+            return
+        index = hnswlib.Index(space="ip", dim=self.dim)
+        index.init_index(max_elements=max(total, 1024), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        for start in range(0, total, QUERY_BLOCK_ROWS):
+            rows = np.arange(start, min(total, start + QUERY_BLOCK_ROWS))
+            index.add_items(self._dense(rows), rows)
+        for row in np.flatnonzero(~self._alive):
+            index.mark_deleted(int(row))
+        index.set_ef(HNSW_EF_SEARCH)
+        self._hnsw = index
+        if save:
+            # Replace rather than overwrite: snapshots may share this file through a hard link.
+            index.save_index(self._path("hnsw.bin.tmp"))
+            os.replace(self._path("hnsw.bin.tmp"), self._path("hnsw.bin"))
+
+    def _load_hnsw(self) -> None:
+        path = self._path("hnsw.bin")
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(self._path("meta.json")):
+            index = hnswlib.Index(space="ip", dim=self.dim)
+            index.load_index(path, max_elements=max(len(self._ids), 1024))
+            index.set_ef(HNSW_EF_SEARCH)
+            self._hnsw = index
+        else:
+            self._build_hnsw(save=True)
+
+    # --- writes ----------------------------------------------------------------
+
+    def _partition_code(self, metadata: Dict[str, Any]) -> int:
+        name = metadata.get(PARTITION_KEY)
+        if name is None:
+            return -1
+        name = str(name)
+        code = self._partition_codes.get(name)
+        if code is None:
+            code = self._partition_codes[name] = len(self._partition_names)
+            self._partition_names.append(name)
+        return code
+
+    def _rows(self) -> Dict[bytes, int]:
+        if self._row_of is None:
+            self._row_of = {bytes(key): row for row, key in enumerate(self._ids) if self._alive[row]}
+            start = self._persisted()
+            for offset, key in enumerate(self._new_ids):
+                if self._alive[start + offset]:
+                    self._row_of[key] = start + offset
+        return self._row_of
+
+    @_locked
+    def upsert(self, ids, embeddings, texts, metadatas) -> None:
+        if not ids:
+            return
+        if any(len(key) > 64 for key in ids):
+            raise ValueError("Vector ids are limited to 64 ASCII characters (chunk hashes)")
+        vectors, scales = _quantize(np.asarray(embeddings, dtype=np.float32), self.dtype)
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match the index ({self.dim})")
+        self.delete(ids)  # an upsert appends a fresh row and tombstones the old one
+        rows = self._rows()
+        start = len(self._alive)
+        keys = [key.encode("ascii") for key in ids]
+        self._new_vectors.append(vectors)
+        self._new_scales.append(scales)
+        self._new_ids.extend(keys)
+        self._new_texts.extend(text.encode("utf-8") for text in texts)
+        self._new_metadata.extend(json.dumps(metadata, ensure_ascii=False).encode("utf-8") for metadata in metadatas)
+        self._alive = np.concatenate([self._alive, np.ones(len(keys), dtype=bool)])
+        self._partitions = np.concatenate(
+            [self._partitions, np.array([self._partition_code(metadata) for metadata in metadatas], dtype=np.int32)]
+        )
+        self._postings = None
+        self._hot = None
+        for offset, key in enumerate(keys):
+            rows[key] = start + offset
+        if self._hnsw is not None:
+            self._hnsw.resize_index(max(self._hnsw.get_max_elements(), len(self._alive)))
+            self._hnsw.add_items(self._dense(np.arange(start, len(self._alive))), np.arange(start, len(self._alive)))
+        self._dirty = True
+
+    @_locked
+    def update_metadata(self, ids, metadatas) -> None:
+        rows = self._rows()
+        for key, metadata in zip(ids, metadatas):
+            row = rows.get(key.encode("ascii"))
+            if row is not None:
+                self._metadata_overrides[row] = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+                code = self._partition_code(metadata)
+                if code != self._partitions[row]:
+                    self._partitions[row] = code
+                    self._postings = None
+                self._dirty = True
+
+    @_locked
+    def delete(self, ids) -> None:
+        rows = self._rows()
+        for key in ids:
+            row = rows.pop(key.encode("ascii"), None)
+            if row is not None:
+                self._alive[row] = False
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(row)
+                self._dirty = True
+
+    # --- reads -----------------------------------------------------------------
+
+    @_locked
+    def count(self) -> int:
+        return int(self._alive.sum())
+
+    @_locked
+    def get(self, ids) -> List[Optional[Dict[str, Any]]]:
+        rows = self._rows()
+        found: List[Optional[Dict[str, Any]]] = []
+        for key in ids:
+            row = rows.get(key.encode("ascii"))
+            found.append(
+                None
+                if row is None
+                else {
+                    "page_content": self._row_text(row).decode("utf-8"),
+                    "metadata": json.loads(self._row_metadata(row) or b"{}"),
+                }
+            )
+        return found
+
+    def _warm(self) -> None:
+        if self._hot is None and len(self._alive) * (self.dim or 0) * 4 <= HOT_MATRIX_MB * 2**20:
+            # Small enough to keep a dequantised float32 copy: one BLAS call per query.
+            self._hot = self._dense()
+
+    def _partition_rows(self, partition: str) -> np.ndarray:
+        """Live rows of one partition, from posting lists built once per write."""
+        code = self._partition_codes.get(partition)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        if self._postings is None:
+            order = np.argsort(self._partitions, kind="stable")
+            codes, starts = np.unique(self._partitions[order], return_index=True)
+            self._postings = {int(c): rows for c, rows in zip(codes, np.split(order, starts[1:]))}
+        rows = self._postings.get(code, np.zeros(0, dtype=np.int64))
+        return rows[self._alive[rows]]
+
+    def _partition_exact(self, query: np.ndarray, top_k: int, partition: str) -> tuple[np.ndarray, np.ndarray]:
+        rows = self._partition_rows(partition)
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float32)
+        self._warm()
+        scores = self._hot[rows] @ query if self._hot is not None else self._dense(rows) @ query
+        keep = np.argpartition(-scores, top_k - 1)[:top_k] if len(rows) > top_k else np.arange(len(rows))
+        order = keep[np.argsort(-scores[keep], kind="stable")]
+        return rows[order], scores[order]
+
+    def _exact(self, query: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        total = len(self._alive)
+        self._warm()
+        if self._hot is not None:
+            scores = self._hot @ query
+            scores[~self._alive] = -np.inf
+            rows = np.argpartition(-scores, top_k - 1)[:top_k] if total > top_k else np.arange(total)
+            order = np.argsort(-scores[rows], kind="stable")
+            return rows[order], scores[rows][order]
+
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        offset = 0
+        scales = np.concatenate([self._scales, *self._new_scales])
+        blocks = [] if self._vectors is None else [self._vectors]
+        blocks.extend(self._new_vectors)
+        for block in blocks:
+            for start in range(0, len(block), QUERY_BLOCK_ROWS):
+                # float16 / int8 matmuls are slow in NumPy; upcast one block at a time.
+                chunk = np.asarray(block[start:start + QUERY_BLOCK_ROWS], dtype=np.float32)
+                rows = np.arange(offset + start, offset + start + len(chunk))
+                scores = (chunk @ query) * scales[rows]
+                scores[~self._alive[rows]] = -np.inf
+                if len(scores) > top_k:
+                    keep = np.argpartition(-scores, top_k - 1)[:top_k]
+                    rows, scores = rows[keep], scores[keep]
+                best_rows = np.concatenate([best_rows, rows])
+                best_scores = np.concatenate([best_scores, scores])
+            offset += len(block)
+        order = np.argsort(-best_scores, kind="stable")[:top_k]
+        return best_rows[order], best_scores[order]
+
+    @_locked
+    def query(self, embedding, top_k, *, partition=None) -> List[Dict[str, Any]]:
+        if top_k <= 0 or self.dim is None:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        query = query / norm if norm else query
+        if partition is not None:
+            # A tenant's rows are few: score them exactly rather than filter the graph
+            # (and without counting the whole index, which grows with the tenant count).
+            rows, scores = self._partition_exact(query, top_k, str(partition))
+        elif not self.count():
+            return []
+        elif self._hnsw is not None:
+            labels, distances = self._hnsw.knn_query(query[None, :], k=min(top_k, self.count()))
+            rows, scores = labels[0].astype(np.int64), 1.0 - distances[0]
+        else:
+            rows, scores = self._exact(query, min(top_k, self.count()))
+        return [
+            {
+                "page_content": self._row_text(int(row)).decode("utf-8"),
+                "metadata": json.loads(self._row_metadata(int(row)) or b"{}"),
+                "score": round(float(score), 4),
+            }
+            for row, score in zip(rows, scores)
+            if np.isfinite(score)
+        ]
+
+    def disk_bytes(self) -> int:
+        return sum(
+            os.path.getsize(self._path(name))
+            for name in (*self.FILES, "hnsw.bin")
+            if os.path.exists(self._path(name))
+        )
+
+
+def _configured(backend: Optional[str], dtype: Optional[str]) -> tuple[str, str]:
+    return (
+        (backend or os.getenv("RAG_VECTOR_BACKEND", "chroma")).lower(),
+        dtype or os.getenv("RAG_VECTOR_DTYPE", "float16"),
+    )
+
+
+def store_label(backend: Optional[str] = None, dtype: Optional[str] = None) -> str:
+    """``label`` of the store ``open_vector_store`` would open, without opening it."""
+    backend, dtype = _configured(backend, dtype)
+    return f"numpy:{dtype}" if backend == "numpy" else backend
+
+
+def open_vector_store(
+    persist_dir: str,
+    backend: Optional[str] = None,
+    *,
+    dtype: Optional[str] = None,
+    hnsw: Optional[bool] = None,
+) -> VectorStore:
+    backend, dtype = _configured(backend, dtype)
+    if backend == "chroma":
+        return ChromaVectorStore(persist_dir)
+    if backend == "numpy":
+        return NumpyVectorStore(
+            os.path.join(persist_dir, "numpy"),
+            dtype=dtype,
+            hnsw=hnsw if hnsw is not None else os.getenv("RAG_VECTOR_HNSW", "false").lower() == "true",
+        )
+    raise ValueError(f"Unknown vector backend: {backend}")
@@ -1,12 +1,15 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+import hmac
 import os
 from jose import jwt
 
 ALGORITHM = "HS256"
 SECRET_KEY = os.environ.get("SECRET_KEY")
+ADMIN_API_TOKEN = os.environ.get("ADMIN_API_TOKEN")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token", auto_error=False)
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     if not token:
@@ -45,3 +48,31 @@ async def get_current_profile(token: str = Depends(oauth2_scheme)) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
+
+
+def decode_profile(token: str | None) -> dict | None:
+    """Profile claims of a valid token, or ``None`` for a missing or invalid one."""
+    if not token or not SECRET_KEY:
+        return None
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except Exception:
+        return None
+
+
+async def get_optional_profile(token: str | None = Depends(optional_oauth2_scheme)) -> dict | None:
+    return decode_profile(token)
+
+
+async def require_admin(x_admin_token: str | None = Header(None, alias="X-Admin-Token")) -> None:
+    """Gate for admin routes that change state; disabled while ADMIN_API_TOKEN is unset."""
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled: ADMIN_API_TOKEN not set",
+        )
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), ADMIN_API_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+        )
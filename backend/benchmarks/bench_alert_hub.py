@@ -0,0 +1,54 @@
+"""Memory and fan-out cost of idle SSE connections on one worker.
+
+Each simulated connection drives ``AlertHub.stream`` exactly like the
+``/alerts/sse`` route does; memory is measured with ``tracemalloc``.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_alert_hub [connections]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from services.alert_hub import AlertHub
+
+
+async def _consume(hub: AlertHub, business_id: str, received: list) -> None:
+    async for frame in hub.stream(business_id, heartbeat=3600):
+        if frame.startswith("id: "):
+            received[0] += 1
+
+
+async def main(connections: int = 10_000) -> None:
+    hub = AlertHub()
+    received = [0]
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = []
+    print(f"{'connections':>11} {'MiB':>7} {'bytes/conn':>10}")
+    for step in (connections // 10, connections // 2, connections):
+        while len(tasks) < step:
+            tasks.append(asyncio.create_task(_consume(hub, f"biz-{len(tasks) % 1000}", received)))
+        await asyncio.sleep(0.1)
+        used = tracemalloc.get_traced_memory()[0] - baseline
+        print(f"{step:>11} {used / 2**20:>7.2f} {used / step:>10.0f}")
+
+    tracemalloc.stop()  # tracing inflates the timing below
+    started = time.perf_counter()
+    hub.publish(None, "system", "broadcast")
+    fan_out_ms = (time.perf_counter() - started) * 1000
+    while received[0] < connections:
+        await asyncio.sleep(0.01)
+    delivered_ms = (time.perf_counter() - started) * 1000
+    print(f"broadcast fan-out {fan_out_ms:.1f} ms, delivered to all {delivered_ms:.1f} ms")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(hub.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
@@ -0,0 +1,107 @@
+"""Event-loop lag and latency under concurrent dashboard requests.
+
+Simulates 200 concurrent ``/metrics/{business_id}/summary`` calls against a
+Supabase stub whose ``execute()`` blocks for a fixed round trip, and compares
+calling the sync service directly from a coroutine ("before") with the
+``services.aio`` facade ("after"). A ticker task measures how late the event
+loop wakes up while the requests are in flight.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_event_loop --requests 200 --rtt-ms 40
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from services import aio, metrics_service
+
+
+class _SlowResponse:
+    def __init__(self, rtt: float):
+        self._rtt = rtt
+        self.data = [{"business_id": "bench", "net_sales": 1000}]
+
+    def execute(self):
+        time.sleep(self._rtt)
+        return self
+
+
+class _SlowSupabase:
+    def __init__(self, rtt: float):
+        self._rtt = rtt
+
+    def rpc(self, *_args, **_kwargs):
+        return _SlowResponse(self._rtt)
+
+
+async def _ticker(interval: float, lags: list, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def _blocking_handler(business_id: str):
+    return metrics_service.get_metrics_summary(business_id)
+
+
+async def _async_handler(business_id: str):
+    return await aio.get_metrics_summary(business_id)
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(handler, requests: int) -> dict:
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(0.005, lags, stop))
+    await asyncio.sleep(0.02)
+
+    # All requests "arrive" together, so latency is measured from the burst start.
+    started = time.perf_counter()
+
+    async def _timed(i: int) -> float:
+        await handler(f"biz-{i}")
+        return time.perf_counter() - started
+
+    latencies = await asyncio.gather(*(_timed(i) for i in range(requests)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await ticker
+    return {
+        "wall_s": wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "max_loop_lag_ms": max(lags, default=0.0) * 1000,
+        "p99_loop_lag_ms": _percentile(lags, 99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    metrics_service.supabase = _SlowSupabase(args.rtt_ms / 1000)
+    print(f"requests={args.requests} rtt={args.rtt_ms}ms pool={aio._executor._max_workers}")
+    for label, handler in (("before (sync in loop)", _blocking_handler), ("after (services.aio)", _async_handler)):
+        result = asyncio.run(_run(handler, args.requests))
+        print(
+            f"{label:<22} wall={result['wall_s']:.2f}s p50={result['p50_ms']:.1f}ms "
+            f"p99={result['p99_ms']:.1f}ms loop_lag_max={result['max_loop_lag_ms']:.1f}ms "
+            f"loop_lag_p99={result['p99_loop_lag_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Retrieval quality and latency of the vector, lexical and hybrid modes.
+
+Builds a NumPy-backend index over a synthetic policy corpus (one document per
+product, one chunk per section) and runs a labelled query set against each
+``vector_search`` mode. Each query is labelled with the product and section
+that answers it. ``named`` queries quote the product name, ``described``
+ones only describe it.
+
+With ``OPENAI_API_KEY`` set, real embeddings are used (through the shared
+embedding cache). Otherwise a hashed character-trigram embedding stands in,
+with ``--embed-ms`` of simulated API latency per query embedding. That
+stand-in is itself lexical, so ``described``-query numbers for the vector and
+hybrid modes only mean something with real embeddings.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_hybrid_retrieval
+    python -m benchmarks.bench_hybrid_retrieval --embed-ms 0 --threshold 0.8
+"""
+import argparse
+import hashlib
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app.services import rag_indexer
+
+TOP_K = 4
+DIM = 512
+
+# name, who it is for, what it pays for, limit, rate, documents, channel
+PRODUCTS = [
+    ("사잇돌 대출", "재직 6개월 이상 중신용 근로소득자", "생활자금", "최대 2천만원", "연 6~10%", "재직증명서, 소득금액증명원", "시중은행 앱"),
+    ("햇살론 유스", "만 34세 이하 사회초년생과 대학생", "학자금 외 생활비", "최대 1,200만원", "연 3.5%", "재학증명서 또는 건강보험 자격득실확인서", "서민금융진흥원 앱"),
+    ("햇살론15", "신용점수 하위 20% 저신용 서민", "고금리 대출 대환", "최대 1,400만원", "연 15.9%", "신분증, 소득 증빙", "서민금융통합지원센터"),
+    ("새희망홀씨", "연소득 4천만원 이하 저소득층", "긴급 생계자금", "최대 3,500만원", "연 10.5% 이하", "소득 증빙, 주민등록등본", "은행 영업점"),
+    ("일반경영안정자금", "업력 1년 이상 소상공인", "운영자금", "최대 7천만원", "정책금리 연동", "사업자등록증, 부가세 과세표준증명", "소상공인24"),
+    ("희망리턴패키지", "폐업했거나 폐업 예정인 소상공인", "재기 컨설팅과 철거비", "점포 철거비 최대 400만원", "무상 지원", "폐업사실증명원", "희망리턴패키지 누리집"),
+    ("지역신용보증재단 특례보증", "담보가 부족한 영세 자영업자", "보증부 대출", "최대 5천만원 보증", "보증료 연 0.8%", "사업장 임대차계약서, 매출 증빙", "지역 신용보증재단 지점"),
+    ("청년창업사관학교", "만 39세 이하 기술 기반 예비창업자", "사업화 자금과 공간", "최대 1억원", "무상 지원(자부담 30%)", "사업계획서", "K-스타트업 누리집"),
+    ("스마트상점 기술보급", "매장에 키오스크나 서빙로봇을 도입하려는 점포", "스마트기술 도입비", "최대 500만원", "국비 70% 지원", "견적서, 사업자등록증", "스마트상점 누리집"),
+    ("소상공인 대환대출", "7% 이상 고금리 사업자 대출 보유자", "저금리 전환", "최대 5천만원", "연 4.5% 고정", "기존 대출 잔액증명서", "소상공인24"),
+    ("전통시장 시설현대화", "전통시장 상인회", "아케이드와 주차장 설치", "사업비의 60%", "지방비 매칭", "상인회 정관, 사업계획서", "지자체 시장 담당 부서"),
+    ("긴급경영안정자금", "재해나 감염병으로 매출이 급감한 사업장", "긴급 운영자금", "최대 7천만원", "연 2.0%", "피해사실확인서", "소상공인시장진흥공단 센터"),
+    ("혁신성장촉진자금", "온라인 판로나 수출을 준비하는 성장형 소상공인", "설비와 마케팅 자금", "최대 2억원", "정책금리 -0.2%p", "성장 계획서, 재무제표", "소상공인24"),
+    ("재도전특별자금", "채무 조정을 성실히 상환 중인 재창업자", "재창업 운영자금", "최대 7천만원", "연 3.0%", "채무조정 확정 서류", "소상공인시장진흥공단 센터"),
+    ("노란우산공제", "폐업·노령에 대비하려는 자영업자", "퇴직금 성격의 공제금 적립", "월 5만~100만원 납입", "복리 이자와 소득공제", "사업자등록증", "중소기업중앙회 또는 은행"),
+    ("두루누리 사회보험료 지원", "근로자 10명 미만 사업장", "고용보험·국민연금 보험료", "보험료의 80%", "최대 36개월", "근로자 소득 신고 자료", "4대 사회보험 정보연계센터"),
+]
+SECTIONS = {
+    "자격": "{name} 지원 대상: {who}. 대상 요건을 충족해야 합니다.",
+    "용도": "{name} 자금 용도: {use}에 쓸 수 있습니다.",
+    "한도": "{name} 지원 한도와 금리: {limit}, {rate}.",
+    "서류": "{name} 제출 서류: {docs}.",
+    "신청": "{name} 신청 방법: {channel}에서 접수합니다.",
+}
+DESCRIBED = [
+    ("중신용 직장인이 은행 앱으로 받는 생활자금 대출", 0, "자격"),
+    ("사회초년생 대학생 생활비 대출 금리", 1, "한도"),
+    ("저신용 서민 고금리 대환 상품 한도", 2, "한도"),
+    ("연소득 낮은 사람 긴급 생계자금 어디서 신청", 3, "신청"),
+    ("업력 1년 넘은 가게 운영자금 한도", 4, "한도"),
+    ("가게 문 닫을 때 철거비 지원", 5, "용도"),
+    ("담보 없는 자영업자 보증 대출 필요 서류", 6, "서류"),
+    ("기술 창업 준비하는 청년 사업화 자금", 7, "자격"),
+    ("키오스크 서빙로봇 도입 지원금 비율", 8, "한도"),
+    ("고금리 사업자 대출 저금리로 갈아타기", 9, "용도"),
+    ("시장 아케이드 설치 지원 대상", 10, "자격"),
+    ("감염병으로 매출 급감 운영자금 금리", 11, "한도"),
+    ("온라인 판로 수출 준비 자금 서류", 12, "서류"),
+    ("채무 조정 중 재창업 자금 신청처", 13, "신청"),
+    ("자영업자 퇴직금 적립 소득공제", 14, "한도"),
+    ("직원 10명 미만 사업장 보험료 지원 기간", 15, "한도"),
+]
+
+
+def _documents(root: str) -> None:
+    for index, (name, who, use, limit, rate, docs, channel) in enumerate(PRODUCTS):
+        fields = {"name": name, "who": who, "use": use, "limit": limit, "rate": rate, "docs": docs, "channel": channel}
+        with open(os.path.join(root, f"product-{index:02d}.md"), "w", encoding="utf-8") as handle:
+            handle.write("\n\n".join(template.format(**fields) for template in SECTIONS.values()))
+
+
+def _queries():
+    labelled = []
+    for index, (name, *_rest) in enumerate(PRODUCTS):
+        for section, suffix in (("자격", "자격"), ("서류", "제출 서류"), ("신청", "신청 방법"), ("한도", "한도 금리")):
+            labelled.append(("named", f"{name} {suffix}", index, section))
+    labelled.extend(("described", query, index, section) for query, index, section in DESCRIBED)
+    return labelled
+
+
+def _stand_in_embed(text: str) -> np.ndarray:
+    vector = np.zeros(DIM, dtype=np.float32)
+    compact = "".join(text.split())
+    for i in range(len(compact) - 2):
+        vector[int.from_bytes(hashlib.md5(compact[i:i + 3].encode("utf-8")).digest()[:4], "little") % DIM] += 1
+    return vector
+
+
+def _is_relevant(hit, index: int, section: str) -> bool:
+    heading = SECTIONS[section].split(":")[0].format(name=PRODUCTS[index][0])
+    return hit["metadata"]["source"].endswith(f"product-{index:02d}.md") and hit["page_content"].startswith(heading)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--embed-ms", type=float, default=150.0, help="simulated latency of the stand-in embedding")
+    parser.add_argument("--threshold", type=float, default=rag_indexer.LEXICAL_FAST_PATH)
+    args = parser.parse_args()
+    rag_indexer.LEXICAL_FAST_PATH = args.threshold
+    os.environ["RAG_VECTOR_BACKEND"] = "numpy"
+
+    real = bool(os.getenv("OPENAI_API_KEY"))
+    calls = {"count": 0}
+
+    def embed_documents(texts):
+        return rag_indexer.default_embed_documents(texts) if real else [_stand_in_embed(text) for text in texts]
+
+    def embed_query(text):
+        calls["count"] += 1
+        if real:
+            return rag_indexer.default_embed_query(text)
+        time.sleep(args.embed_ms / 1000)
+        return _stand_in_embed(text)
+
+    queries = _queries()
+    print(f"embeddings: {'OpenAI' if real else f'stand-in (+{args.embed_ms:.0f}ms)'}; fast path at coverage >= {args.threshold}")
+    with tempfile.TemporaryDirectory() as root:
+        docs, persist = os.path.join(root, "docs"), os.path.join(root, "index")
+        os.makedirs(docs)
+        _documents(docs)
+        rag_indexer.build_index(docs, persist, embed_documents=embed_documents, split=lambda text: text.split("\n\n"))
+        for mode in ("vector", "lexical", "hybrid"):
+            for kind in ("named", "described"):
+                subset = [query for query in queries if query[0] == kind]
+                calls["count"] = 0
+                latencies, recalled, reciprocal = [], 0, 0.0
+                for _, text, index, section in subset:
+                    started = time.perf_counter()
+                    hits = rag_indexer.vector_search(text, TOP_K, persist, mode=mode, embed_query=embed_query)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    ranks = [rank for rank, hit in enumerate(hits, 1) if _is_relevant(hit, index, section)]
+                    recalled += bool(ranks)
+                    reciprocal += 1 / ranks[0] if ranks else 0.0
+                print(
+                    f"{mode:<8} {kind:<10} queries={len(subset):>3} recall@{TOP_K}={recalled / len(subset):.3f} "
+                    f"mrr={reciprocal / len(subset):.3f} p50_ms={statistics.median(latencies):>7.2f} "
+                    f"embeddings={calls['count']:>3}"
+                )
+
+
+if __name__ == "__main__":
+    main()
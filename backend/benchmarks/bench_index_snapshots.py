@@ -0,0 +1,91 @@
+"""Document search latency while the index is being rebuilt.
+
+Builds a NumPy-backend index, then measures ``vector_search`` latency idle and
+while a rebuild of 20% of the corpus runs on another thread. Readers query the
+live snapshot, so they wait for neither the build's writes nor its lock; what
+remains is CPU sharing with the builder.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_index_snapshots
+"""
+import hashlib
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from app.services import rag_indexer
+
+FILES = 2_000
+PARAGRAPHS = 10
+DIM = 384
+
+
+def _embed(texts):
+    time.sleep(0.002)  # stands in for the embedding API round trip
+    return [
+        np.random.default_rng(int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")).normal(size=DIM)
+        for text in texts
+    ]
+
+
+def _split(text):
+    return text.split("\n\n")
+
+
+def _write(docs, i, tag):
+    with open(os.path.join(docs, f"doc-{i}.md"), "w", encoding="utf-8") as handle:
+        handle.write("\n\n".join(f"문서 {i} 단락 {p} {tag}" for p in range(PARAGRAPHS)))
+
+
+def _latencies(persist, stop):
+    samples = []
+    query = _embed(["운전자금"])[0]
+    while not stop():
+        started = time.perf_counter()
+        rag_indexer.vector_search("운전자금", 4, persist, embed_query=lambda _text: query)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    os.environ["RAG_VECTOR_BACKEND"] = "numpy"
+    with tempfile.TemporaryDirectory() as root:
+        docs, persist = os.path.join(root, "docs"), os.path.join(root, "index")
+        os.makedirs(docs)
+        for i in range(FILES):
+            _write(docs, i, "v1")
+        rag_indexer.build_index(docs, persist, embed_documents=_embed, split=_split)
+
+        deadline = time.perf_counter() + 2
+        idle = _latencies(persist, lambda: time.perf_counter() > deadline)
+
+        for i in range(0, FILES, 5):
+            _write(docs, i, "v2")
+        done = threading.Event()
+        result = {}
+
+        def rebuild():
+            result.update(rag_indexer.build_index(docs, persist, embed_documents=_embed, split=_split))
+            done.set()
+
+        thread = threading.Thread(target=rebuild)
+        thread.start()
+        busy = _latencies(persist, done.is_set)
+        thread.join()
+
+        for label, samples in (("idle", idle), ("rebuilding", busy)):
+            samples.sort()
+            print(
+                f"{label:<11} queries={len(samples):>6} p50_ms={statistics.median(samples):.3f} "
+                f"p99_ms={samples[int(len(samples) * 0.99)]:.3f}"
+            )
+        print(f"rebuild: {result['added']} chunks re-embedded in {result['duration_ms'] / 1000:.1f}s -> {result['snapshot']}")
+
+
+if __name__ == "__main__":
+    main()
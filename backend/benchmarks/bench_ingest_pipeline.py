@@ -0,0 +1,94 @@
+"""Cold index build throughput and peak memory of the ingestion pipeline.
+
+Writes a synthetic corpus of text files, builds the index into an in-process
+store with stand-in embeddings (a fixed delay per batch), and prints the
+per-stage pages/sec from the build report plus the peak Python heap of the
+building process (parse workers are separate processes).
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_ingest_pipeline                 # 1 worker vs all CPUs
+    python -m benchmarks.bench_ingest_pipeline --files 4000 --workers 1 4 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from app.services import rag_indexer
+from app.services.vector_store import VectorStore
+
+WORDS = "소상공인 운전자금 시설자금 대출 보증 창업 청년 음식점 카페 매출 정산 지원 신청 서류 한도 금리".split()
+
+
+class _Store(VectorStore):
+    def __init__(self):
+        self.rows = 0
+
+    def upsert(self, ids, embeddings, texts, metadatas):
+        self.rows += len(ids)
+
+    def update_metadata(self, ids, metadatas):
+        pass
+
+    def delete(self, ids):
+        self.rows -= len(ids)
+
+    def query(self, embedding, top_k, *, partition=None):
+        return []
+
+    def get(self, ids):
+        return [None] * len(ids)
+
+    def count(self):
+        return self.rows
+
+
+def _embed(texts):
+    time.sleep(0.005)  # stands in for the embedding API round trip
+    return [[0.0] for _ in texts]
+
+
+def split(text):
+    # Module level so it pickles into the worker processes.
+    return [text[i:i + rag_indexer.CHUNK_SIZE] for i in range(0, len(text), rag_indexer.CHUNK_SIZE - rag_indexer.CHUNK_OVERLAP)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=2_000)
+    parser.add_argument("--words", type=int, default=6_000, help="words per file (~3 pages per 1,000)")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as root:
+        docs = os.path.join(root, "docs")
+        os.makedirs(docs)
+        for i in range(args.files):
+            with open(os.path.join(docs, f"doc-{i}.md"), "w", encoding="utf-8") as handle:
+                handle.write(" ".join(rng.choice(WORDS) for _ in range(args.words)))
+        corpus_mb = sum(os.path.getsize(os.path.join(docs, name)) for name in os.listdir(docs)) / 2**20
+
+        for workers in dict.fromkeys(args.workers):
+            tracemalloc.start()
+            started = time.perf_counter()
+            report = rag_indexer.build_index(
+                docs, os.path.join(root, f"index-{workers}"), store=_Store(), embed_documents=_embed,
+                split=split, workers=workers,
+            )
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            parse, embed = report["stages"]["parse"], report["stages"]["embed"]
+            print(
+                f"workers={workers:<3} corpus_mb={corpus_mb:.0f} total_s={elapsed:.1f} chunks={report['added']} "
+                f"parse_pages/s={parse['pages_per_second']} embed_pages/s={embed['pages_per_second']} "
+                f"peak_heap_mb={peak / 2**20:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Intent matching cost as the keyword dictionary grows.
+
+Compares the old per-keyword substring scan with the compiled
+``IntentMatcher`` for dictionaries of increasing size.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_intent_router
+"""
+import random
+import time
+
+from app.services.intent_matcher import DATE_HINTS, INTENT_KEYWORDS, IntentMatcher
+
+QUERIES = [
+    "지난주 매출 추이 알려줘",
+    "사잇돌 대출 자격이 어떻게 돼?",
+    "이번 달 리뷰 평점이 떨어졌어",
+    "소상공인 정책자금 신청 방법",
+    "저번 주 매출 어떻게 됐어",
+]
+
+
+def _synthetic_keywords(count: int, rng: random.Random) -> list:
+    return ["".join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(2, 4))) for _ in range(count)]
+
+
+def _substring_scan(dictionary: dict, query: str) -> set:
+    lowered = query.lower()
+    return {intent for intent, keywords in dictionary.items() if any(keyword in lowered for keyword in keywords)}
+
+
+def _time_per_query(func, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            func(query)
+    return (time.perf_counter() - started) / (rounds * len(QUERIES)) * 1e6
+
+
+def main() -> None:
+    rng = random.Random(7)
+    print(f"{'keywords':>9} {'scan_us':>9} {'matcher_us':>11} {'build_ms':>9}")
+    for extra in (0, 100, 1_000, 5_000, 20_000):
+        dictionary = {intent: list(keywords) for intent, keywords in INTENT_KEYWORDS.items()}
+        dictionary["synthetic"] = _synthetic_keywords(extra, rng)
+        total = sum(len(keywords) for keywords in dictionary.values())
+
+        started = time.perf_counter()
+        matcher = IntentMatcher(dictionary, DATE_HINTS)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        scan_us = _time_per_query(lambda q: _substring_scan(dictionary, q), rounds=50)
+        matcher_us = _time_per_query(matcher.match, rounds=500)
+        print(f"{total:>9} {scan_us:>9.1f} {matcher_us:>11.1f} {build_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Per-business summary loop versus the set-based batch RPC.
+
+Simulates a franchise dashboard of N stores against a Supabase stub where
+every RPC pays a fixed network round trip plus a small per-row cost.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_metrics_batch --stores 300 --rtt-ms 30
+"""
+import argparse
+import time
+
+from services import metrics_service
+
+
+class _Response:
+    def __init__(self, data, delay: float):
+        self.data = data
+        self._delay = delay
+
+    def execute(self):
+        time.sleep(self._delay)
+        return self
+
+
+class _StubSupabase:
+    def __init__(self, rtt: float, per_row: float):
+        self.rtt = rtt
+        self.per_row = per_row
+        self.calls = 0
+
+    def rpc(self, name, params):
+        self.calls += 1
+        ids = params.get("target_businesses") or [params.get("target_business")]
+        rows = [{"business_id": biz, "net_sales": 1000, "gross_sales": 1100} for biz in ids]
+        return _Response(rows, self.rtt + self.per_row * len(rows))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stores", type=int, default=300)
+    parser.add_argument("--rtt-ms", type=float, default=30.0)
+    parser.add_argument("--per-row-us", type=float, default=20.0)
+    args = parser.parse_args()
+
+    ids = [f"biz-{i}" for i in range(args.stores)]
+    for label, run in (
+        ("per-business loop", lambda: [metrics_service.get_metrics_summary(biz) for biz in ids]),
+        ("batch RPC", lambda: metrics_service.get_metrics_summaries(ids)),
+    ):
+        stub = _StubSupabase(args.rtt_ms / 1000, args.per_row_us / 1e6)
+        metrics_service.supabase = stub
+        started = time.perf_counter()
+        results = run()
+        elapsed = time.perf_counter() - started
+        print(f"{label:<18} stores={len(results)} rpc_calls={stub.calls} wall={elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""In-memory policy search latency across catalog sizes.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_policy_search
+"""
+import random
+import time
+
+from services.policy_search import PolicySearchIndex
+
+WORDS = (
+    "소상공인 운전자금 시설자금 대출 보증 창업 청년 여성 재도전 스마트상점 디지털 전환 "
+    "음식점 카페 제조업 수출 고용 안정 긴급 경영 특별 이차보전 저금리 온라인 방문 "
+    "사업자등록증 부가세 과세표준증명 매출 감소 업력 신용 등급 지역 신용보증재단"
+).split()
+QUERIES = ("운전자금", "청년 창업", "스마트상점 지원", "저금리 대출", "음식점 경영 안정", "신용보증재단")
+
+
+def _catalog(size: int, rng: random.Random) -> list:
+    return [
+        {
+            "id": f"p-{i}",
+            "name": " ".join(rng.sample(WORDS, 3)),
+            "group_name": rng.choice(["정책자금", "보증", "지원사업"]),
+            "eligibility": " ".join(rng.sample(WORDS, 8)),
+            "documents": "; ".join(rng.sample(WORDS, 3)),
+            "application_method": " ".join(rng.sample(WORDS, 2)),
+        }
+        for i in range(size)
+    ]
+
+
+def main() -> None:
+    rng = random.Random(5)
+    print(f"{'products':>8} {'build_ms':>9} {'search_us':>10}")
+    for size in (100, 1_000, 5_000, 20_000):
+        index = PolicySearchIndex()
+        catalog = _catalog(size, rng)
+        started = time.perf_counter()
+        index.build(catalog)
+        build_ms = (time.perf_counter() - started) * 1000
+        rounds = 200
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for query in QUERIES:
+                index.search(query, limit=20)
+        search_us = (time.perf_counter() - started) / (rounds * len(QUERIES)) * 1e6
+        print(f"{size:>8} {build_ms:>9.1f} {search_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
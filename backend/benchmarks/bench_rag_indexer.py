@@ -0,0 +1,83 @@
+"""Incremental RAG index rebuild cost on a synthetic corpus.
+
+Embeddings and the vector store are replaced by in-process stand-ins so the
+numbers isolate the indexer's own bookkeeping and count embedding calls.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_rag_indexer
+"""
+import os
+import random
+import tempfile
+import time
+
+from app.services import rag_indexer
+from app.services.vector_store import VectorStore
+
+WORDS = "소상공인 운전자금 시설자금 대출 보증 창업 청년 음식점 카페 매출 정산 지원 신청 서류 한도 금리".split()
+
+
+class _Store(VectorStore):
+    def __init__(self):
+        self.rows = 0
+
+    def upsert(self, ids, embeddings, texts, metadatas):
+        self.rows += len(ids)
+
+    def update_metadata(self, ids, metadatas):
+        pass
+
+    def delete(self, ids):
+        self.rows -= len(ids)
+
+    def query(self, embedding, top_k, *, partition=None):
+        return []
+
+    def get(self, ids):
+        return [None] * len(ids)
+
+    def count(self):
+        return self.rows
+
+
+def _split(text):
+    return [text[i:i + 1000] for i in range(0, len(text), 850)]
+
+
+def main() -> None:
+    rng = random.Random(3)
+    calls = {"texts": 0}
+
+    def embed(texts):
+        calls["texts"] += len(texts)
+        return [[0.0] for _ in texts]
+
+    with tempfile.TemporaryDirectory() as root:
+        docs, persist = os.path.join(root, "docs"), os.path.join(root, "index")
+        os.makedirs(docs)
+        for i in range(2_000):
+            with open(os.path.join(docs, f"doc-{i}.md"), "w", encoding="utf-8") as handle:
+                handle.write(" ".join(rng.choice(WORDS) for _ in range(1_500)))
+        store = _Store()
+
+        def run(label):
+            before = calls["texts"]
+            started = time.perf_counter()
+            report = rag_indexer.build_index(docs, persist, store=store, embed_documents=embed, split=_split)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(
+                f"{label:<10} {elapsed:>9.1f}ms embedded={calls['texts'] - before:>6} "
+                f"added={report['added']} removed={report['removed']} skipped={report['skipped']}"
+            )
+
+        run("cold")
+        run("unchanged")
+        for i in range(0, 2_000, 100):
+            with open(os.path.join(docs, f"doc-{i}.md"), "a", encoding="utf-8") as handle:
+                handle.write(" 개정")
+        run("5% edited")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Analytics cost for ranges of one to ten years of ``metrics_daily`` rows.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_timeseries_analytics
+"""
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.services.timeseries_analytics import compute_analytics, frame_from_rows
+
+
+def _synthetic_rows(days: int, rng: np.random.Generator) -> list:
+    start = date(2015, 1, 1)
+    sales = rng.normal(500_000, 80_000, days).clip(0)
+    return [
+        {
+            "metric_date": (start + timedelta(days=i)).isoformat(),
+            "gross_sales": float(sales[i] * 1.1),
+            "net_sales": float(sales[i]),
+            "cost_of_goods": float(sales[i] * 0.6),
+            "tax_amount": float(sales[i] * 0.1),
+            "settlement_delay_count": int(rng.integers(0, 2)),
+        }
+        for i in range(days)
+    ]
+
+
+def main() -> None:
+    rng = np.random.default_rng(3)
+    print(f"{'years':>5} {'rows':>6} {'parse_ms':>9} {'compute_ms':>11}")
+    for years in (1, 3, 5, 10):
+        rows = _synthetic_rows(365 * years, rng)
+        started = time.perf_counter()
+        frame = frame_from_rows(rows)
+        parsed = time.perf_counter()
+        for _ in range(20):
+            compute_analytics(frame)
+        compute_ms = (time.perf_counter() - parsed) / 20 * 1000
+        print(f"{years:>5} {len(rows):>6} {(parsed - started) * 1000:>9.2f} {compute_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
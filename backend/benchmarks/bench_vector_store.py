@@ -0,0 +1,123 @@
+"""Vector backends compared on recall, query latency, disk footprint and load time.
+
+Synthetic clustered unit vectors stand in for document embeddings. Recall@10
+is measured against exact float32 search. Chroma and the HNSW mode run only
+when ``chromadb`` / ``hnswlib`` are installed.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_vector_store                  # 10k and 100k chunks
+    python -m benchmarks.bench_vector_store 10000 100000 1000000 --dim 256
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app.services import vector_store
+from app.services.vector_store import ChromaVectorStore, NumpyVectorStore
+
+BLOCK = 50_000
+QUERIES = 50
+TOP_K = 10
+
+
+def _block(index: int, size: int, dim: int, centers: np.ndarray) -> np.ndarray:
+    rng = np.random.default_rng(1000 + index)
+    labels = rng.integers(0, len(centers), size)
+    vectors = centers[labels] + rng.normal(scale=0.6, size=(size, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _blocks(count: int, dim: int, centers: np.ndarray):
+    for index, start in enumerate(range(0, count, BLOCK)):
+        yield start, _block(index, min(BLOCK, count - start), dim, centers)
+
+
+def _ground_truth(count: int, dim: int, centers: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+    best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+    for start, vectors in _blocks(count, dim, centers):
+        scores = queries @ vectors.T
+        rows = np.broadcast_to(np.arange(start, start + len(vectors)), scores.shape)
+        best_rows = np.concatenate([best_rows, rows], axis=1)
+        best_scores = np.concatenate([best_scores, scores], axis=1)
+        keep = np.argsort(-best_scores, axis=1)[:, :TOP_K]
+        best_rows = np.take_along_axis(best_rows, keep, axis=1)
+        best_scores = np.take_along_axis(best_scores, keep, axis=1)
+    return best_rows
+
+
+def _disk_bytes(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+
+def _run(name, open_store, count, dim, centers, queries, truth, root):
+    path = os.path.join(root, name)
+    started = time.perf_counter()
+    store = open_store(path)
+    for start, vectors in _blocks(count, dim, centers):
+        ids = [f"{row:064x}" for row in range(start, start + len(vectors))]
+        for offset in range(0, len(ids), 5_000):  # Chroma caps batch sizes
+            part = slice(offset, offset + 5_000)
+            store.upsert(
+                ids[part], vectors[part], [str(row) for row in range(start + offset, start + offset + len(ids[part]))],
+                [{"row": 0}] * len(ids[part]),
+            )
+    store.flush()
+    write_s = time.perf_counter() - started
+    del store
+
+    started = time.perf_counter()
+    store = open_store(path)
+    load_ms = (time.perf_counter() - started) * 1000
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        results = store.query(query, TOP_K)
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += len({int(hit["page_content"]) for hit in results} & set(expected.tolist()))
+    print(
+        f"{count:>9,} {name:<14} write_s={write_s:>7.1f} load_ms={load_ms:>8.1f} "
+        f"p50_ms={statistics.median(latencies):>7.2f} recall@{TOP_K}={hits / truth.size:.3f} "
+        f"disk_mb={_disk_bytes(path) / 2**20:>8.1f}"
+    )
+    del store
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sizes", nargs="*", type=int, default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(256, args.dim)).astype(np.float32)
+    backends = [
+        ("numpy-float16", lambda path: NumpyVectorStore(path, dtype="float16")),
+        ("numpy-int8", lambda path: NumpyVectorStore(path, dtype="int8")),
+    ]
+    if vector_store.hnswlib is not None:
+        backends.append(("numpy-hnsw", lambda path: NumpyVectorStore(path, dtype="float16", hnsw=True)))
+    if vector_store.chromadb is not None:
+        backends.append(("chroma", ChromaVectorStore))
+    else:
+        print("chromadb not installed; skipping the Chroma baseline")
+
+    for count in args.sizes:
+        sample = _block(0, min(count, BLOCK), args.dim, centers)[:QUERIES]
+        queries = sample + rng.normal(scale=0.05, size=sample.shape).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        truth = _ground_truth(count, args.dim, centers, queries)
+        with tempfile.TemporaryDirectory() as root:
+            for name, open_store in backends:
+                _run(name, open_store, count, args.dim, centers, queries, truth, root)
+
+
+if __name__ == "__main__":
+    main()
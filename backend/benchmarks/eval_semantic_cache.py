@@ -0,0 +1,40 @@
+"""Offline false-hit evaluation for the semantic answer cache.
+
+Replays logged turns from ``conversation_logs`` through ``SemanticCache`` at
+several similarity thresholds and reports hit rate and false-hit rate.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.eval_semantic_cache --business-id <uuid> --limit 2000
+"""
+import argparse
+import json
+
+from services.semantic_cache import default_embed, evaluate_false_hits
+from services.supabase_client import supabase
+
+
+def _load_logs(business_id: str | None, limit: int) -> list:
+    builder = supabase.table("conversation_logs").select("business_id, role, message, created_at")
+    if business_id:
+        builder = builder.eq("business_id", business_id)
+    response = builder.order("created_at", desc=False).limit(limit).execute()
+    return response.data or []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--business-id")
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--thresholds", default="0.85,0.9,0.92,0.95")
+    parser.add_argument("--min-agreement", type=float, default=0.5)
+    args = parser.parse_args()
+
+    logs = _load_logs(args.business_id, args.limit)
+    thresholds = [float(value) for value in args.thresholds.split(",")]
+    for report in evaluate_false_hits(logs, default_embed, thresholds, args.min_agreement):
+        print(json.dumps(report, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
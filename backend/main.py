@@ -10,7 +10,7 @@ import json
 import logging
 import time
 from datetime import date, datetime
-from typing import Optional, List, Dict
+from typing import Any, Awaitable, Callable, Optional, List, Dict
 from fastapi import (
     FastAPI,
     WebSocket,
@@ -19,7 +19,11 @@ from fastapi import (
     status,
     WebSocketDisconnect,
     Query,
+    Header,
+    File,
+    UploadFile,
 )
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import StreamingResponse
 from pydantic import BaseModel
@@ -27,20 +31,47 @@ from pydantic import BaseModel
 import models
 
 from services.supabase_client import supabase
-from services import rag_service, conversation_service
+from services import policy_service, rag_service
+from services.policy_search import policy_index
+from services.chat_stream import ChunkStreamer
+from services.alert_hub import alert_hub
+from services.llm_cache import llm_cache, make_key, replay_stream
+from services.semantic_cache import semantic_cache
+from services.embedding_cache import embedding_cache
 from app.services.hybrid_router import route as hybrid_route
 from app.services.metrics_service import fetch_timeseries, llm_explain_timeseries
 from app.services.context_builder import build_context
+from app.services.timeseries_analytics import fetch_analytics
+from app.services.context_cache import context_cache, source_for_job
+from app.services.signal_engine import signal_engine
+from app.services.alert_scheduler import alert_scheduler
+from app.services.policy_matcher import rebuild_recommendations
+from app.services import index_snapshots, private_documents, rag_indexer
+from app.services.index_jobs import index_jobs
 from app.prompts.system_prompt import build_system_prompt
-from services.metrics_service import get_metrics_summary, list_metrics_daily, DATA_DELAY_NOTICE
-from services.reviews_service import (
+from services.metrics_service import DATA_DELAY_NOTICE, iter_metrics_summaries
+from services.reviews_service import iter_reviews
+from services.conversation_service import iter_messages
+from services.pagination import InvalidCursorError
+from auth import decode_profile, get_current_profile, get_optional_profile, require_admin
+from services.aio import (
+    run_blocking,
+    get_metrics_summary,
+    get_metrics_summaries,
+    list_metrics_daily,
     get_review_summary,
+    get_review_rollup,
     list_recent_reviews,
-    list_all_reviews,
+    page_reviews,
     review_source_breakdown,
+    list_policy_recommendations,
+    list_policy_workflows,
+    list_policy_products,
+    upsert_business,
+    is_business_owner,
+    log_message,
+    page_messages,
 )
-from services.policy_service import list_policy_recommendations, list_policy_workflows, list_policy_products
-from services.business_service import upsert_business
 
 app = FastAPI(
     title="FoodBiz AI API",
@@ -51,6 +82,28 @@ app = FastAPI(
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger("foodbiz.ai")
 
+ALERT_HEARTBEAT_SECONDS = float(os.getenv("ALERT_HEARTBEAT_SECONDS", 15))
+ALERT_SCHEDULER_ENABLED = os.getenv("ALERT_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+@app.on_event("startup")
+async def start_alert_scheduler():
+    if ALERT_SCHEDULER_ENABLED:
+        alert_scheduler.start()
+
+
+@app.on_event("startup")
+async def load_policy_index():
+    try:
+        await run_blocking(policy_index.refresh)
+    except Exception as error:  # pragma: no cover - Supabase may be unreachable at boot
+        logger.warning("Policy index preload failed: %s", error)
+
+
+@app.on_event("shutdown")
+async def stop_alert_scheduler():
+    await alert_scheduler.stop()
+
 
 def _hash_business_id(biz_id: Optional[str]) -> Optional[str]:
     if not biz_id:
@@ -76,25 +129,85 @@ def _resolve_range(date_from: Optional[date], date_to: Optional[date]) -> tuple[
     return start, end
 
 
+ChunkCallback = Callable[[str], Awaitable[None]]
+
+
 async def _generate_llm_answer(
     query: str,
     system_prompt: str,
     contexts: Optional[list[str]] = None,
+    on_chunk: Optional[ChunkCallback] = None,
+    cache_tag: Optional[str] = None,
 ) -> str:
     final_response = ""
     async for event in rag_service.stream_chat_response(
         query,
         system_prompt=system_prompt,
         extra_context=contexts,
+        cache_tag=cache_tag,
     ):
-        if event["type"] == "final":
+        if event["type"] == "chunk" and on_chunk:
+            await on_chunk(event["content"])
+        elif event["type"] == "final":
             final_response = event["response"]
     return final_response
 
 
-def _format_calculations(stats: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+async def _explain_timeseries(
+    series: List[Dict[str, object]],
+    stats: Dict[str, Optional[float]],
+    context: Optional[str] = None,
+) -> str:
+    """`llm_explain_timeseries` behind the exact-match answer cache."""
+    key = make_key(
+        rag_service.get_model_name(),
+        "llm_explain_timeseries",
+        [json.dumps(series, ensure_ascii=False), json.dumps(stats, sort_keys=True), context or ""],
+        "",
+        str(series[-1]["x"]) if series else None,
+    )
+    return await llm_cache.get_or_generate(
+        key,
+        lambda: llm_explain_timeseries(series, stats, context=context),
+    )
+
+
+def _data_version(router_decision: str, start_date: date, end_date: date, bundle, private: bool = False) -> str:
+    """Identify the data an answer was built from; semantic cache hits never cross versions.
+
+    Answers that may quote private documents get their own version, so they
+    are never replayed to a caller who is not the owner.
+    """
+    series = bundle.metrics.get("series", []) if bundle.metrics else []
+    latest = series[-1]["x"] if series else ""
+    review_count = bundle.reviews.get("review_count", 0) if bundle.reviews else 0
+    scope = ":private" if private else ""
+    return f"{router_decision}:{start_date}:{end_date}:{latest}:{review_count}{scope}"
+
+
+async def _semantic_lookup(biz_id: Optional[str], data_version: str, query: str):
+    """Return (hit, query_vector); the vector is reused when storing a fresh answer."""
+    if not biz_id:
+        return None, None
+    try:
+        query_vector = await run_blocking(semantic_cache.embed_query, query)
+        return semantic_cache.lookup(biz_id, data_version, query, vector=query_vector), query_vector
+    except Exception as error:
+        logger.warning("Semantic cache lookup failed: %s", error)
+        return None, None
+
+
+def _format_calculations(
+    stats: Dict[str, Optional[float]], analytics: Optional[Dict[str, Optional[float]]] = None
+) -> Dict[str, Optional[float]]:
+    """Round ``stats`` plus the ``analytics`` keys they do not already have.
+
+    ``stats`` are the values the LLM explanation was given, so on a shared key
+    (e.g. ``moving_avg_7``) they win and ``calculations`` never contradicts it.
+    """
+    merged = {**{key: value for key, value in (analytics or {}).items() if key not in stats}, **stats}
     formatted: Dict[str, Optional[float]] = {}
-    for key, value in stats.items():
+    for key, value in merged.items():
         if isinstance(value, (int, float)):
             formatted[key] = round(float(value), 4)
         else:
@@ -102,7 +215,7 @@ def _format_calculations(stats: Dict[str, Optional[float]]) -> Dict[str, Optiona
     return formatted
 
 
-def _gather_business_context(biz_id: Optional[str]) -> tuple[List[str], List[Dict[str, Optional[str]]]]:
+async def _gather_business_context(biz_id: Optional[str]) -> tuple[List[str], List[Dict[str, Optional[str]]]]:
     if not biz_id:
         return [], []
 
@@ -110,7 +223,7 @@ def _gather_business_context(biz_id: Optional[str]) -> tuple[List[str], List[Dic
     sources: List[Dict[str, Optional[str]]] = []
 
     try:
-        review_summary = get_review_summary(biz_id)
+        review_summary = await get_review_summary(biz_id)
         if review_summary:
             contexts.append(
                 (
@@ -118,7 +231,7 @@ def _gather_business_context(biz_id: Optional[str]) -> tuple[List[str], List[Dic
                     f"부정 {review_summary['negative_count']}건"
                 )
             )
-            recent_reviews = list_recent_reviews(biz_id, limit=3)
+            recent_reviews = await list_recent_reviews(biz_id, limit=3)
             for review in recent_reviews:
                 content = (review.get("content") or "").strip()
                 rating = review.get("rating")
@@ -139,7 +252,7 @@ def _gather_business_context(biz_id: Optional[str]) -> tuple[List[str], List[Dic
         logger.warning("Failed to build review context: %s", error)
 
     try:
-        recommendations = list_policy_recommendations(biz_id)
+        recommendations = await list_policy_recommendations(biz_id)
         if recommendations:
             top_names = [rec.get("name") for rec in recommendations[:3] if rec.get("name")]
             if top_names:
@@ -159,7 +272,7 @@ def _gather_business_context(biz_id: Optional[str]) -> tuple[List[str], List[Dic
 
     if not any(source.get("name") == "public.policy_products" for source in sources):
         try:
-            product_groups = list_policy_products()
+            product_groups = await list_policy_products()
             top_products: List[str] = []
             for group in product_groups:
                 for product in group.get("products", []):
@@ -210,14 +323,15 @@ async def signup(user: models.UserCreate):
     """Registers a new user and their profile information using Supabase Auth options."""
     try:
         profile_data = user.profile
-        response = supabase.auth.sign_up(
+        response = await run_blocking(
+            supabase.auth.sign_up,
             {
                 "email": user.email,
                 "password": user.password,
                 "options": {
                     "data": profile_data.dict(exclude_none=True)
                 }
-            }
+            },
         )
 
         if not response.user:
@@ -229,18 +343,20 @@ async def signup(user: models.UserCreate):
         user_id = response.user.id
 
         try:
-            supabase.auth.admin.update_user_by_id(user_id, {"email_confirm": True})
+            await run_blocking(supabase.auth.admin.update_user_by_id, user_id, {"email_confirm": True})
         except Exception:
             # If update fails, continue without blocking signup
             pass
 
         business_code = profile_data.business_code or f"AUTO-{user_id[:8]}"
-        business_record = upsert_business(
+        business_record = await upsert_business(
             owner_id=user_id,
             store_name=profile_data.store_name,
             business_code=business_code,
             industry=profile_data.industry,
         )
+        if business_record.get("id"):
+            context_cache.invalidate(business_id=business_record["id"])
 
         profile_payload = {
             "id": user_id,
@@ -251,7 +367,7 @@ async def signup(user: models.UserCreate):
             "business_id": business_record.get("id"),
         }
         profile_payload = {k: v for k, v in profile_payload.items() if v is not None}
-        supabase.table("profiles").upsert(profile_payload, on_conflict="id").execute()
+        await run_blocking(supabase.table("profiles").upsert(profile_payload, on_conflict="id").execute)
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Signup failed: {str(e)}")
@@ -272,10 +388,13 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     """Logs in a user and returns a JWT access token."""
     try:
         # 1. Authenticate user with Supabase Auth
-        response = supabase.auth.sign_in_with_password({
-            "email": form_data.username,
-            "password": form_data.password
-        })
+        response = await run_blocking(
+            supabase.auth.sign_in_with_password,
+            {
+                "email": form_data.username,
+                "password": form_data.password
+            },
+        )
         
         if not response.user or not response.session:
             raise HTTPException(status_code=401, detail="Incorrect email or password")
@@ -283,7 +402,9 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         user_id = response.user.id
 
         # 2. Fetch all profile info from our public.profiles table
-        user_profile_response = supabase.table('profiles').select('*').eq('id', user_id).single().execute()
+        user_profile_response = await run_blocking(
+            supabase.table('profiles').select('*').eq('id', user_id).single().execute
+        )
         
         if not user_profile_response.data:
              raise HTTPException(status_code=404, detail="User profile not found.")
@@ -339,6 +460,15 @@ class MetricsSummaryResponse(BaseModel):
     data_delay_notice: str = DATA_DELAY_NOTICE
 
 
+class MetricsSummaryBatchRequest(BaseModel):
+    business_ids: list[str] = []
+    owner_id: str | None = None
+
+
+class MetricsSummaryBatchResponse(BaseModel):
+    items: list[MetricsSummaryResponse]
+
+
 class MetricsDailyResponse(BaseModel):
     items: list[dict]
     data_delay_notice: str = DATA_DELAY_NOTICE
@@ -349,9 +479,19 @@ class RAGIndexRequest(BaseModel):
     persist_dir: Optional[str] = None
 
 
-class RAGIndexResponse(BaseModel):
-    indexed_chunks: int
-    persist_directory: str
+class RAGIndexJobResponse(BaseModel):
+    job_id: str
+    status: str
+    docs_dir: Optional[str] = None
+    persist_dir: Optional[str] = None
+    progress: Dict[str, Any] = {}
+    eta_seconds: Optional[float] = None
+    elapsed_seconds: Optional[float] = None
+    report: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    already_running: bool = False
 
 
 class ReviewSummaryResponse(BaseModel):
@@ -363,12 +503,18 @@ class ReviewSummaryResponse(BaseModel):
     negative_count: int
 
 
+class ReviewRollupResponse(ReviewSummaryResponse):
+    rating_histogram: Dict[str, int]
+    monthly: list[dict]
+
+
 class ReviewsListResponse(BaseModel):
     items: list[dict]
 
 
 class ReviewsAllResponse(BaseModel):
     items: list[dict]
+    next_cursor: Optional[str] = None
 
 
 class ReviewSourceBreakdownResponse(BaseModel):
@@ -390,8 +536,45 @@ class BusinessSetupRequest(BaseModel):
     industry: str | None = None
 
 
+class CacheInvalidateRequest(BaseModel):
+    business_id: str | None = None
+    source: str | None = None
+
+
+class AlertPublishRequest(BaseModel):
+    alert_type: str = "system"
+    message: str
+    business_id: str | None = None
+
+
+class DataJobEvent(BaseModel):
+    job_type: str
+    status: str
+    finished_at: str | None = None
+    business_id: str | None = None
+
+
 @app.post("/rag/query", response_model=models.RagQueryResponse, tags=["AI"])
-async def rag_query(payload: models.RagQueryRequest, business_id: str | None = Query(None)):
+async def rag_query(
+    payload: models.RagQueryRequest,
+    business_id: str | None = Query(None),
+    profile: dict | None = Depends(get_optional_profile),
+):
+    return await _run_rag_query(payload, business_id, profile=profile)
+
+
+async def _run_rag_query(
+    payload: models.RagQueryRequest,
+    business_id: str | None = None,
+    on_chunk: Optional[ChunkCallback] = None,
+    *,
+    profile: Optional[Dict[str, Any]] = None,
+) -> models.RagQueryResponse:
+    """Shared RAG pipeline; ``on_chunk`` receives LLM tokens as they are generated.
+
+    The business's private documents are searched only when ``profile`` (the
+    caller's token claims) belongs to the business owner.
+    """
     start_ts = time.perf_counter()
     biz_id = business_id or getattr(payload, "business_id", None)
     router_decision = hybrid_route(payload.query)
@@ -405,7 +588,7 @@ async def rag_query(payload: models.RagQueryRequest, business_id: str | None = Q
     error_code = None
 
     if biz_id:
-        conversation_service.log_message(
+        await log_message(
             business_id=biz_id,
             role="user",
             message=payload.query,
@@ -415,11 +598,13 @@ async def rag_query(payload: models.RagQueryRequest, business_id: str | None = Q
         raw_to = _parse_iso_date(payload.date_to)
         start_date, end_date = _resolve_range(raw_from, raw_to)
 
-        bundle = build_context(
+        search_private = await _owns_business(biz_id, profile)
+        bundle = await build_context(
             payload.query,
             biz_id,
             date_from=start_date,
             date_to=end_date,
+            search_private=search_private,
         )
 
         sources = list(bundle.sources)
@@ -430,39 +615,53 @@ async def rag_query(payload: models.RagQueryRequest, business_id: str | None = Q
         if metrics_series:
             sql_range_meta = {"from": metrics_series[0]["x"], "to": metrics_series[-1]["x"]}
 
-        if metrics_series:
-            calculations = _format_calculations(metrics_stats)
+        metrics_analytics = bundle.metrics.get("analytics", {}) if bundle.metrics else {}
+        if metrics_series or metrics_analytics:
+            calculations = _format_calculations(metrics_stats, metrics_analytics)
 
-        if router_decision == "SQL_TIME_SERIES":
-            
+        if router_decision == "SQL_TIME_SERIES" and metrics_series:
+            charts = [
+                {
+                    "type": "timeseries",
+                    "series": [
+                        {
+                            "name": "매출",
+                            "data": metrics_series,
+                        }
+                    ],
+                }
+            ]
+        if router_decision != "SQL_TIME_SERIES":
+            top_k = len(bundle.documents)
+
+        data_version = _data_version(router_decision, start_date, end_date, bundle, search_private)
+        semantic_hit, query_vector = await _semantic_lookup(biz_id, data_version, payload.query)
+        if semantic_hit:
+            answer = semantic_hit["answer"]
+            if on_chunk:
+                async for event in replay_stream(answer):
+                    await on_chunk(event["content"])
+        elif router_decision == "SQL_TIME_SERIES":
             if metrics_series:
-                charts = [
-                    {
-                        "type": "timeseries",
-                        "series": [
-                            {
-                                "name": "매출",
-                                "data": metrics_series,
-                            }
-                        ],
-                    }
-                ]
                 context_str = "\n".join(bundle.contexts) if bundle.contexts else None
-                answer = await llm_explain_timeseries(metrics_series, metrics_stats, context=context_str)
+                answer = await _explain_timeseries(metrics_series, metrics_stats, context=context_str)
             else:
                 answer = "요청하신 기간에 매출 데이터가 없어 추이를 보여드릴 수 없습니다. 데이터가 수집되면 다시 안내드릴게요."
                 if bundle.contexts:
                     answer += "\n" + "\n".join(bundle.contexts)
         else:
-            top_k = len(bundle.documents)
             answer = await _generate_llm_answer(
                 payload.query,
                 system_prompt,
                 bundle.contexts or None,
+                on_chunk=on_chunk,
+                cache_tag=sql_range_meta["to"] if sql_range_meta else date.today().isoformat(),
             )
+        if biz_id and not semantic_hit and query_vector is not None:
+            semantic_cache.store(biz_id, data_version, payload.query, answer, vector=query_vector)
 
         if biz_id:
-            conversation_service.log_message(
+            await log_message(
                 business_id=biz_id,
                 role="assistant",
                 message=answer,
@@ -502,23 +701,105 @@ async def rag_query(payload: models.RagQueryRequest, business_id: str | None = Q
         raise HTTPException(status_code=500, detail="Error processing your query in the chat pipeline.") from error
 
 
-@app.post("/rag/index", response_model=RAGIndexResponse, tags=["AI"])
-def rebuild_index(request: RAGIndexRequest):
+@app.post("/rag/index", response_model=RAGIndexJobResponse, status_code=202, tags=["AI"])
+async def rebuild_index(request: RAGIndexRequest):
+    """Start an incremental index build in the background and return its job id."""
     docs_dir = request.docs_dir or rag_indexer.DEFAULT_DOCS_DIR
     persist_dir = request.persist_dir or rag_indexer.DEFAULT_PERSIST_DIR
-    indexed = rag_indexer.build_index(docs_dir=docs_dir, persist_dir=persist_dir)
-    logger.info(
-        json.dumps(
-            {
-                "event": "rag_index",
-                "docs_dir": docs_dir,
-                "persist_dir": persist_dir,
-                "indexed_chunks": indexed,
-            },
-            ensure_ascii=False,
-        )
+    return await index_jobs.submit(docs_dir, persist_dir)
+
+
+@app.get("/rag/index/jobs/{job_id}", response_model=RAGIndexJobResponse, tags=["AI"])
+async def rag_index_job(job_id: str):
+    """Progress (files parsed, chunks embedded, ETA) of an index build."""
+    job = index_jobs.get(job_id) or await run_blocking(index_jobs.load, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Index job not found.")
+    return job
+
+
+class RAGRollbackRequest(BaseModel):
+    persist_dir: Optional[str] = None
+    version: Optional[str] = None
+
+
+@app.get("/rag/index/snapshots", tags=["AI"])
+async def rag_index_snapshots(persist_dir: Optional[str] = Query(None)):
+    """Live snapshot plus retired ones still available for rollback."""
+    return await run_blocking(index_snapshots.list_snapshots, persist_dir or rag_indexer.DEFAULT_PERSIST_DIR)
+
+
+@app.post("/rag/index/rollback", tags=["AI"], dependencies=[Depends(require_admin)])
+async def rag_index_rollback(request: RAGRollbackRequest):
+    """Atomically point the document index back at an earlier snapshot."""
+    persist_dir = request.persist_dir or rag_indexer.DEFAULT_PERSIST_DIR
+    try:
+        return await run_blocking(rag_indexer.rollback, persist_dir, request.version)
+    except index_snapshots.SnapshotError as error:
+        raise HTTPException(status_code=404, detail=str(error)) from error
+    except rag_indexer.IndexBusyError as error:
+        raise HTTPException(status_code=409, detail=str(error)) from error
+
+
+async def _reindex_private_documents(business_id: str) -> Dict[str, Any]:
+    # Answers cached for this business may have been built without (or from) the changed file.
+    semantic_cache.invalidate(business_id)
+    return await index_jobs.submit(
+        rag_indexer.DEFAULT_PRIVATE_DOCS_DIR, rag_indexer.DEFAULT_PRIVATE_PERSIST_DIR, partitioned=True
     )
-    return RAGIndexResponse(indexed_chunks=indexed, persist_directory=persist_dir)
+
+
+async def _owns_business(business_id: Optional[str], profile: Optional[Dict[str, Any]]) -> bool:
+    owner_id = (profile or {}).get("id")
+    if not business_id or not owner_id:
+        return False
+    try:
+        return await is_business_owner(business_id, str(owner_id))
+    except Exception as error:
+        logger.warning("Business ownership check failed: %s", error)
+        return False
+
+
+async def _require_business_owner(business_id: str, profile: Dict[str, Any]) -> None:
+    if not await _owns_business(business_id, profile):
+        raise HTTPException(status_code=403, detail="You do not have access to this business.")
+
+
+@app.get("/documents/{business_id}", tags=["Documents"])
+async def private_documents_list(business_id: str, profile: dict = Depends(get_current_profile)):
+    """Files the business has uploaded to its private document index."""
+    await _require_business_owner(business_id, profile)
+    try:
+        return {"items": await run_blocking(private_documents.list_documents, business_id)}
+    except private_documents.DocumentError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+
+
+@app.post("/documents/{business_id}", status_code=202, tags=["Documents"])
+async def private_document_upload(
+    business_id: str, file: UploadFile = File(...), profile: dict = Depends(get_current_profile)
+):
+    """Store a contract, lease or invoice and start indexing it into the business's partition."""
+    await _require_business_owner(business_id, profile)
+    data = await file.read(private_documents.MAX_UPLOAD_BYTES + 1)
+    try:
+        document = await run_blocking(private_documents.save_document, business_id, file.filename, data)
+    except private_documents.DocumentError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    return {"document": document, "job": await _reindex_private_documents(business_id)}
+
+
+@app.delete("/documents/{business_id}/{filename}", tags=["Documents"])
+async def private_document_delete(business_id: str, filename: str, profile: dict = Depends(get_current_profile)):
+    """Remove an uploaded file; its chunks leave the index with the next build."""
+    await _require_business_owner(business_id, profile)
+    try:
+        deleted = await run_blocking(private_documents.delete_document, business_id, filename)
+    except private_documents.DocumentError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Document not found.")
+    return {"deleted": filename, "job": await _reindex_private_documents(business_id)}
 
 
 @app.get("/metrics/timeseries", response_model=models.RagQueryResponse, tags=["Metrics"])
@@ -530,10 +811,13 @@ async def metrics_timeseries(
     date_from = _parse_iso_date(from_)
     date_to = _parse_iso_date(to_)
     start_date, end_date = _resolve_range(date_from, date_to)
-    series, stats = fetch_timeseries(business_id, start_date, end_date)
+    (series, stats), analytics = await asyncio.gather(
+        run_blocking(fetch_timeseries, business_id, start_date, end_date),
+        run_blocking(fetch_analytics, business_id, start_date, end_date),
+    )
 
     if series:
-        answer = await llm_explain_timeseries(series, stats)
+        answer = await _explain_timeseries(series, stats)
         charts = [
             {
                 "type": "timeseries",
@@ -565,57 +849,129 @@ async def metrics_timeseries(
         answer=answer,
         sources=[models.RagSource(**source) for source in sources],
         charts=[models.ChartPayload(**chart) for chart in charts],
-        calculations=_format_calculations(stats),
+        calculations=_format_calculations(stats, analytics),
     )
 
 
+def _ndjson_response(pages, encode: Callable[[dict], dict] = jsonable_encoder) -> StreamingResponse:
+    """Stream a blocking iterator of row pages as NDJSON, one page in memory at a time."""
+
+    async def ndjson_lines():
+        while True:
+            page = await run_blocking(next, pages, None)
+            if page is None:
+                break
+            yield "".join(json.dumps(encode(item), ensure_ascii=False) + "\n" for item in page)
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @app.get("/chat/history", response_model=models.ChatHistoryResponse, tags=["Chat"])
-async def chat_history(business_id: str, limit: int = Query(50, ge=1, le=200)):
-    """Return recent chat messages for the specified business."""
-    items = conversation_service.list_messages(business_id, limit)
-    return {"items": items}
+async def chat_history(
+    business_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    stream: bool = Query(False),
+):
+    """Return chat messages newest first, one keyset page per request.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` for the next page, or
+    use ``stream=true`` to export the whole history as NDJSON.
+    """
+    if stream:
+        return _ndjson_response(iter_messages(business_id))
+    try:
+        return await page_messages(business_id, limit, cursor)
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
+@app.post("/metrics/summary/batch", response_model=MetricsSummaryBatchResponse, tags=["Metrics"])
+async def metrics_summary_batch(payload: MetricsSummaryBatchRequest, stream: bool = Query(False)):
+    """Return 30-day summaries for many businesses (or all of an owner's) in set-based queries.
+
+    With ``stream=true`` the items are written as NDJSON, one chunk of
+    businesses at a time, so very large fleets never sit in memory at once.
+    """
+    if not payload.business_ids and not payload.owner_id:
+        raise HTTPException(status_code=400, detail="business_ids or owner_id is required.")
+
+    if not stream:
+        items = await get_metrics_summaries(payload.business_ids, payload.owner_id)
+        return {"items": items}
+
+    return _ndjson_response(
+        iter_metrics_summaries(payload.business_ids, payload.owner_id),
+        lambda item: jsonable_encoder(MetricsSummaryResponse(**item)),
+    )
 
 
 @app.get("/metrics/{business_id}/summary", response_model=MetricsSummaryResponse, tags=["Metrics"])
 async def metrics_summary(business_id: str):
     """Return the 30-day aggregated metrics for a business."""
-    return get_metrics_summary(business_id)
+    return await get_metrics_summary(business_id)
 
 
 @app.get("/metrics/{business_id}/daily", response_model=MetricsDailyResponse, tags=["Metrics"])
 async def metrics_daily(business_id: str, limit: int = Query(30, ge=1, le=90)):
     """Return recent daily metrics rows for charts."""
-    return list_metrics_daily(business_id, limit)
+    return await list_metrics_daily(business_id, limit)
+
+
+@app.get("/signals/{business_id}", tags=["Metrics"])
+async def business_signal(business_id: str):
+    """Return the latest Signal Index evaluation (green/orange/red) for a business."""
+    record = await run_blocking(signal_engine.get, business_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Signal not evaluated yet.")
+    return record
 
 
 @app.get("/reviews/{business_id}/summary", response_model=ReviewSummaryResponse, tags=["Reviews"])
 async def review_summary(business_id: str):
-    return get_review_summary(business_id)
+    return await get_review_summary(business_id)
+
+
+@app.get("/reviews/{business_id}/rollup", response_model=ReviewRollupResponse, tags=["Reviews"])
+async def review_rollup(business_id: str):
+    """Summary, rating histogram and monthly buckets from the incrementally maintained rollup."""
+    return await get_review_rollup(business_id)
 
 
 @app.get("/reviews/{business_id}/recent", response_model=ReviewsListResponse, tags=["Reviews"])
 async def review_recent(business_id: str, limit: int = Query(5, ge=1, le=20)):
-    return {"items": list_recent_reviews(business_id, limit)}
+    return {"items": await list_recent_reviews(business_id, limit)}
 
 
 @app.get("/reviews/{business_id}/all", response_model=ReviewsAllResponse, tags=["Reviews"])
-async def review_all(business_id: str, limit: int = Query(100, ge=1, le=200)):
-    return {"items": list_all_reviews(business_id, limit)}
+async def review_all(
+    business_id: str,
+    limit: int = Query(100, ge=1, le=200),
+    cursor: str | None = Query(None),
+    stream: bool = Query(False),
+):
+    """Reviews newest first with keyset pagination; ``stream=true`` exports all as NDJSON."""
+    if stream:
+        return _ndjson_response(iter_reviews(business_id))
+    try:
+        return await page_reviews(business_id, limit, cursor)
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
 
 
 @app.get("/reviews/{business_id}/sources", response_model=ReviewSourceBreakdownResponse, tags=["Reviews"])
 async def review_sources(business_id: str):
-    return {"sources": review_source_breakdown(business_id)}
+    return {"sources": await review_source_breakdown(business_id)}
 
 
 @app.get("/policy/{business_id}/recommendations", response_model=PolicyRecommendationResponse, tags=["Policy"])
 async def policy_recommendations(business_id: str):
-    return {"recommendations": list_policy_recommendations(business_id)}
+    return {"recommendations": await list_policy_recommendations(business_id)}
 
 
 @app.get("/policy/{business_id}/applications", response_model=PolicyWorkflowResponse, tags=["Policy"])
 async def policy_applications(business_id: str):
-    return {"workflows": list_policy_workflows(business_id)}
+    return {"workflows": await list_policy_workflows(business_id)}
 
 
 @app.get("/policy/products", response_model=models.PolicyProductsResponse, tags=["Policy"])
@@ -624,28 +980,116 @@ async def policy_products(
     q: str | None = Query(None),
     limit: int = Query(20, ge=1, le=100),
 ):
-    groups = list_policy_products(group, q, limit)
+    if policy_index.is_fresh():
+        # Pure in-memory lookup; no need for a worker thread.
+        return {"groups": policy_service.list_policy_products(group, q, limit)}
+    groups = await list_policy_products(group, q, limit)
     return {"groups": groups}
 
 
 @app.post("/business/setup", tags=["Business"])
 async def business_setup(payload: BusinessSetupRequest):
     try:
-        record = upsert_business(
+        record = await upsert_business(
             owner_id=payload.owner_id,
             store_name=payload.store_name,
             business_code=payload.business_code,
             industry=payload.industry,
         )
+        if record.get("id"):
+            context_cache.invalidate(business_id=record["id"])
         return {"business": record}
     except Exception as error:
         raise HTTPException(status_code=400, detail=str(error))
 
 
+@app.get("/admin/cache/context", tags=["Admin"])
+async def context_cache_stats():
+    """Return hit/miss counters for the per-business context cache."""
+    return context_cache.stats()
+
+
+@app.post("/admin/cache/context/invalidate", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def invalidate_context_cache(payload: CacheInvalidateRequest):
+    removed = context_cache.invalidate(business_id=payload.business_id, source=payload.source)
+    return {"removed": removed}
+
+
+@app.get("/admin/llm/pool", tags=["Admin"])
+async def llm_pool_stats():
+    """Report pooled chat model clients and HTTP connection reuse."""
+    return rag_service.llm_pool_stats()
+
+
+@app.get("/admin/cache/llm", tags=["Admin"])
+async def llm_cache_stats():
+    """Report exact-match answer cache hit rate and tokens saved."""
+    return llm_cache.stats()
+
+
+@app.get("/admin/cache/semantic", tags=["Admin"])
+async def semantic_cache_stats():
+    return semantic_cache.stats()
+
+
+@app.get("/admin/cache/embeddings", tags=["Admin"])
+async def embedding_cache_stats():
+    """Report embedding cache hit rate, embedding API calls made and embeddings avoided."""
+    return embedding_cache.stats()
+
+
+@app.get("/admin/rag/retrieval", tags=["Admin"])
+async def rag_retrieval_stats():
+    """Report document searches by retrieval mode and how many skipped the query embedding."""
+    return rag_indexer.retrieval_stats()
+
+
+@app.post("/admin/data-jobs/completed", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def data_job_completed(payload: DataJobEvent):
+    """Webhook for finished `data_jobs` ingestions; drops the cached source they refresh."""
+    if not payload.finished_at and payload.status not in ("success", "completed"):
+        return {"removed": 0}
+    source = source_for_job(payload.job_type)
+    removed = context_cache.invalidate(business_id=payload.business_id, source=source)
+    if source == "policies":
+        policy_index.invalidate()
+    return {"removed": removed}
+
+
+@app.post("/admin/policy-index/refresh", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def refresh_policy_index():
+    products = await run_blocking(policy_index.refresh)
+    return {"products": products, **policy_index.stats()}
+
+
+@app.get("/admin/policy-index", tags=["Admin"])
+async def policy_index_stats():
+    return policy_index.stats()
+
+
+@app.post("/admin/policy-recommendations/rebuild", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def rebuild_policy_recommendations(k: int = Query(3, ge=1, le=20)):
+    """Re-run eligibility matching for every business against the whole catalog."""
+    report = await run_blocking(rebuild_recommendations, k)
+    context_cache.invalidate(source="policies")
+    return report
+
+
+@app.post("/admin/signals/recompute", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def recompute_signals(full: bool = Query(False)):
+    """Re-evaluate the Signal Index for businesses whose metrics changed since the last run."""
+    return await run_blocking(signal_engine.run, full)
+
+
 @app.websocket("/ws/chat")
 async def websocket_endpoint(websocket: WebSocket):
-    """Initiates a WebSocket connection for real-time chat streaming."""
+    """Initiates a WebSocket connection for real-time chat streaming.
+
+    A ``token`` query parameter identifies the caller; without one the chat
+    still works but never reads the business's private documents.
+    """
     await websocket.accept()
+    profile = decode_profile(websocket.query_params.get("token"))
     logger.info(json.dumps({"event": "ws_open"}, ensure_ascii=False))
 
     try:
@@ -660,6 +1104,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 )
                 continue
 
+            ws_started = time.perf_counter()
             biz_id = websocket.query_params.get("business_id") or payload.get("business_id")
             logger.info(
                 json.dumps(
@@ -675,7 +1120,22 @@ async def websocket_endpoint(websocket: WebSocket):
             )
 
             try:
-                response = await rag_query(request_model, business_id=biz_id)
+                async with ChunkStreamer(websocket.send_json) as streamer:
+                    response = await _run_rag_query(
+                        request_model, business_id=biz_id, on_chunk=streamer.push, profile=profile
+                    )
+                logger.info(
+                    json.dumps(
+                        {
+                            "event": "ws_stream",
+                            "frames": streamer.frames_sent,
+                            "ttft_ms": round((streamer.first_frame_at - ws_started) * 1000, 2)
+                            if streamer.first_frame_at
+                            else None,
+                        },
+                        ensure_ascii=False,
+                    )
+                )
                 await websocket.send_json(
                     {
                         "type": "final",
@@ -702,20 +1162,62 @@ async def websocket_endpoint(websocket: WebSocket):
 
 
 @app.get("/alerts/sse")
-async def sse_alerts():
-    """Server-Sent Events endpoint for real-time alerts."""
+async def sse_alerts(
+    business_id: str | None = Query(None),
+    last_event_id: str | None = Query(None),
+    last_event_header: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """Server-Sent Events endpoint for real-time alerts.
+
+    Events come from the in-process alert hub; reconnecting clients resume
+    from ``Last-Event-ID`` (header, or query parameter for manual reconnects).
+    """
 
     async def event_generator():
-        i = 0
         try:
-            while True:
-                # In a real application, you would check for new alerts from a database or message queue.
-                # For this example, we'll just send a dummy alert every few seconds.
-                await asyncio.sleep(5)
-                i += 1
-                yield f"data: {json.dumps({'id': f'alert-{i}', 'message': f'This is alert number {i}'})}" + "\n\n"
+            async for frame in alert_hub.stream(
+                business_id,
+                last_event_id=last_event_header or last_event_id,
+                heartbeat=ALERT_HEARTBEAT_SECONDS,
+            ):
+                yield frame
         except asyncio.CancelledError:
             logger.info(json.dumps({"event": "sse_closed"}, ensure_ascii=False))
             raise
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/alerts/{business_id}/recent", tags=["Alerts"])
+async def recent_alerts(business_id: str, limit: int = Query(20, ge=1, le=200)):
+    """Polling fallback: the most recent alerts still held for a business."""
+    return {"items": alert_hub.recent(business_id, limit)}
+
+
+@app.post("/admin/alerts/publish", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def publish_alert(payload: AlertPublishRequest):
+    event = alert_hub.publish(payload.business_id, payload.alert_type, payload.message)
+    return {"event": event}
+
+
+@app.get("/admin/alerts/hub", tags=["Admin"])
+async def alert_hub_stats():
+    return alert_hub.stats()
+
+
+@app.get("/admin/alerts/scheduler", tags=["Admin"])
+async def alert_scheduler_stats():
+    """Watermarks plus duration and row counts of the recent incremental alert scans."""
+    return alert_scheduler.stats()
+
+
+@app.post("/admin/alerts/scheduler/run", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def run_alert_scan():
+    try:
+        return await run_blocking(alert_scheduler.run_once)
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=f"Alert scan failed: {error}")
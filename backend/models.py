@@ -85,6 +85,7 @@ class ChatMessage(BaseModel):
 
 class ChatHistoryResponse(BaseModel):
     items: List[ChatMessage]
+    next_cursor: Optional[str] = None
 
 
 class PolicyProduct(BaseModel):
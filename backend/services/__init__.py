@@ -6,6 +6,7 @@ from . import (
     reviews_service,
     business_service,
     supabase_client,
+    aio,
 )
 
 __all__ = [
@@ -16,4 +17,5 @@ __all__ = [
     "reviews_service",
     "business_service",
     "supabase_client",
+    "aio",
 ]
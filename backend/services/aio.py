@@ -0,0 +1,74 @@
+"""Async facade over the blocking Supabase-backed services.
+
+The supabase-py client performs a synchronous HTTP round trip for every
+query. Calling it directly from an ``async def`` route stalls the event loop
+(and every open WebSocket/SSE stream with it), so each service function is
+re-exported here under the same name as a coroutine that runs the original
+call on a bounded thread pool.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any, Awaitable, Callable, TypeVar
+
+from . import (
+    business_service,
+    conversation_service,
+    metrics_service,
+    policy_service,
+    reviews_service,
+)
+
+T = TypeVar("T")
+
+
+def _get_max_workers(default: int = 16) -> int:
+    try:
+        return max(1, int(os.getenv("SUPABASE_MAX_WORKERS", default)))
+    except (TypeError, ValueError):
+        return default
+
+
+_executor = ThreadPoolExecutor(max_workers=_get_max_workers(), thread_name_prefix="supabase-io")
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the shared Supabase I/O pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def _async_proxy(module: ModuleType, name: str) -> Callable[..., Awaitable[Any]]:
+    # Resolve the target at call time so monkeypatched service functions are honoured.
+    target = getattr(module, name)
+
+    @functools.wraps(target)
+    async def _proxy(*args: Any, **kwargs: Any) -> Any:
+        return await run_blocking(getattr(module, name), *args, **kwargs)
+
+    return _proxy
+
+
+get_metrics_summary = _async_proxy(metrics_service, "get_metrics_summary")
+list_metrics_daily = _async_proxy(metrics_service, "list_metrics_daily")
+get_metrics_summaries = _async_proxy(metrics_service, "get_metrics_summaries")
+
+get_review_summary = _async_proxy(reviews_service, "get_review_summary")
+get_review_rollup = _async_proxy(reviews_service, "get_review_rollup")
+list_recent_reviews = _async_proxy(reviews_service, "list_recent_reviews")
+list_all_reviews = _async_proxy(reviews_service, "list_all_reviews")
+page_reviews = _async_proxy(reviews_service, "page_reviews")
+review_source_breakdown = _async_proxy(reviews_service, "review_source_breakdown")
+
+list_policy_recommendations = _async_proxy(policy_service, "list_policy_recommendations")
+list_policy_workflows = _async_proxy(policy_service, "list_policy_workflows")
+list_policy_products = _async_proxy(policy_service, "list_policy_products")
+
+upsert_business = _async_proxy(business_service, "upsert_business")
+is_business_owner = _async_proxy(business_service, "is_business_owner")
+
+log_message = _async_proxy(conversation_service, "log_message")
+list_messages = _async_proxy(conversation_service, "list_messages")
+page_messages = _async_proxy(conversation_service, "page_messages")
@@ -0,0 +1,221 @@
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+BROADCAST = "*"
+
+ALERT_TYPES = {
+    "new_policy": ("New Policy", "medium"),
+    "signal_change": ("Signal Change", "high"),
+    "settlement_delay": ("Settlement Delay", "high"),
+    "system": ("System Message", "low"),
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class Subscription:
+    """One SSE connection: a bounded queue plus the channels it listens on."""
+
+    __slots__ = ("channels", "queue", "dropped")
+
+    def __init__(self, channels: tuple, queue_size: int):
+        self.channels = channels
+        self.queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+class AlertHub:
+    """In-process pub/sub for alerts (docs/phase-4/alert-spec.md).
+
+    Producers call ``publish`` once; the hub fans the event out to every
+    subscriber of the business (and of ``BROADCAST``) through bounded
+    per-connection queues. A subscriber whose queue is full is disconnected
+    rather than buffered, and reconnecting clients resume from the per-business
+    ring buffer using ``Last-Event-ID``. Idle connections cost one queue and
+    no background task.
+    """
+
+    def __init__(self, *, queue_size: int = 64, replay_size: int = 200):
+        self.queue_size = queue_size
+        self.replay_size = replay_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._history: Dict[str, Deque[Dict[str, Any]]] = {}
+        # Microsecond-seeded ids keep Last-Event-ID monotonic across restarts.
+        self._ids = itertools.count(time.time_ns() // 1000)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    # --- producers -------------------------------------------------------------
+
+    def publish(
+        self,
+        business_id: Optional[str],
+        alert_type: str,
+        message: str,
+        **payload: Any,
+    ) -> Dict[str, Any]:
+        """Record an alert and fan it out; safe to call from worker threads."""
+        label, priority = ALERT_TYPES.get(alert_type, (alert_type, "low"))
+        channel = business_id or BROADCAST
+        with self._lock:
+            event = {
+                "id": str(next(self._ids)),
+                "type": label,
+                "priority": priority,
+                "businessId": business_id,
+                "message": message,
+                "createdAt": datetime.now(timezone.utc).isoformat(),
+                **payload,
+            }
+            history = self._history.get(channel)
+            if history is None:
+                history = self._history[channel] = deque(maxlen=self.replay_size)
+            history.append(event)
+            self.published += 1
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and running is self._loop:
+            self._fan_out(channel, event)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._fan_out, channel, event)
+        return event
+
+    def _fan_out(self, channel: str, event: Dict[str, Any]) -> None:
+        # Business subscribers are also members of BROADCAST, so one set per channel suffices.
+        for subscription in list(self._subscribers.get(channel, ())):
+            try:
+                subscription.queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def _drop(self, subscription: Subscription) -> None:
+        subscription.dropped = True
+        self.dropped += 1
+        self._detach(subscription)
+        queue = subscription.queue
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    # --- subscribers -----------------------------------------------------------
+
+    def subscribe(self, business_id: Optional[str]) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        channels = (business_id, BROADCAST) if business_id else (BROADCAST,)
+        subscription = Subscription(channels, self.queue_size)
+        for channel in channels:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def _detach(self, subscription: Subscription) -> None:
+        for channel in subscription.channels:
+            members = self._subscribers.get(channel)
+            if members is None:
+                continue
+            members.discard(subscription)
+            if not members:
+                del self._subscribers[channel]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._detach(subscription)
+
+    def replay(self, business_id: Optional[str], last_event_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Events newer than ``last_event_id`` still held in the ring buffers."""
+        try:
+            after = int(last_event_id) if last_event_id else None
+        except ValueError:
+            after = None
+        if after is None:
+            return []
+        channels = (business_id, BROADCAST) if business_id else (BROADCAST,)
+        with self._lock:
+            events = [
+                event
+                for channel in channels
+                for event in self._history.get(channel, ())
+                if int(event["id"]) > after
+            ]
+        return sorted(events, key=lambda event: int(event["id"]))
+
+    def recent(self, business_id: Optional[str], limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            history = list(self._history.get(business_id or BROADCAST, ()))
+        return history[-limit:][::-1]
+
+    async def stream(
+        self,
+        business_id: Optional[str],
+        *,
+        last_event_id: Optional[str] = None,
+        heartbeat: float = 15.0,
+    ) -> AsyncIterator[str]:
+        """Yield SSE frames for one connection until the client leaves or is dropped."""
+        subscription = self.subscribe(business_id)
+        backlog = self.replay(business_id, last_event_id)
+        replayed_up_to = int(backlog[-1]["id"]) if backlog else 0
+        getter: Optional[asyncio.Future] = None
+        try:
+            yield "retry: 3000\n\n"
+            for event in backlog:
+                yield format_sse(event)
+            while True:
+                # asyncio.wait (unlike wait_for) never swallows a disconnect's
+                # cancellation, and a pending getter survives heartbeats.
+                if getter is None:
+                    getter = asyncio.ensure_future(subscription.queue.get())
+                done, _ = await asyncio.wait((getter,), timeout=heartbeat)
+                if not done:
+                    yield ": keepalive\n\n"
+                    continue
+                event, getter = getter.result(), None
+                if event is None:
+                    return
+                if int(event["id"]) <= replayed_up_to:
+                    continue  # already sent from the ring buffer
+                yield format_sse(event)
+        finally:
+            if getter is not None:
+                getter.cancel()
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        connections = set()
+        for members in self._subscribers.values():
+            connections.update(members)
+        return {
+            "connections": len(connections),
+            "channels": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "replay_channels": len(self._history),
+        }
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: new_alert\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+alert_hub = AlertHub(
+    queue_size=_env_int("ALERT_QUEUE_SIZE", 64),
+    replay_size=_env_int("ALERT_REPLAY_SIZE", 200),
+)
@@ -36,3 +36,15 @@ def upsert_business(
         supabase.table("businesses").update({"owner_id": owner_id}).eq("id", data.get("id")).execute()
 
     return data or {}
+
+
+def is_business_owner(business_id: str, owner_id: str) -> bool:
+    response = (
+        supabase.table("businesses")
+        .select("id")
+        .eq("id", business_id)
+        .eq("owner_id", owner_id)
+        .limit(1)
+        .execute()
+    )
+    return bool(response.data)
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+SendFrame = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class SlowClientError(RuntimeError):
+    """Raised when a client stops accepting stream frames within the send timeout."""
+
+
+class ChunkStreamer:
+    """Forward LLM token chunks to a client as small coalesced frames.
+
+    The first chunk is sent immediately to keep time-to-first-token low. Later
+    chunks are buffered until ``min_chars`` characters or ``max_delay`` seconds
+    have accumulated. Frames go through a queue of at most ``max_pending``
+    entries, so a client that reads slowly pauses the producer (backpressure)
+    instead of growing memory, and a client that accepts nothing for
+    ``send_timeout`` seconds aborts the stream with ``SlowClientError``.
+    """
+
+    def __init__(
+        self,
+        send: SendFrame,
+        *,
+        min_chars: int = 24,
+        max_delay: float = 0.05,
+        max_pending: int = 32,
+        send_timeout: float = 10.0,
+    ):
+        self._send = send
+        self.min_chars = min_chars
+        self.max_delay = max_delay
+        self.send_timeout = send_timeout
+        self._queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=max_pending)
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self._last_flush = 0.0
+        self._frames_queued = 0
+        self._sender: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        self.frames_sent = 0
+        self.first_frame_at: Optional[float] = None
+
+    async def __aenter__(self) -> "ChunkStreamer":
+        self._last_flush = time.perf_counter()
+        self._sender = asyncio.create_task(self._drain())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def push(self, content: str) -> None:
+        if self._error:
+            raise self._error
+        if not content:
+            return
+        self._buffer.append(content)
+        self._buffered_chars += len(content)
+        now = time.perf_counter()
+        if (
+            self._frames_queued == 0
+            or self._buffered_chars >= self.min_chars
+            or now - self._last_flush >= self.max_delay
+        ):
+            await self._flush(now)
+
+    async def close(self) -> None:
+        if self._sender is None:
+            return
+        if self._buffer and not self._error:
+            await self._flush(time.perf_counter())
+        await self._queue.put(None)
+        await self._sender
+        self._sender = None
+        if self._error:
+            raise self._error
+
+    async def _flush(self, now: float) -> None:
+        frame = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_chars = 0
+        self._last_flush = now
+        self._frames_queued += 1
+        await self._queue.put(frame)
+
+    async def _drain(self) -> None:
+        while True:
+            frame = await self._queue.get()
+            if frame is None:
+                return
+            if self._error:
+                continue  # keep draining so producers never block on a dead client
+            try:
+                await asyncio.wait_for(
+                    self._send({"type": "chunk", "content": frame}),
+                    timeout=self.send_timeout,
+                )
+            except asyncio.TimeoutError:
+                self._error = SlowClientError("Client did not accept stream frames in time.")
+                continue
+            except Exception as error:
+                self._error = error
+                continue
+            self.frames_sent += 1
+            if self.first_frame_at is None:
+                self.first_frame_at = time.perf_counter()
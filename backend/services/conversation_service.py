@@ -0,0 +1,46 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+from .pagination import apply_keyset, iter_pages, page_from_rows
+from .supabase_client import supabase
+
+
+def log_message(
+    business_id: str,
+    role: str,
+    message: str,
+    user_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    payload = {
+        "business_id": business_id,
+        "role": role,
+        "message": message,
+        "user_id": user_id,
+    }
+    payload = {k: v for k, v in payload.items() if v is not None}
+    response = supabase.table("conversation_logs").insert(payload).execute()
+    data = response.data or []
+    if isinstance(data, list):
+        return data[0] if data else {}
+    return data
+
+
+EXPORT_PAGE_SIZE = 500
+
+
+def page_messages(business_id: str, limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Newest-first page served by ``conversation_logs_business_created_idx``."""
+    builder = (
+        supabase.table("conversation_logs")
+        .select("id, business_id, user_id, role, message, created_at")
+        .eq("business_id", business_id)
+    )
+    response = apply_keyset(builder, "created_at", cursor).limit(limit + 1).execute()
+    return page_from_rows(response.data or [], limit, "created_at")
+
+
+def list_messages(business_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+    return page_messages(business_id, limit)["items"]
+
+
+def iter_messages(business_id: str, page_size: int = EXPORT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    return iter_pages(lambda limit, cursor: page_messages(business_id, limit, cursor), page_size)
@@ -0,0 +1,268 @@
+"""Content-addressed cache of text embeddings.
+
+Vectors are keyed by the embedding model and a SHA-256 of the text, so the
+indexer, document search and the semantic answer cache share every embedding
+they have ever paid for. Each model gets a float16 matrix file that is
+memory-mapped (half the size of float32, and only touched pages are read)
+plus an append-only file of 16-byte key digests whose order matches the
+matrix rows. Only document texts are written to disk: query strings are
+unbounded in number, so ``embed_query`` keeps its vectors in the in-memory LRU
+alone. Misses are embedded in batches bounded by both item count and total
+characters.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from langchain_openai import OpenAIEmbeddings  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    OpenAIEmbeddings = None
+
+EmbedManyFn = Callable[[str, List[str]], List[Sequence[float]]]
+
+KEY_BYTES = 16
+INITIAL_ROWS = 1024
+
+
+def _get_int(env_name: str, default: int) -> int:
+    try:
+        return int(os.getenv(env_name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def default_model() -> str:
+    return os.getenv("RAG_EMBEDDING_MODEL", "text-embedding-3-small")
+
+
+_clients: Dict[str, Any] = {}
+
+
+def openai_embed_many(model: str, texts: List[str]) -> List[Sequence[float]]:
+    if OpenAIEmbeddings is None:
+        raise RuntimeError("OpenAIEmbeddings is unavailable; install langchain_openai")
+    client = _clients.get(model)
+    if client is None:
+        client = _clients[model] = OpenAIEmbeddings(model=model)
+    return client.embed_documents(texts)
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()[:KEY_BYTES]
+
+
+class _ModelStore:
+    """Rows of one model's vectors on disk; every method runs under the cache lock."""
+
+    def __init__(self, directory: Optional[str], model: str):
+        self.directory = directory
+        self.slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+        self.rows: Dict[bytes, int] = {}
+        self.dim: Optional[int] = None
+        self.matrix: Optional[np.ndarray] = None
+        self.count = 0
+        if directory:
+            self._load()
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.directory, f"{self.slug}.{suffix}")
+
+    def _load(self) -> None:
+        try:
+            with open(self._path("json"), encoding="utf-8") as handle:
+                self.dim = int(json.load(handle)["dim"])
+            with open(self._path("keys"), "rb") as handle:
+                keys = handle.read()
+            capacity = os.path.getsize(self._path("f16")) // (2 * self.dim)
+        except (OSError, ValueError, KeyError):
+            self.dim = None
+            return
+        # Keys are appended only after their vectors are flushed, so any row
+        # without a key is an interrupted write and is simply overwritten. A
+        # torn key record is cut off so the next key lands on its own row.
+        self.count = min(len(keys) // KEY_BYTES, capacity)
+        if len(keys) != self.count * KEY_BYTES:
+            with open(self._path("keys"), "r+b") as handle:
+                handle.truncate(self.count * KEY_BYTES)
+        self.rows = {keys[i * KEY_BYTES:(i + 1) * KEY_BYTES]: i for i in range(self.count)}
+        self.matrix = np.memmap(self._path("f16"), dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+
+    def _reserve(self, extra: int) -> None:
+        capacity = 0 if self.matrix is None else self.matrix.shape[0]
+        needed = self.count + extra
+        if needed <= capacity:
+            return
+        new_capacity = max(INITIAL_ROWS, capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+        if not self.directory:
+            grown = np.zeros((new_capacity, self.dim), dtype=np.float16)
+            if self.matrix is not None:
+                grown[: self.count] = self.matrix[: self.count]
+            self.matrix = grown
+            return
+        if self.matrix is not None:
+            self.matrix.flush()
+        self.matrix = None
+        with open(self._path("f16"), "ab") as handle:
+            handle.truncate(new_capacity * self.dim * 2)
+        self.matrix = np.memmap(self._path("f16"), dtype=np.float16, mode="r+", shape=(new_capacity, self.dim))
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        if row is None:
+            return None
+        return np.asarray(self.matrix[row], dtype=np.float32)
+
+    def add(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self._path("json"), "w", encoding="utf-8") as handle:
+                    json.dump({"dim": self.dim}, handle)
+                open(self._path("keys"), "wb").close()
+        fresh = [(key, vector) for key, vector in zip(keys, vectors) if key not in self.rows]
+        if not fresh:
+            return
+        self._reserve(len(fresh))
+        start = self.count
+        self.matrix[start:start + len(fresh)] = np.stack([vector for _, vector in fresh]).astype(np.float16)
+        if self.directory:
+            self.matrix.flush()
+            with open(self._path("keys"), "r+b") as handle:
+                handle.seek(start * KEY_BYTES)
+                handle.write(b"".join(key for key, _ in fresh))
+                handle.truncate()
+        for offset, (key, _) in enumerate(fresh):
+            self.rows[key] = start + offset
+        self.count += len(fresh)
+
+    def disk_bytes(self) -> int:
+        return 0 if self.matrix is None else self.count * self.dim * 2
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        directory: Optional[str],
+        embed_many: Optional[EmbedManyFn] = None,
+        *,
+        max_memory_entries: int = 1024,
+        batch_size: int = 96,
+        batch_max_chars: int = 200_000,
+    ):
+        self.directory = directory
+        self.embed_many = embed_many or openai_embed_many
+        self.max_memory_entries = max_memory_entries
+        self.batch_size = max(1, batch_size)
+        self.batch_max_chars = max(1, batch_max_chars)
+        self._stores: Dict[str, _ModelStore] = {}
+        self._memory: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "embedding_calls": 0, "texts_embedded": 0}
+
+    def _store(self, model: str) -> _ModelStore:
+        store = self._stores.get(model)
+        if store is None:
+            store = self._stores[model] = _ModelStore(self.directory, model)
+        return store
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        batches: List[List[str]] = []
+        current: List[str] = []
+        chars = 0
+        for text in texts:
+            if current and (len(current) >= self.batch_size or chars + len(text) > self.batch_max_chars):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(text)
+            chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    def embed(self, texts: Sequence[str], model: Optional[str] = None, *, persist: bool = True) -> np.ndarray:
+        """Embeddings for ``texts`` as a float32 ``(len(texts), dim)`` matrix.
+
+        With ``persist=False`` fresh vectors are returned without being added
+        to the disk store.
+        """
+        model = model or default_model()
+        keys = [text_key(text) for text in texts]
+        found: Dict[bytes, np.ndarray] = {}
+        missing: Dict[bytes, str] = {}
+        with self._lock:
+            store = self._store(model)
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                vector = self._memory.get((model, key))
+                if vector is not None:
+                    self._memory.move_to_end((model, key))
+                    self._stats["memory_hits"] += 1
+                    found[key] = vector
+                    continue
+                vector = store.get(key)
+                if vector is not None:
+                    self._stats["disk_hits"] += 1
+                    found[key] = vector
+                    continue
+                self._stats["misses"] += 1
+                missing[key] = text
+
+        if missing:
+            pending = list(missing.items())
+            offset = 0
+            for batch in self._batches([text for _, text in pending]):
+                vectors = np.asarray(self.embed_many(model, batch), dtype=np.float32)
+                batch_keys = [key for key, _ in pending[offset:offset + len(batch)]]
+                offset += len(batch)
+                with self._lock:
+                    self._stats["embedding_calls"] += 1
+                    self._stats["texts_embedded"] += len(batch)
+                    if persist:
+                        self._store(model).add(batch_keys, vectors)
+                found.update(zip(batch_keys, vectors))
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def embed_query(self, text: str, model: Optional[str] = None) -> np.ndarray:
+        """One embedding, cached in the memory LRU only; every distinct query would otherwise grow the disk store."""
+        model = model or default_model()
+        vector = self.embed([text], model, persist=False)[0]
+        with self._lock:
+            self._memory[(model, text_key(text))] = vector
+            self._memory.move_to_end((model, text_key(text)))
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+        return vector
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = sum(store.count for store in self._stores.values())
+            stats["disk_bytes"] = sum(store.disk_bytes() for store in self._stores.values())
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["embeddings_avoided"] = hits
+        return stats
+
+
+embedding_cache = EmbeddingCache(
+    os.getenv("EMBEDDING_CACHE_DIR", "data/embeddings"),
+    max_memory_entries=_get_int("EMBEDDING_CACHE_MAX_ENTRIES", 1024),
+    batch_size=_get_int("EMBEDDING_BATCH_SIZE", 96),
+    batch_max_chars=_get_int("EMBEDDING_BATCH_MAX_CHARS", 200_000),
+)
@@ -0,0 +1,208 @@
+"""Exact-match cache for LLM answers.
+
+Answers are keyed by a SHA-256 of the model, system prompt, ordered context
+strings, query and data tag (the latest data date the answer was built from),
+so a new ingestion naturally produces new keys. Hot entries live in an
+in-memory LRU; every entry is also written to a small SQLite file so the cache
+survives restarts.
+
+Async callers use ``aget``/``aset``: memory hits are answered inline, while
+SQLite reads, writes and token counting run on the ``services.aio`` pool. A
+cache failure is logged and treated as a miss; it never fails a generation.
+Expired rows are pruned at most once per ``prune_interval``.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .aio import run_blocking
+
+try:
+    import tiktoken  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    tiktoken = None
+
+logger = logging.getLogger("foodbiz.ai")
+
+
+def _get_float(env_name: str, default: float) -> float:
+    try:
+        return float(os.getenv(env_name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def count_tokens(text: str) -> int:
+    if tiktoken is not None:
+        try:
+            return len(tiktoken.get_encoding("cl100k_base").encode(text))
+        except Exception:  # pragma: no cover - encoding download may fail offline
+            pass
+    # Rough fallback: Korean text averages about two characters per token.
+    return max(1, len(text) // 2)
+
+
+def make_key(
+    model: str,
+    system_prompt: Optional[str],
+    contexts: Optional[Iterable[str]],
+    query: str,
+    data_tag: Optional[str] = None,
+) -> str:
+    payload = json.dumps(
+        [model, system_prompt or "", list(contexts or []), query, data_tag or ""],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMAnswerCache:
+    def __init__(
+        self,
+        path: Optional[str],
+        max_memory_entries: int = 512,
+        ttl: float = 24 * 60 * 60,
+        prune_interval: float = 10 * 60,
+    ):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        self._pruned_at = 0.0
+        self._memory: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "tokens_saved": 0}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "create table if not exists llm_answers ("
+                " key text primary key, response text not null,"
+                " tokens integer not null, expires_at real not null)"
+            )
+            self._conn.execute("create index if not exists llm_answers_expires_idx on llm_answers (expires_at)")
+        return self._conn
+
+    def _remember(self, key: str, expires_at: float, response: str, tokens: int) -> None:
+        self._memory[key] = (expires_at, response, tokens)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry and entry[0] > now:
+            self._memory.move_to_end(key)
+            self._stats["memory_hits"] += 1
+            self._stats["tokens_saved"] += entry[2]
+            return entry[1]
+        if entry:
+            del self._memory[key]
+        return None
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            cached = self._memory_get(key, now)
+            if cached is not None:
+                return cached
+
+            conn = self._connection()
+            row = None
+            if conn is not None:
+                row = conn.execute(
+                    "select response, tokens, expires_at from llm_answers where key = ? and expires_at > ?",
+                    (key, now),
+                ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            response, tokens, expires_at = row
+            self._remember(key, expires_at, response, tokens)
+            self._stats["disk_hits"] += 1
+            self._stats["tokens_saved"] += tokens
+            return response
+
+    def set(self, key: str, response: str) -> None:
+        if not response or self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        tokens = count_tokens(response)
+        with self._lock:
+            self._remember(key, expires_at, response, tokens)
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    "insert or replace into llm_answers (key, response, tokens, expires_at) values (?, ?, ?, ?)",
+                    (key, response, tokens, expires_at),
+                )
+                now = time.time()
+                if now - self._pruned_at >= self.prune_interval:
+                    conn.execute("delete from llm_answers where expires_at <= ?", (now,))
+                    self._pruned_at = now
+                conn.commit()
+
+    async def aget(self, key: str) -> Optional[str]:
+        """``get`` without blocking the event loop; errors count as a miss."""
+        with self._lock:
+            cached = self._memory_get(key, time.time())
+        if cached is not None:
+            return cached
+        try:
+            return await run_blocking(self.get, key)
+        except Exception as error:
+            logger.warning("LLM cache read failed: %s", error)
+            return None
+
+    async def aset(self, key: str, response: str) -> None:
+        """``set`` without blocking the event loop; errors are logged, not raised."""
+        try:
+            await run_blocking(self.set, key, response)
+        except Exception as error:
+            logger.warning("LLM cache write failed: %s", error)
+
+    async def get_or_generate(self, key: str, generate: Callable[[], Awaitable[str]]) -> str:
+        cached = await self.aget(key)
+        if cached is not None:
+            return cached
+        response = await generate()
+        await self.aset(key, response)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+
+async def replay_stream(text: str, chunk_chars: int = 16) -> AsyncGenerator[Dict[str, Any], None]:
+    """Replay a cached answer as ``chunk`` events so streaming clients see no difference."""
+    for start in range(0, len(text), chunk_chars):
+        yield {"type": "chunk", "content": text[start:start + chunk_chars]}
+        await asyncio.sleep(0)
+
+
+llm_cache = LLMAnswerCache(
+    os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite3"),
+    max_memory_entries=int(_get_float("LLM_CACHE_MAX_ENTRIES", 512)),
+    ttl=_get_float("LLM_CACHE_TTL", 24 * 60 * 60),
+)
@@ -1,31 +1,27 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from .supabase_client import supabase
 
 DATA_DELAY_NOTICE = "국세청 홈택스 연동으로 1~2일 지연될 수 있어요."
 
+# Business ids per metrics_summary_batch RPC call; keeps request bodies small.
+BATCH_CHUNK_SIZE = 500
 
-def get_metrics_summary(business_id: str) -> Dict[str, Any]:
-    """Fetch aggregated metrics for a given business from Supabase."""
-    response = supabase.rpc("metrics_latest_summary", {"target_business": business_id}).execute()
-    data: Optional[Dict[str, Any]] = None
-    if isinstance(response.data, list) and response.data:
-        data = response.data[0]
-    elif isinstance(response.data, dict):
-        data = response.data
 
-    if not data:
-        return {
-            "business_id": business_id,
-            "latest_date": None,
-            "gross_sales": 0,
-            "net_sales": 0,
-            "cost_of_goods": 0,
-            "profit": 0,
-            "settlement_delay": 0,
-            "data_delay_notice": DATA_DELAY_NOTICE,
-        }
+def _empty_summary(business_id: str) -> Dict[str, Any]:
+    return {
+        "business_id": business_id,
+        "latest_date": None,
+        "gross_sales": 0,
+        "net_sales": 0,
+        "cost_of_goods": 0,
+        "profit": 0,
+        "settlement_delay": 0,
+        "data_delay_notice": DATA_DELAY_NOTICE,
+    }
+
 
+def _summary_from_row(data: Dict[str, Any], business_id: str) -> Dict[str, Any]:
     return {
         "business_id": data.get("business_id", business_id),
         "latest_date": data.get("latest_date"),
@@ -38,6 +34,64 @@ def get_metrics_summary(business_id: str) -> Dict[str, Any]:
     }
 
 
+def get_metrics_summary(business_id: str) -> Dict[str, Any]:
+    """Fetch aggregated metrics for a given business from Supabase."""
+    response = supabase.rpc("metrics_latest_summary", {"target_business": business_id}).execute()
+    data: Optional[Dict[str, Any]] = None
+    if isinstance(response.data, list) and response.data:
+        data = response.data[0]
+    elif isinstance(response.data, dict):
+        data = response.data
+
+    if not data:
+        return _empty_summary(business_id)
+
+    return _summary_from_row(data, business_id)
+
+
+def _fetch_summary_batch(
+    business_ids: Optional[Sequence[str]] = None,
+    owner_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    response = supabase.rpc(
+        "metrics_summary_batch",
+        {"target_businesses": list(business_ids) if business_ids else None, "target_owner": owner_id},
+    ).execute()
+    rows = response.data or []
+    by_id = {str(row.get("business_id")): row for row in rows if row.get("business_id")}
+    if not business_ids:
+        return [_summary_from_row(row, business_id) for business_id, row in by_id.items()]
+    return [
+        _summary_from_row(by_id[business_id], business_id) if business_id in by_id else _empty_summary(business_id)
+        for business_id in business_ids
+    ]
+
+
+def iter_metrics_summaries(
+    business_ids: Optional[Sequence[str]] = None,
+    owner_id: Optional[str] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield summaries chunk by chunk, one set-based RPC per chunk of business ids."""
+    if not business_ids:
+        yield _fetch_summary_batch(owner_id=owner_id)
+        return
+    unique_ids = list(dict.fromkeys(business_ids))
+    for start in range(0, len(unique_ids), chunk_size):
+        yield _fetch_summary_batch(unique_ids[start:start + chunk_size], owner_id)
+
+
+def get_metrics_summaries(
+    business_ids: Optional[Sequence[str]] = None,
+    owner_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch 30-day summaries for many businesses (or every business of an owner)."""
+    results: List[Dict[str, Any]] = []
+    for chunk in iter_metrics_summaries(business_ids, owner_id):
+        results.extend(chunk)
+    return results
+
+
 def list_metrics_daily(business_id: str, limit: int = 30) -> Dict[str, Any]:
     r = (
         supabase.table("metrics_daily")
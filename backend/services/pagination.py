@@ -0,0 +1,83 @@
+"""Keyset pagination helpers for newest-first listings.
+
+Pages are ordered by ``(sort_column desc, id desc)``, matching the
+``(business_id, <timestamp> desc)`` indexes, and the position after the last
+row is handed to clients as an opaque cursor. Each page is a single index
+range scan however deep the client has paged; no OFFSET is involved.
+"""
+import base64
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor this API did not issue."""
+
+
+def encode_cursor(sort_value: Optional[str], row_id: Any) -> str:
+    raw = json.dumps([sort_value, row_id], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[str], Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as error:
+        raise InvalidCursorError("Invalid pagination cursor.") from error
+    if row_id is None or not (sort_value is None or isinstance(sort_value, str)):
+        raise InvalidCursorError("Invalid pagination cursor.")
+    return sort_value, row_id
+
+
+def _quote(value: Any) -> str:
+    # PostgREST logic trees reserve , . : ( ) so timestamps must be quoted.
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def keyset_condition(sort_column: str, sort_value: str, row_id: Any, *, descending: bool = True) -> str:
+    """PostgREST ``or`` filter for rows strictly past ``(sort_value, row_id)``."""
+    op = "lt" if descending else "gt"
+    return (
+        f"{sort_column}.{op}.{_quote(sort_value)},"
+        f"and({sort_column}.eq.{_quote(sort_value)},id.{op}.{_quote(row_id)})"
+    )
+
+
+def apply_keyset(builder: Any, sort_column: str, cursor: Optional[str]) -> Any:
+    """Order newest first and, given a cursor, restrict to rows after it.
+
+    PostgreSQL sorts NULLs first in descending order, so rows without a
+    timestamp form the head of the listing.
+    """
+    builder = builder.order(sort_column, desc=True).order("id", desc=True)
+    if not cursor:
+        return builder
+    sort_value, row_id = decode_cursor(cursor)
+    if sort_value is None:
+        condition = f"and({sort_column}.is.null,id.lt.{_quote(row_id)}),{sort_column}.not.is.null"
+    else:
+        condition = keyset_condition(sort_column, sort_value, row_id)
+    return builder.or_(condition)
+
+
+def page_from_rows(rows: List[Dict[str, Any]], limit: int, sort_column: str) -> Dict[str, Any]:
+    """Trim the ``limit + 1`` probe row and derive ``next_cursor`` from the last item."""
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.get(sort_column), last.get("id"))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def iter_pages(fetch_page, page_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Walk every page of ``fetch_page(limit, cursor)``; memory stays at one page."""
+    cursor = None
+    while True:
+        page = fetch_page(page_size, cursor)
+        if page["items"]:
+            yield page["items"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return
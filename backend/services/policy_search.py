@@ -0,0 +1,206 @@
+"""In-memory full-text index over ``policy_products``.
+
+The catalog is small and rarely changes, so it is loaded once and searched in
+process. Text is split into character bigrams (single characters for one-char
+words), which matches Korean compounds and particles without a morphological
+analyzer: "운전자금" and "운전 자금을" share the bigrams "운전" and "자금".
+Matches are ranked with BM25 weights per field, with a bonus when the query
+appears verbatim in the product name.
+"""
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .supabase_client import supabase
+
+PRODUCT_COLUMNS = "id, name, group_name, limit_amount, interest_rate, term, eligibility, documents, application_method"
+FIELD_WEIGHTS = {"name": 3.0, "eligibility": 1.5, "documents": 1.0, "application_method": 1.0}
+MIN_MATCH_RATIO = 0.5  # share of the query's n-grams a product must contain
+EXACT_NAME_BONUS = 2.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+PAGE_SIZE = 1000
+
+_WORD = re.compile(r"\w+")
+_EMPTY = np.array([], dtype=np.int32)
+
+
+def normalize(text: Optional[str]) -> str:
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+
+def ngrams(text: Optional[str]) -> List[str]:
+    grams: List[str] = []
+    for word in _WORD.findall(normalize(text)):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+class _Snapshot:
+    __slots__ = ("rows", "names", "groups", "postings", "name_postings", "loaded_at")
+
+    def __init__(self, rows: Sequence[Dict[str, Any]]):
+        self.rows = list(rows)
+        self.names = [normalize(row.get("name")) for row in self.rows]
+        self.groups = np.array([row.get("group_name") for row in self.rows], dtype=object)
+        self.loaded_at = time.monotonic()
+        field_grams = [{field: ngrams(row.get(field)) for field in FIELD_WEIGHTS} for row in self.rows]
+        average = {}
+        for field in FIELD_WEIGHTS:
+            lengths = [len(per_field[field]) for per_field in field_grams]
+            average[field] = (sum(lengths) / len(lengths) if lengths else 0.0) or 1.0
+
+        weights: Dict[str, Dict[int, float]] = defaultdict(dict)
+        in_name: Dict[str, List[int]] = defaultdict(list)
+        for doc, per_field in enumerate(field_grams):
+            for field, grams in per_field.items():
+                if not grams:
+                    continue
+                counts: Dict[str, int] = defaultdict(int)
+                for gram in grams:
+                    counts[gram] += 1
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * len(grams) / average[field])
+                for gram, tf in counts.items():
+                    weight = FIELD_WEIGHTS[field] * tf * (BM25_K1 + 1) / (tf + norm)
+                    weights[gram][doc] = weights[gram].get(doc, 0.0) + weight
+                    if field == "name":
+                        in_name[gram].append(doc)
+
+        # gram -> (doc ids, idf-scaled BM25 weights) so a query is a few array adds.
+        total = len(self.rows)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for gram, docs in weights.items():
+            idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[gram] = (
+                np.fromiter(docs.keys(), dtype=np.int32, count=len(docs)),
+                np.fromiter(docs.values(), dtype=np.float64, count=len(docs)) * idf,
+            )
+        self.name_postings = {gram: np.array(docs, dtype=np.int32) for gram, docs in in_name.items()}
+
+
+class PolicySearchIndex:
+    def __init__(self, ttl: float = 3600.0):
+        self.ttl = ttl
+        self._snapshot: Optional[_Snapshot] = None
+        self._stale = True
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.refreshes = 0
+
+    # --- lifecycle -------------------------------------------------------------
+
+    def build(self, rows: Sequence[Dict[str, Any]]) -> None:
+        snapshot = _Snapshot(rows)
+        self._snapshot = snapshot  # single reference swap; readers never see a half-built index
+        self._stale = False
+        self.refreshes += 1
+
+    def refresh(self) -> int:
+        """Reload the catalog from Supabase and swap in a fresh index."""
+        with self._lock:
+            rows: List[Dict[str, Any]] = []
+            offset = 0
+            while True:
+                page = (
+                    supabase.table("policy_products")
+                    .select(PRODUCT_COLUMNS)
+                    .order("group_name", desc=False)
+                    .range(offset, offset + PAGE_SIZE - 1)
+                    .execute()
+                    .data
+                    or []
+                )
+                rows.extend(page)
+                if len(page) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
+            self.build(rows)
+            return len(rows)
+
+    def invalidate(self) -> None:
+        """Change signal: the next search reloads the catalog."""
+        self._stale = True
+
+    def is_fresh(self) -> bool:
+        snapshot = self._snapshot
+        return (
+            snapshot is not None
+            and not self._stale
+            and time.monotonic() - snapshot.loaded_at < self.ttl
+        )
+
+    def ensure_fresh(self) -> None:
+        if not self.is_fresh():
+            self.refresh()
+
+    # --- queries ---------------------------------------------------------------
+
+    def search(
+        self,
+        query_text: Optional[str] = None,
+        group_name: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+        self.searches += 1
+        if not query_text or not query_text.strip():
+            rows = [row for row in snapshot.rows if not group_name or row.get("group_name") == group_name]
+            return rows[:limit] if limit else rows
+
+        grams = set(ngrams(query_text))
+        if not grams:
+            return []
+        total = len(snapshot.rows)
+        scores = np.zeros(total)
+        hits = np.zeros(total, dtype=np.int32)
+        name_hits = np.zeros(total, dtype=np.int32)
+        for gram in grams:
+            posting = snapshot.postings.get(gram)
+            if posting is None:
+                continue
+            docs, weights = posting
+            scores[docs] += weights  # doc ids are unique within a posting list
+            hits[docs] += 1
+            name_hits[snapshot.name_postings.get(gram, _EMPTY)] += 1
+
+        # Only names holding every query gram can contain the phrase verbatim.
+        phrase = normalize(query_text).strip()
+        for doc in np.flatnonzero(name_hits == len(grams)):
+            if phrase in snapshot.names[doc]:
+                scores[doc] += EXACT_NAME_BONUS * len(grams)
+
+        eligible = hits >= max(1, math.ceil(len(grams) * MIN_MATCH_RATIO))
+        if group_name:
+            eligible &= snapshot.groups == group_name
+        candidates = np.flatnonzero(eligible)
+        if limit and candidates.size > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        # Stable tie-break on catalog order (group_name, as loaded).
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [snapshot.rows[doc] for doc in candidates[order]]
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "products": len(snapshot.rows) if snapshot else 0,
+            "grams": len(snapshot.postings) if snapshot else 0,
+            "fresh": self.is_fresh(),
+            "searches": self.searches,
+            "refreshes": self.refreshes,
+        }
+
+
+policy_index = PolicySearchIndex(ttl=float(os.getenv("POLICY_INDEX_TTL", 3600)))
@@ -1,7 +1,11 @@
+import logging
 from typing import Any, Dict, List, Optional
 
+from .policy_search import PRODUCT_COLUMNS, policy_index
 from .supabase_client import supabase
 
+logger = logging.getLogger("foodbiz.ai")
+
 STATUS_COLORS = {
     "진행중": "#1D4ED8",
     "승인": "#15803D",
@@ -81,28 +85,7 @@ def list_policy_workflows(business_id: str) -> List[Dict[str, Any]]:
     return workflows
 
 
-def list_policy_products(
-    group_name: str | None = None,
-    query_text: str | None = None,
-    limit: int = 20,
-) -> List[Dict[str, Any]]:
-    builder = supabase.table("policy_products").select(
-        "id, name, group_name, limit_amount, interest_rate, term, eligibility, documents, application_method"
-    )
-    if group_name:
-        builder = builder.eq("group_name", group_name)
-    if query_text:
-        pattern = f"%{query_text}%"
-        builder = builder.or_(
-            "name.ilike.{pattern},eligibility.ilike.{pattern}"
-            .replace("{pattern}", pattern)
-        )
-    if limit:
-        builder = builder.limit(limit)
-
-    response = builder.order("group_name", desc=False).execute()
-    rows = response.data or []
-
+def _group_products(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     grouped: Dict[str, List[Dict[str, Any]]] = {}
     for row in rows:
         group = row.get("group_name") or "기타"
@@ -127,3 +110,38 @@ def list_policy_products(
         {"group_name": group, "products": products}
         for group, products in grouped.items()
     ]
+
+
+def _query_policy_products(
+    group_name: str | None,
+    query_text: str | None,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    builder = supabase.table("policy_products").select(PRODUCT_COLUMNS)
+    if group_name:
+        builder = builder.eq("group_name", group_name)
+    if query_text:
+        pattern = f"%{query_text}%"
+        builder = builder.or_(
+            "name.ilike.{pattern},eligibility.ilike.{pattern}"
+            .replace("{pattern}", pattern)
+        )
+    if limit:
+        builder = builder.limit(limit)
+
+    response = builder.order("group_name", desc=False).execute()
+    return response.data or []
+
+
+def list_policy_products(
+    group_name: str | None = None,
+    query_text: str | None = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """Search the in-memory catalog index, falling back to SQL if it cannot load."""
+    try:
+        policy_index.ensure_fresh()
+    except Exception as error:  # pragma: no cover - Supabase access may fail
+        logger.warning("Policy index refresh failed, querying directly: %s", error)
+        return _group_products(_query_policy_products(group_name, query_text, limit))
+    return _group_products(policy_index.search(query_text, group_name, limit))
@@ -1,5 +1,6 @@
 import os
-from typing import AsyncGenerator, Dict, Any, Iterable, Optional
+import threading
+from typing import AsyncGenerator, Dict, Any, Iterable, Optional, Tuple
 
 try:
     from dotenv import load_dotenv
@@ -26,6 +27,13 @@ except ModuleNotFoundError:  # pragma: no cover
         def __init__(self, *args, **kwargs):
             raise RuntimeError("ChatOpenAI is unavailable; install langchain_openai")
 
+try:
+    import httpx  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    httpx = None
+
+from .llm_cache import llm_cache, make_key, replay_stream
+
 load_dotenv()
 
 
@@ -36,8 +44,12 @@ def _get_temperature(default: float = 0.3) -> float:
         return default
 
 
-def _build_messages(query: str, extra_context: Optional[Iterable[str]] = None):
-    messages = [SystemMessage(content=SYSTEM_PROMPT)]
+def _build_messages(
+    query: str,
+    extra_context: Optional[Iterable[str]] = None,
+    system_prompt: Optional[str] = None,
+):
+    messages = [SystemMessage(content=system_prompt or SYSTEM_PROMPT)]
     if extra_context:
         for context in extra_context:
             if context:
@@ -46,13 +58,83 @@ def _build_messages(query: str, extra_context: Optional[Iterable[str]] = None):
     return messages
 
 
+def get_model_name() -> str:
+    return os.getenv("CHATBOT_MODEL_NAME", "gpt-4")
+
+
+def _get_int(env_name: str, default: int) -> int:
+    try:
+        return int(os.getenv(env_name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+_pool_lock = threading.Lock()
+_chat_models: Dict[Tuple[str, float, bool], ChatOpenAI] = {}
+_http_client = None
+_pool_stats = {"requests": 0, "connections_opened": 0}
+
+
+async def _trace_connection(event_name: str, _info: Dict[str, Any]) -> None:
+    if event_name == "connection.connect_tcp.complete":
+        _pool_stats["connections_opened"] += 1
+
+
+async def _count_request(request) -> None:
+    _pool_stats["requests"] += 1
+    request.extensions["trace"] = _trace_connection
+
+
+def _get_http_client():
+    """Shared keep-alive HTTP pool for every pooled chat model."""
+    global _http_client
+    if httpx is None:
+        return None
+    if _http_client is None:
+        limits = httpx.Limits(
+            max_connections=_get_int("LLM_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=_get_int("LLM_MAX_KEEPALIVE_CONNECTIONS", 10),
+            keepalive_expiry=float(_get_int("LLM_KEEPALIVE_EXPIRY", 60)),
+        )
+        _http_client = httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(float(_get_int("LLM_TIMEOUT", 60)), connect=10.0),
+            event_hooks={"request": [_count_request]},
+        )
+    return _http_client
+
+
 def build_chat_model(streaming: bool = True) -> ChatOpenAI:
-    model_name = os.getenv("CHATBOT_MODEL_NAME", "gpt-4")
-    return ChatOpenAI(
-        model_name=model_name,
-        temperature=_get_temperature(),
-        streaming=streaming,
-    )
+    """Return the process-wide chat model for (model, temperature, streaming)."""
+    model_name = get_model_name()
+    temperature = _get_temperature()
+    key = (model_name, temperature, streaming)
+    with _pool_lock:
+        model = _chat_models.get(key)
+        if model is None:
+            kwargs: Dict[str, Any] = {}
+            http_client = _get_http_client()
+            if http_client is not None:
+                kwargs["http_async_client"] = http_client
+            model = ChatOpenAI(
+                model_name=model_name,
+                temperature=temperature,
+                streaming=streaming,
+                **kwargs,
+            )
+            _chat_models[key] = model
+        return model
+
+
+def llm_pool_stats() -> Dict[str, Any]:
+    requests = _pool_stats["requests"]
+    opened = _pool_stats["connections_opened"]
+    return {
+        "models": len(_chat_models),
+        "requests": requests,
+        "connections_opened": opened,
+        "connection_reuse_ratio": round(1 - opened / requests, 4) if requests else 0.0,
+    }
 
 
 SYSTEM_PROMPT = (
@@ -71,14 +153,31 @@ SYSTEM_PROMPT = (
 async def stream_chat_response(
     query: str,
     *,
+    system_prompt: Optional[str] = None,
     extra_context: Optional[Iterable[str]] = None,
+    cache_tag: Optional[str] = None,
 ) -> AsyncGenerator[Dict[str, Any], None]:
-    """Stream tokens from the base chat model without RAG retrieval."""
+    """Stream tokens from the base chat model without RAG retrieval.
+
+    When ``cache_tag`` (e.g. the latest data date) is given, identical requests
+    are answered from ``llm_cache`` and replayed as a simulated stream.
+    """
+    extra_context = list(extra_context) if extra_context else None
+    cache_key = None
+    if cache_tag is not None:
+        cache_key = make_key(get_model_name(), system_prompt or SYSTEM_PROMPT, extra_context, query, cache_tag)
+        cached = await llm_cache.aget(cache_key)
+        if cached is not None:
+            async for event in replay_stream(cached):
+                yield event
+            yield {"type": "final", "response": cached, "sources": []}
+            return
+
     full_response = ""
     llm = build_chat_model(streaming=True)
 
     try:
-        async for chunk in llm.astream(_build_messages(query, extra_context)):
+        async for chunk in llm.astream(_build_messages(query, extra_context, system_prompt)):
             content = getattr(chunk, "content", None)
             if not content:
                 continue
@@ -86,22 +185,27 @@ async def stream_chat_response(
             yield {"type": "chunk", "content": content}
 
         if not full_response.strip():
-            fallback_text = await _generate_fallback_response(query, extra_context)
+            fallback_text = await _generate_fallback_response(query, extra_context, system_prompt)
             yield {"type": "final", "response": fallback_text, "sources": []}
             return
 
-        yield {"type": "final", "response": full_response, "sources": []}
-
     except Exception as error:
         print(f"Chat generation failed, switching to fallback model: {error}")
-        fallback_text = await _generate_fallback_response(query, extra_context)
+        fallback_text = await _generate_fallback_response(query, extra_context, system_prompt)
         yield {"type": "final", "response": fallback_text, "sources": []}
+        return
+
+    # Outside the try: a cache failure must not throw away the finished answer.
+    if cache_key:
+        await llm_cache.aset(cache_key, full_response)
+    yield {"type": "final", "response": full_response, "sources": []}
 
 
 async def _generate_fallback_response(
     query: str,
     extra_context: Optional[Iterable[str]] = None,
+    system_prompt: Optional[str] = None,
 ) -> str:
     fallback_llm = build_chat_model(streaming=False)
-    ai_message = await fallback_llm.ainvoke(_build_messages(query, extra_context))
+    ai_message = await fallback_llm.ainvoke(_build_messages(query, extra_context, system_prompt))
     return getattr(ai_message, "content", str(ai_message))
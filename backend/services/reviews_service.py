@@ -1,28 +1,70 @@
-from typing import Any, Dict, List
-from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional
 
+from .pagination import apply_keyset, iter_pages, page_from_rows
 from .supabase_client import supabase
 
 
-def get_review_summary(business_id: str) -> Dict[str, Any]:
+ROLLUP_SUMMARY_COLUMNS = "review_count, rating_sum, positive_count, neutral_count, negative_count"
+
+
+def _rollup(business_id: str, columns: str) -> Dict[str, Any]:
+    """One row of ``review_rollups``, kept current by a trigger on ``reviews``."""
     response = (
-        supabase.table("review_summary")
-        .select("business_id, review_count, average_rating, positive_count, neutral_count, negative_count")
+        supabase.table("review_rollups")
+        .select(columns)
         .eq("business_id", business_id)
-        .single()
+        .limit(1)
         .execute()
     )
-    data = response.data or {}
+    rows = response.data or []
+    return rows[0] if rows else {}
+
+
+def _summary_from_rollup(business_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    review_count = int(data.get("review_count") or 0)
+    rating_sum = float(data.get("rating_sum") or 0)
     return {
         "business_id": business_id,
-        "review_count": int(data.get("review_count") or 0),
-        "average_rating": float(data.get("average_rating") or 0),
+        "review_count": review_count,
+        "average_rating": round(rating_sum / review_count, 2) if review_count else 0.0,
         "positive_count": int(data.get("positive_count") or 0),
         "neutral_count": int(data.get("neutral_count") or 0),
         "negative_count": int(data.get("negative_count") or 0),
     }
 
 
+def get_review_summary(business_id: str) -> Dict[str, Any]:
+    return _summary_from_rollup(business_id, _rollup(business_id, ROLLUP_SUMMARY_COLUMNS))
+
+
+def get_review_rollup(business_id: str) -> Dict[str, Any]:
+    """Summary plus rating histogram and per-month buckets, from a single rollup row."""
+    data = _rollup(
+        business_id,
+        ROLLUP_SUMMARY_COLUMNS + ", rating_histogram, monthly_counts, monthly_rating_sums",
+    )
+    histogram = data.get("rating_histogram") or {}
+    monthly_counts = data.get("monthly_counts") or {}
+    monthly_sums = data.get("monthly_rating_sums") or {}
+    months = []
+    for month in sorted(monthly_counts):
+        count = int(monthly_counts[month] or 0)
+        if count <= 0:
+            continue
+        months.append(
+            {
+                "month": month,
+                "count": count,
+                "average_rating": round(float(monthly_sums.get(month) or 0) / count, 2),
+            }
+        )
+    return {
+        **_summary_from_rollup(business_id, data),
+        "rating_histogram": {str(bucket): int(histogram.get(str(bucket)) or 0) for bucket in range(1, 6)},
+        "monthly": months,
+    }
+
+
 def list_recent_reviews(business_id: str, limit: int = 10) -> List[Dict[str, Any]]:
     response = (
         supabase.table("reviews")
@@ -38,32 +80,36 @@ def list_recent_reviews(business_id: str, limit: int = 10) -> List[Dict[str, Any
     return items
 
 
-def list_all_reviews(business_id: str, limit: int = 100) -> List[Dict[str, Any]]:
-    response = (
+EXPORT_PAGE_SIZE = 500
+
+
+def page_reviews(business_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """One newest-first page of reviews plus the opaque cursor for the next one."""
+    builder = (
         supabase.table("reviews")
-        .select("rating, content, source, reviewed_at")
+        .select("id, rating, content, source, reviewed_at")
         .eq("business_id", business_id)
-        .order("reviewed_at", desc=True)
-        .limit(limit)
-        .execute()
     )
-    items = response.data or []
-    for item in items:
+    response = apply_keyset(builder, "reviewed_at", cursor).limit(limit + 1).execute()
+    page = page_from_rows(response.data or [], limit, "reviewed_at")
+    for item in page["items"]:
         item["rating"] = float(item.get("rating") or 0)
-    return items
+    return page
+
+
+def list_all_reviews(business_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+    return page_reviews(business_id, limit)["items"]
+
+
+def iter_reviews(business_id: str, page_size: int = EXPORT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    return iter_pages(lambda limit, cursor: page_reviews(business_id, limit, cursor), page_size)
 
 
 def review_source_breakdown(business_id: str) -> List[Dict[str, Any]]:
-    response = (
-        supabase.table("reviews")
-        .select("source")
-        .eq("business_id", business_id)
-        .execute()
-    )
-    items = response.data or []
-    counter = Counter(item.get("source") or "기타" for item in items)
-    total = sum(counter.values()) or 1
+    counts = _rollup(business_id, "source_counts").get("source_counts") or {}
+    counts = {source: int(count) for source, count in counts.items() if int(count or 0) > 0}
+    total = sum(counts.values()) or 1
     return [
         {"source": source, "count": count, "ratio": round(count / total, 4)}
-        for source, count in counter.items()
+        for source, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)
     ]
@@ -0,0 +1,214 @@
+"""Embedding-similarity answer cache scoped per business and data version.
+
+Paraphrased questions ("지난주 매출 추이", "저번 주 매출 어떻게 됐어") reuse a
+recent answer as long as the business's data has not changed. Each
+(business_id, data_version) partition keeps a fixed-size ring of unit-norm
+query embeddings, so a lookup is one matrix-vector product.
+"""
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .embedding_cache import embedding_cache
+
+EmbedFn = Callable[[str], Sequence[float]]
+
+
+def _get_float(env_name: str, default: float) -> float:
+    try:
+        return float(os.getenv(env_name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def default_embed(text: str) -> Sequence[float]:
+    # Shares cached query vectors with document search.
+    return embedding_cache.embed_query(text)
+
+
+@dataclass
+class _Partition:
+    capacity: int
+    vectors: Optional[np.ndarray] = None
+    queries: List[str] = field(default_factory=list)
+    answers: List[str] = field(default_factory=list)
+    size: int = 0
+    cursor: int = 0
+
+    def add(self, vector: np.ndarray, query: str, answer: str) -> None:
+        if self.vectors is None:
+            self.vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            self.queries = [""] * self.capacity
+            self.answers = [""] * self.capacity
+        self.vectors[self.cursor] = vector
+        self.queries[self.cursor] = query
+        self.answers[self.cursor] = answer
+        self.cursor = (self.cursor + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def best(self, vector: np.ndarray) -> tuple[int, float]:
+        scores = self.vectors[: self.size] @ vector
+        index = int(np.argmax(scores))
+        return index, float(scores[index])
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        embed: Optional[EmbedFn] = None,
+        threshold: float = 0.92,
+        max_entries_per_tenant: int = 256,
+    ):
+        self.embed = embed or default_embed
+        self.threshold = threshold
+        self.max_entries_per_tenant = max_entries_per_tenant
+        self._partitions: Dict[str, tuple[str, _Partition]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def embed_query(self, query: str) -> np.ndarray:
+        vector = np.asarray(self.embed(query), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def lookup(
+        self,
+        business_id: str,
+        data_version: str,
+        query: str,
+        vector: Optional[np.ndarray] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return ``{"answer", "query", "similarity"}`` for the closest cached query above threshold."""
+        with self._lock:
+            entry = self._partitions.get(business_id)
+        if entry is None or entry[0] != data_version or entry[1].size == 0:
+            self._stats["misses"] += 1
+            return None
+        partition = entry[1]
+        vector = self.embed_query(query) if vector is None else vector
+        with self._lock:
+            index, similarity = partition.best(vector)
+            if similarity < self.threshold:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            return {
+                "answer": partition.answers[index],
+                "query": partition.queries[index],
+                "similarity": round(similarity, 4),
+            }
+
+    def store(
+        self,
+        business_id: str,
+        data_version: str,
+        query: str,
+        answer: str,
+        vector: Optional[np.ndarray] = None,
+    ) -> None:
+        if not answer:
+            return
+        vector = self.embed_query(query) if vector is None else vector
+        with self._lock:
+            entry = self._partitions.get(business_id)
+            # A new data version makes every older answer for the tenant stale.
+            if entry is None or entry[0] != data_version:
+                entry = (data_version, _Partition(self.max_entries_per_tenant))
+                self._partitions[business_id] = entry
+            entry[1].add(vector, query, answer)
+
+    def invalidate(self, business_id: Optional[str] = None) -> None:
+        with self._lock:
+            if business_id is None:
+                self._partitions.clear()
+            else:
+                self._partitions.pop(business_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        hits, misses = self._stats["hits"], self._stats["misses"]
+        with self._lock:
+            entries = sum(partition.size for _version, partition in self._partitions.values())
+            tenants = len(self._partitions)
+        return {
+            "tenants": tenants,
+            "entries": entries,
+            "threshold": self.threshold,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
+
+
+def _bigrams(text: str) -> set:
+    compact = "".join(text.split())
+    return {compact[i:i + 2] for i in range(len(compact) - 1)} or {compact}
+
+
+def answer_agreement(first: str, second: str) -> float:
+    """Character-bigram Jaccard similarity, used as a proxy for "same answer"."""
+    a, b = _bigrams(first), _bigrams(second)
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def evaluate_false_hits(
+    logs: Iterable[Dict[str, Any]],
+    embed: EmbedFn,
+    thresholds: Sequence[float] = (0.85, 0.9, 0.92, 0.95),
+    min_agreement: float = 0.5,
+) -> List[Dict[str, Any]]:
+    """Replay logged (user, assistant) turns through the cache at several thresholds.
+
+    ``logs`` are ``conversation_logs`` rows in chronological order. The data
+    version is approximated by the calendar day of the turn. A hit counts as
+    false when the cached answer disagrees with the answer actually logged
+    for the new question (``answer_agreement < min_agreement``).
+    """
+    turns: List[tuple[str, str, str, str]] = []
+    pending: Dict[str, tuple[str, str]] = {}
+    for row in logs:
+        business_id = str(row.get("business_id") or "")
+        day = str(row.get("created_at") or "")[:10]
+        if row.get("role") == "user":
+            pending[business_id] = (day, row.get("message") or "")
+        elif row.get("role") == "assistant" and business_id in pending:
+            asked_day, question = pending.pop(business_id)
+            turns.append((business_id, asked_day, question, row.get("message") or ""))
+
+    vectors = {}
+    for _business_id, _day, question, _answer in turns:
+        if question not in vectors:
+            raw = np.asarray(embed(question), dtype=np.float32)
+            norm = float(np.linalg.norm(raw))
+            vectors[question] = raw / norm if norm else raw
+
+    reports = []
+    for threshold in thresholds:
+        cache = SemanticCache(embed=embed, threshold=threshold)
+        hits = false_hits = 0
+        for business_id, day, question, answer in turns:
+            found = cache.lookup(business_id, day, question, vector=vectors[question])
+            if found:
+                hits += 1
+                if answer_agreement(found["answer"], answer) < min_agreement:
+                    false_hits += 1
+            cache.store(business_id, day, question, answer, vector=vectors[question])
+        reports.append(
+            {
+                "threshold": threshold,
+                "queries": len(turns),
+                "hits": hits,
+                "false_hits": false_hits,
+                "hit_rate": round(hits / len(turns), 4) if turns else 0.0,
+                "false_hit_rate": round(false_hits / hits, 4) if hits else 0.0,
+            }
+        )
+    return reports
+
+
+semantic_cache = SemanticCache(
+    threshold=_get_float("SEMANTIC_CACHE_THRESHOLD", 0.92),
+    max_entries_per_tenant=int(_get_float("SEMANTIC_CACHE_MAX_PER_TENANT", 256)),
+)
@@ -43,6 +43,24 @@ class _NoopSupabase(Client):
     def limit(self, *_args: Any, **_kwargs: Any) -> "_NoopSupabase":
         return self
 
+    def gte(self, *_args: Any, **_kwargs: Any) -> "_NoopSupabase":
+        return self
+
+    def lte(self, *_args: Any, **_kwargs: Any) -> "_NoopSupabase":
+        return self
+
+    def gt(self, *_args: Any, **_kwargs: Any) -> "_NoopSupabase":
+        return self
+
+    def in_(self, *_args: Any, **_kwargs: Any) -> "_NoopSupabase":
+        return self
+
+    def or_(self, *_args: Any, **_kwargs: Any) -> "_NoopSupabase":
+        return self
+
+    def range(self, *_args: Any, **_kwargs: Any) -> "_NoopSupabase":
+        return self
+
     def single(self) -> "_NoopSupabase":
         return self
 
@@ -0,0 +1,32 @@
+import asyncio
+import threading
+
+from services import aio, metrics_service
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_async_proxy_runs_off_the_event_loop(monkeypatch):
+    seen_threads = []
+
+    def fake_summary(business_id):
+        seen_threads.append(threading.current_thread().name)
+        return {"business_id": business_id}
+
+    monkeypatch.setattr(metrics_service, "get_metrics_summary", fake_summary)
+
+    result = _run(aio.get_metrics_summary("biz-1"))
+
+    assert result == {"business_id": "biz-1"}
+    assert seen_threads and seen_threads[0].startswith("supabase-io")
+
+
+def test_async_proxy_keeps_function_name():
+    assert aio.list_policy_products.__name__ == "list_policy_products"
+    assert asyncio.iscoroutinefunction(aio.list_policy_products)
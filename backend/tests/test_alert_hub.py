@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+from services.alert_hub import AlertHub
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _payload(frame):
+    data = [line for line in frame.splitlines() if line.startswith("data: ")][0]
+    return json.loads(data[len("data: "):])
+
+
+def test_publish_fans_out_per_business_and_broadcast():
+    hub = AlertHub(queue_size=4)
+
+    async def _scenario():
+        mine = hub.subscribe("biz-1")
+        other = hub.subscribe("biz-2")
+        hub.publish("biz-1", "settlement_delay", "정산이 지연되고 있어요.")
+        hub.publish(None, "system", "점검 안내")
+        return [mine.queue.get_nowait()["type"] for _ in range(mine.queue.qsize())], other.queue.qsize()
+
+    mine, other_count = _run(_scenario())
+    assert mine == ["Settlement Delay", "System Message"]
+    assert other_count == 1
+
+
+def test_slow_subscriber_is_dropped_instead_of_buffered():
+    hub = AlertHub(queue_size=2)
+
+    async def _scenario():
+        slow = hub.subscribe("biz-1")
+        for index in range(3):
+            hub.publish("biz-1", "signal_change", f"alert {index}")
+        return slow
+
+    slow = _run(_scenario())
+    assert slow.dropped
+    assert slow.queue.get_nowait() is None
+    assert hub.stats()["connections"] == 0
+    assert hub.stats()["dropped"] == 1
+
+
+def test_stream_replays_events_after_last_event_id():
+    hub = AlertHub()
+
+    async def _scenario():
+        first = hub.publish("biz-1", "new_policy", "first")
+        hub.publish("biz-1", "new_policy", "second")
+        hub.publish("biz-2", "new_policy", "elsewhere")
+        frames = []
+        stream = hub.stream("biz-1", last_event_id=first["id"], heartbeat=0.01)
+        async for frame in stream:
+            frames.append(frame)
+            if frame.startswith(": keepalive"):
+                break
+        await stream.aclose()
+        return frames
+
+    frames = _run(_scenario())
+    events = [_payload(frame) for frame in frames if frame.startswith("id: ")]
+    assert [event["message"] for event in events] == ["second"]
+    assert "event: new_alert" in frames[1]
+    assert hub.stats()["connections"] == 0
@@ -0,0 +1,283 @@
+import asyncio
+import json
+import re
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.services import alert_scheduler as scheduler_module  # noqa: E402
+from services.alert_hub import AlertHub  # noqa: E402
+
+
+class DummyResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+        self.filters = []
+        self.limit_to = None
+        self.payload = None
+        self.action = "select"
+        self.orders = []
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) > value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) >= value)
+        return self
+
+    def or_(self, condition):
+        # Only the ascending (column, id) keysets the scheduler sends.
+        column, value = re.match(r'(\w+)\.gt\."([^"]+)"', condition).groups()
+        row_id = re.search(r',id\.gt\."([^"]*)"', condition).group(1)
+        self.filters.append(
+            lambda row: (str(row[column]), row["id"]) > (value, type(row["id"])(row_id))
+        )
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.limit_to = count
+        return self
+
+    def insert(self, payload):
+        self.action, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.action, self.payload = "update", payload
+        return self
+
+    def execute(self):
+        rows = self.store.setdefault(self.name, [])
+        if self.action == "insert":
+            row = {"id": len(rows) + 1, **self.payload}
+            rows.append(row)
+            return DummyResponse([row])
+        matched = [row for row in rows if all(check(row) for check in self.filters)]
+        if self.action == "update":
+            for row in matched:
+                row.update(self.payload)
+            return DummyResponse(matched)
+        for column, desc in reversed(self.orders or [("id", False)]):
+            matched.sort(key=lambda row: row[column] if column == "id" else str(row.get(column)), reverse=desc)
+        return DummyResponse(matched[: self.limit_to] if self.limit_to else matched)
+
+
+class FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def table(self, name):
+        return FakeQuery(self.tables, name)
+
+
+class FakeEngine:
+    def __init__(self):
+        self.signals = {}
+        self.next_signal = {}
+        self.refreshed = []
+
+    def refresh(self, business_ids):
+        self.refreshed.append(list(business_ids))
+        results = []
+        for business_id in business_ids:
+            previous = self.signals.get(business_id)
+            self.signals[business_id] = self.next_signal.get(business_id, "green")
+            results.append((previous, {"business_id": business_id, "signal": self.signals[business_id]}))
+        return results
+
+
+def _metrics(row_id, business_id, delays=0, updated_at="2025-03-01T00:00:00"):
+    return {
+        "id": row_id,
+        "business_id": business_id,
+        "metric_date": "2025-03-01",
+        "settlement_delay_count": delays,
+        "updated_at": updated_at,
+    }
+
+
+def _product(product_id, created_at="2025-03-01T00:00:00"):
+    return {"id": product_id, "name": f"상품 {product_id}", "group_name": "loan", "created_at": created_at}
+
+
+def test_first_run_seeds_watermarks_without_alerting_on_history(monkeypatch):
+    tables = {
+        "metrics_daily": [_metrics(1, "biz-1"), _metrics(2, "biz-2", delays=2), _metrics(3, "biz-1")],
+        "policy_products": [_product("p-1")],
+        "data_jobs": [],
+    }
+    monkeypatch.setattr(scheduler_module, "supabase", FakeSupabase(tables))
+    hub, engine = AlertHub(), FakeEngine()
+    scheduler = scheduler_module.AlertScheduler(hub, engine, batch_size=2)
+
+    first = scheduler.run_once()
+    assert first["seeded"] is True
+    assert (first["metrics_rows"], first["policy_rows"]) == (0, 0)
+    assert first["alerts"] == {"settlement_delay": 0, "signal_change": 0, "new_policy": 0}
+    assert hub.recent("biz-2") == [] and hub.recent(None) == []
+    assert scheduler.watermarks == {
+        "metrics_daily": {"updated_at": "2025-03-01T00:00:00", "id": 3},
+        "policy_products": {"created_at": "2025-03-01T00:00:00", "id": "p-1"},
+    }
+
+
+def test_incremental_runs_only_scan_new_rows_and_persist_watermarks(monkeypatch):
+    tables = {
+        "metrics_daily": [_metrics(1, "biz-1")],
+        "policy_products": [_product("p-1")],
+        "data_jobs": [],
+    }
+    monkeypatch.setattr(scheduler_module, "supabase", FakeSupabase(tables))
+    hub, engine = AlertHub(), FakeEngine()
+    scheduler = scheduler_module.AlertScheduler(hub, engine, batch_size=2)
+    scheduler.run_once()
+
+    tables["metrics_daily"] += [_metrics(2, "biz-1"), _metrics(3, "biz-2", delays=2), _metrics(4, "biz-1")]
+    tables["policy_products"].append(_product("p-2", "2025-03-02T00:00:00"))
+    second = scheduler.run_once()
+    assert (second["metrics_rows"], second["policy_rows"], second["businesses"]) == (3, 1, 2)
+    assert second["alerts"] == {"settlement_delay": 1, "signal_change": 0, "new_policy": 1}
+    assert [event["type"] for event in hub.recent("biz-2")] == ["Settlement Delay"]
+
+    tables["metrics_daily"].append(_metrics(5, "biz-1"))
+    engine.next_signal["biz-1"] = "red"
+    third = scheduler.run_once()
+    assert (third["metrics_rows"], third["policy_rows"]) == (1, 0)
+    assert engine.refreshed[-1] == ["biz-1"]
+    assert third["alerts"]["signal_change"] == 1
+    assert hub.recent("biz-1")[0]["signal"] == "red"
+
+    jobs = tables["data_jobs"]
+    assert [job["status"] for job in jobs] == ["success"] * 3
+    assert all(job["job_type"] == "alert_scan" and job["finished_at"] for job in jobs)
+
+    # A fresh scheduler resumes from the watermark stored in data_jobs.
+    restarted = scheduler_module.AlertScheduler(AlertHub(), FakeEngine(), batch_size=2)
+    resumed = restarted.run_once()
+    assert (resumed["seeded"], resumed["metrics_rows"]) == (False, 0)
+    saved = json.loads(jobs[-1]["message"])
+    assert saved["watermarks"]["metrics_daily"] == {"updated_at": "2025-03-01T00:00:00", "id": 5}
+    assert "duration_ms" in saved
+
+
+def test_policy_keyset_pages_through_a_tie_larger_than_the_batch(monkeypatch):
+    tables = {"metrics_daily": [], "policy_products": [], "data_jobs": []}
+    monkeypatch.setattr(scheduler_module, "supabase", FakeSupabase(tables))
+    scheduler = scheduler_module.AlertScheduler(AlertHub(), FakeEngine(), batch_size=2)
+    scheduler.run_once()
+
+    tables["policy_products"] += [_product(f"p-{i:02d}") for i in range(5)]
+    assert scheduler.run_once()["policy_rows"] == 5
+    assert scheduler.watermarks["policy_products"] == {"created_at": "2025-03-01T00:00:00", "id": "p-04"}
+
+    tables["policy_products"].append(_product("p-05"))
+    assert scheduler.run_once()["policy_rows"] == 1
+
+
+def test_metrics_corrected_in_place_are_rescanned(monkeypatch):
+    tables = {"metrics_daily": [_metrics(1, "biz-1"), _metrics(2, "biz-2")], "policy_products": [], "data_jobs": []}
+    monkeypatch.setattr(scheduler_module, "supabase", FakeSupabase(tables))
+    hub, engine = AlertHub(), FakeEngine()
+    scheduler = scheduler_module.AlertScheduler(hub, engine, batch_size=2)
+    scheduler.run_once()
+
+    # A re-ingested day keeps its id; the trigger moves updated_at forward.
+    tables["metrics_daily"][0].update(settlement_delay_count=1, updated_at="2025-03-02T00:00:00")
+    report = scheduler.run_once()
+    assert (report["metrics_rows"], report["alerts"]["settlement_delay"]) == (1, 1)
+    assert engine.refreshed[-1] == ["biz-1"]
+    assert scheduler.watermarks["metrics_daily"] == {"updated_at": "2025-03-02T00:00:00", "id": 1}
+
+
+def test_legacy_id_watermark_resumes_from_that_rows_updated_at(monkeypatch):
+    tables = {
+        "metrics_daily": [_metrics(1, "biz-1"), _metrics(2, "biz-1", updated_at="2025-03-02T00:00:00")],
+        "policy_products": [],
+        "data_jobs": [
+            {"job_type": "alert_scan", "status": "success", "finished_at": "2025-03-01T01:00:00",
+             "message": json.dumps({"watermarks": {"metrics_daily": 1}})}
+        ],
+    }
+    monkeypatch.setattr(scheduler_module, "supabase", FakeSupabase(tables))
+    report = scheduler_module.AlertScheduler(AlertHub(), FakeEngine()).run_once()
+    assert (report["seeded"], report["metrics_rows"]) == (False, 1)
+
+
+def test_concurrent_runs_scan_a_window_once(monkeypatch):
+    tables = {"metrics_daily": [_metrics(1, "biz-1")], "policy_products": [], "data_jobs": []}
+    monkeypatch.setattr(scheduler_module, "supabase", FakeSupabase(tables))
+
+    class SlowHub(AlertHub):
+        def publish(self, *args, **kwargs):
+            time.sleep(0.05)  # widen the window between reading rows and moving the watermark
+            return super().publish(*args, **kwargs)
+
+    hub = SlowHub()
+    scheduler = scheduler_module.AlertScheduler(hub, FakeEngine())
+    scheduler.run_once()
+    tables["metrics_daily"].append(_metrics(2, "biz-1", delays=1, updated_at="2025-03-02T00:00:00"))
+
+    threads = [threading.Thread(target=scheduler.run_once) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [event["type"] for event in hub.recent("biz-1")] == ["Settlement Delay"]
+
+
+def test_failed_run_restores_watermarks(monkeypatch):
+    tables = {"metrics_daily": [_metrics(1, "biz-1")], "policy_products": [], "data_jobs": []}
+    monkeypatch.setattr(scheduler_module, "supabase", FakeSupabase(tables))
+
+    class BrokenEngine(FakeEngine):
+        def refresh(self, business_ids):
+            raise RuntimeError("signal store unavailable")
+
+    scheduler = scheduler_module.AlertScheduler(AlertHub(), BrokenEngine())
+    scheduler.run_once()
+    tables["metrics_daily"].append(_metrics(2, "biz-1"))
+    with pytest.raises(RuntimeError):
+        scheduler.run_once()
+    assert scheduler.watermarks["metrics_daily"]["id"] == 1
+    assert tables["data_jobs"][-1]["status"] == "failed"
+
+
+def test_start_and_stop_background_loop(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "supabase", FakeSupabase({}))
+    scheduler = scheduler_module.AlertScheduler(AlertHub(), FakeEngine(), interval=60)
+
+    async def _scenario():
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        running = scheduler.stats()["running"]
+        await scheduler.stop()
+        return running
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(_scenario())
+    finally:
+        loop.close()
+    assert scheduler.stats()["running"] is False
+    assert scheduler.reports
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from services.chat_stream import ChunkStreamer, SlowClientError
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_first_chunk_is_sent_alone_and_rest_is_coalesced():
+    frames = []
+
+    async def send(frame):
+        frames.append(frame)
+
+    async def _stream():
+        async with ChunkStreamer(send, min_chars=10, max_delay=60) as streamer:
+            for token in ["안녕", "하세요", ", ", "사장", "님. ", "매출", "은 ", "좋아요"]:
+                await streamer.push(token)
+
+    _run(_stream())
+
+    contents = [frame["content"] for frame in frames]
+    assert all(frame["type"] == "chunk" for frame in frames)
+    assert contents[0] == "안녕"
+    assert "".join(contents) == "안녕하세요, 사장님. 매출은 좋아요"
+    assert len(frames) < 8
+
+
+def test_slow_client_aborts_stream():
+    async def send(_frame):
+        await asyncio.sleep(1)
+
+    async def _stream():
+        async with ChunkStreamer(send, min_chars=1, max_pending=1, send_timeout=0.01) as streamer:
+            for _ in range(10):
+                await streamer.push("x")
+
+    with pytest.raises(SlowClientError):
+        _run(_stream())
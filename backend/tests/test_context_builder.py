@@ -0,0 +1,86 @@
+import asyncio
+import importlib
+import importlib.util
+import sys
+import time
+import types
+
+import pytest
+
+
+@pytest.fixture
+def context_builder(monkeypatch):
+    # app.services.metrics_service is not part of this tree; the fetchers that
+    # use it are replaced below, so an empty stand-in is enough to import.
+    if importlib.util.find_spec("app.services.metrics_service") is None:
+        stub = types.ModuleType("app.services.metrics_service")
+        stub.fetch_timeseries = lambda *_args, **_kwargs: ([], {})
+        monkeypatch.setitem(sys.modules, "app.services.metrics_service", stub)
+        monkeypatch.delitem(sys.modules, "app.services.context_builder", raising=False)
+    return importlib.import_module("app.services.context_builder")
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_slow_source_is_skipped_without_holding_up_the_others(context_builder, monkeypatch):
+    async def fetch_metrics(business_id, date_from, date_to):
+        return [{"x": "2025-01-01", "y": 1000}], {"moving_avg_7": None, "pct_change_7d": None}
+
+    async def fetch_analytics(business_id, date_from, date_to):
+        return {"net_sales": 1000}
+
+    async def fetch_reviews(business_id):
+        return {"review_count": 2, "average_rating": 4.5, "negative_count": 0}, []
+
+    async def fetch_policies(business_id, query, finance_intent):
+        return [{"name": "사잇돌 대출"}]
+
+    async def fetch_documents(query, top_k, business_id):
+        await asyncio.sleep(5)
+        return [{"page_content": "late", "metadata": {}}]
+
+    monkeypatch.setattr(context_builder, "_fetch_metrics", fetch_metrics)
+    monkeypatch.setattr(context_builder, "_fetch_analytics", fetch_analytics)
+    monkeypatch.setattr(context_builder, "_fetch_reviews", fetch_reviews)
+    monkeypatch.setattr(context_builder, "_fetch_policies", fetch_policies)
+    monkeypatch.setattr(context_builder, "_fetch_documents", fetch_documents)
+
+    started = time.perf_counter()
+    bundle = _run(context_builder.build_context("대출 추천", "biz-1", timeouts={"documents": 0.05}))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert bundle.meta["skipped_sources"] == ["documents"]
+    assert bundle.documents == []
+    assert bundle.metrics["series"] and bundle.metrics["analytics"] == {"net_sales": 1000}
+    assert bundle.reviews["review_count"] == 2
+    assert bundle.policies["items"] == [{"name": "사잇돌 대출"}]
+
+
+def test_private_documents_are_searched_only_for_the_verified_owner(context_builder, monkeypatch):
+    async def no_source(*_args):
+        raise RuntimeError("not under test")
+
+    for name in ("_fetch_metrics", "_fetch_analytics", "_fetch_reviews", "_fetch_policies"):
+        monkeypatch.setattr(context_builder, name, no_source)
+
+    def vector_search(query, top_k, business_id=None):
+        shared = [{"page_content": "사잇돌 대출 안내", "metadata": {"source": "policy.pdf"}}]
+        if business_id is None:
+            return shared
+        return shared + [{"page_content": "임대차 계약서 보증금", "metadata": {"source": "lease.pdf", "tenant": business_id}}]
+
+    monkeypatch.setattr(context_builder.rag_indexer, "vector_search", vector_search)
+
+    stranger = _run(context_builder.build_context("계약서", "biz-1"))
+    assert [doc["metadata"]["source"] for doc in stranger.documents] == ["policy.pdf"]
+    assert all("lease.pdf" not in context for context in stranger.contexts)
+
+    owner = _run(context_builder.build_context("계약서", "biz-1", search_private=True))
+    assert [doc["metadata"]["source"] for doc in owner.documents] == ["policy.pdf", "lease.pdf"]
@@ -0,0 +1,59 @@
+import asyncio
+
+from app.services.context_cache import ContextCache, source_for_job
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_get_or_load_hits_after_first_call():
+    cache = ContextCache(max_entries=4, ttls={"metrics": 60})
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"series": []}
+
+    _run(cache.get_or_load("biz-1", "metrics", loader))
+    _run(cache.get_or_load("biz-1", "metrics", loader))
+
+    stats = cache.stats()
+    assert len(calls) == 1
+    assert stats["sources"]["metrics"]["hits"] == 1
+    assert stats["sources"]["metrics"]["misses"] == 1
+
+
+def test_lru_eviction_and_expiry():
+    cache = ContextCache(max_entries=2, ttls={"reviews": 60, "policies": -1})
+    cache.set("biz-1", "reviews", 1)
+    cache.set("biz-2", "reviews", 2)
+    cache.get("biz-1", "reviews")
+    cache.set("biz-3", "reviews", 3)
+
+    assert cache.get("biz-2", "reviews") == (False, None)
+    assert cache.get("biz-1", "reviews") == (True, 1)
+
+    cache.set("biz-1", "policies", ["p"])
+    assert cache.get("biz-1", "policies") == (False, None)
+
+
+def test_invalidate_by_business_and_source():
+    cache = ContextCache(max_entries=10, ttls={"metrics": 60, "reviews": 60})
+    cache.set("biz-1", "metrics", 1, params=("2025-01-01", "2025-01-31"))
+    cache.set("biz-1", "reviews", 2)
+    cache.set("biz-2", "metrics", 3)
+
+    assert cache.invalidate(source="metrics") == 2
+    assert cache.invalidate(business_id="biz-1") == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_source_for_job():
+    assert source_for_job("hometax_sync") == "metrics"
+    assert source_for_job("reviews_import") == "reviews"
+    assert source_for_job(None) == "metrics"
@@ -0,0 +1,81 @@
+import numpy as np
+
+from services.embedding_cache import EmbeddingCache
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, model, texts):
+        self.batches.append((model, list(texts)))
+        return [[float(len(text)), 1.0 if model == "large" else 0.0, 0.5] for text in texts]
+
+
+def test_misses_are_batched_and_persisted_as_float16(tmp_path):
+    embedder = FakeEmbedder()
+    cache = EmbeddingCache(str(tmp_path), embedder, batch_size=2, batch_max_chars=5)
+    vectors = cache.embed(["aa", "bbb", "aa", "c", "dddd"], model="small")
+    assert vectors.shape == (5, 3) and vectors.dtype == np.float32
+    assert vectors[0].tolist() == vectors[2].tolist() == [2.0, 0.0, 0.5]
+    # "aa" is sent once; batches close on 2 items or 5 characters.
+    assert [texts for _, texts in embedder.batches] == [["aa", "bbb"], ["c", "dddd"]]
+    assert (tmp_path / "small.f16").exists()
+
+    reopened = EmbeddingCache(str(tmp_path), embedder)
+    again = reopened.embed(["dddd", "aa"], model="small")
+    assert again.tolist() == [[4.0, 0.0, 0.5], [2.0, 0.0, 0.5]]
+    assert len(embedder.batches) == 2
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 2 and stats["embedding_calls"] == 0 and stats["hit_rate"] == 1.0
+
+
+def test_keys_include_model_and_queries_hit_memory(tmp_path):
+    embedder = FakeEmbedder()
+    cache = EmbeddingCache(str(tmp_path), embedder, max_memory_entries=1)
+    assert cache.embed_query("매출", model="small")[1] == 0.0
+    assert cache.embed_query("매출", model="large")[1] == 1.0
+    cache.embed_query("매출", model="large")
+    stats = cache.stats()
+    assert stats["embedding_calls"] == 2 and stats["memory_hits"] == 1 and stats["memory_entries"] == 1
+    assert stats["embeddings_avoided"] == 1
+
+
+def test_matrix_grows_past_initial_capacity(tmp_path, monkeypatch):
+    from services import embedding_cache as module
+
+    monkeypatch.setattr(module, "INITIAL_ROWS", 2)
+    cache = EmbeddingCache(str(tmp_path), FakeEmbedder(), batch_size=3)
+    texts = ["x" * n for n in range(1, 8)]
+    cache.embed(texts, model="m")
+    reopened = EmbeddingCache(str(tmp_path), FakeEmbedder())
+    assert reopened.embed(texts, model="m")[:, 0].tolist() == [float(n) for n in range(1, 8)]
+    assert reopened.stats()["disk_entries"] == 7
+
+
+def test_torn_key_write_does_not_shift_later_rows(tmp_path):
+    embedder = FakeEmbedder()
+    EmbeddingCache(str(tmp_path), embedder).embed(["aa", "bbb"], model="m")
+    with open(tmp_path / "m.keys", "ab") as handle:
+        handle.write(b"\x01" * 7)  # interrupted append of a third key
+
+    reopened = EmbeddingCache(str(tmp_path), embedder)
+    reopened.embed(["cccc"], model="m")
+    assert (tmp_path / "m.keys").stat().st_size == 3 * 16
+
+    again = EmbeddingCache(str(tmp_path), embedder)
+    assert again.embed(["aa", "bbb", "cccc"], model="m")[:, 0].tolist() == [2.0, 3.0, 4.0]
+    assert again.stats()["embedding_calls"] == 0
+
+
+def test_query_embeddings_stay_off_disk(tmp_path):
+    embedder = FakeEmbedder()
+    cache = EmbeddingCache(str(tmp_path), embedder)
+    cache.embed(["계약서 조항"], model="m")
+    for query in ("매출 어때?", "대출 추천", "매출 어때?"):
+        cache.embed_query(query, model="m")
+    stats = cache.stats()
+    assert stats["disk_entries"] == 1 and stats["memory_hits"] == 1
+    reopened = EmbeddingCache(str(tmp_path), embedder)
+    reopened.embed(["계약서 조항"], model="m")
+    assert reopened.stats()["disk_entries"] == 1
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+from app.services.index_jobs import IndexJobManager
+
+
+def test_one_build_per_persist_dir_with_progress():
+    release = threading.Event()
+    calls = []
+
+    def build(docs_dir, persist_dir, on_progress):
+        calls.append(persist_dir)
+        on_progress({"stage": "embedding", "files_total": 4, "files_parsed": 4, "chunks_total": 10, "chunks_embedded": 5})
+        release.wait(5)
+        return {"added": 10, "removed": 0, "skipped": 0}
+
+    async def scenario():
+        manager = IndexJobManager(build=build)
+        first = await manager.submit("docs", "index-a")
+        other = await manager.submit("docs", "index-b")
+        assert first["status"] == "running" and not first["already_running"]
+        assert other["job_id"] != first["job_id"]
+
+        while len(calls) < 2:
+            await asyncio.sleep(0.01)
+        running = manager.get(first["job_id"])
+        assert running["progress"]["chunks_embedded"] == 5 and running["eta_seconds"] is not None
+
+        release.set()
+        await manager.wait(first["job_id"])
+        await manager.wait(other["job_id"])
+        done = manager.get(first["job_id"])
+        assert done["status"] == "success" and done["report"]["added"] == 10 and done["eta_seconds"] is None
+        assert sorted(calls) == ["index-a", "index-b"]
+
+        again = await manager.submit("docs", "index-a")  # finished builds free the directory
+        assert again["job_id"] != first["job_id"]
+        await manager.wait(again["job_id"])
+
+    asyncio.run(scenario())
+
+
+def test_submit_during_a_build_queues_one_follow_up_build():
+    release = threading.Event()
+    calls = []
+
+    def build(docs_dir, persist_dir, on_progress, **options):
+        calls.append((persist_dir, options))
+        release.wait(5)
+        return {"added": 1, "removed": 0, "skipped": 0}
+
+    async def scenario():
+        manager = IndexJobManager(build=build)
+        first = await manager.submit("docs", "index-a")
+        second = await manager.submit("docs", "index-a")
+        third = await manager.submit("docs", "index-a", partitioned=True)
+        assert second["already_running"] and second["rerun_pending"]
+        assert third["job_id"] == second["job_id"] == first["job_id"]
+
+        release.set()
+        await manager.wait(first["job_id"])
+        follow_up = [job for job in manager.stats()["recent"] if job["job_id"] != first["job_id"]]
+        assert len(follow_up) == 1
+        await manager.wait(follow_up[0]["job_id"])
+        assert calls == [("index-a", {}), ("index-a", {"partitioned": True})]
+        assert manager.stats()["active"] == []
+
+    asyncio.run(scenario())
+
+
+def test_failed_build_is_reported():
+    def build(**_kwargs):
+        raise RuntimeError("embedding quota exceeded")
+
+    async def scenario():
+        manager = IndexJobManager(build=build)
+        job = await manager.submit("docs", "index")
+        await manager.wait(job["job_id"])
+        failed = manager.get(job["job_id"])
+        assert failed["status"] == "failed" and "quota" in failed["error"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,122 @@
+import hashlib
+import os
+
+import numpy as np
+import pytest
+
+from app.services import index_snapshots, rag_indexer, vector_store
+
+
+def fake_embed(texts):
+    vectors = []
+    for text in texts:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+        vectors.append(np.random.default_rng(seed).normal(size=8))
+    return vectors
+
+
+def _build(docs, persist, **kwargs):
+    return rag_indexer.build_index(
+        str(docs), str(persist), embed_documents=kwargs.pop("embed", fake_embed), split=lambda text: [text], **kwargs
+    )
+
+
+def _top(persist, text, store=None):
+    hits = rag_indexer.vector_search(text, 1, str(persist), store=store, embed_query=lambda query: fake_embed([query])[0])
+    return hits[0]["page_content"] if hits else None
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_VECTOR_BACKEND", "numpy")
+    docs, persist = tmp_path / "docs", tmp_path / "index"
+    docs.mkdir()
+    (docs / "a.md").write_text("운전자금 안내", encoding="utf-8")
+    (docs / "b.md").write_text("보증 한도", encoding="utf-8")
+    return docs, persist
+
+
+def test_readers_keep_their_snapshot_across_a_swap(corpus):
+    docs, persist = corpus
+    assert _top(persist, "운전자금 안내") is None  # nothing published yet
+    first = _build(docs, persist)
+    assert first["snapshot"] == "v000001" and index_snapshots.current_version(str(persist)) == "v000001"
+
+    reader = rag_indexer.live_store(str(persist))
+    (docs / "a.md").write_text("운전자금 안내 개정판", encoding="utf-8")
+    second = _build(docs, persist)
+    assert second["snapshot"] == "v000002" and second["added"] == 1 and second["removed"] == 1
+
+    # The reader opened before the swap still answers from v000001, untouched by the rebuild.
+    assert _top(persist, "운전자금 안내", store=reader) == "운전자금 안내"
+    assert _top(persist, "운전자금 안내 개정판") == "운전자금 안내 개정판"
+    assert rag_indexer.live_store(str(persist)).count() == 2
+
+    unchanged = _build(docs, persist)
+    assert "snapshot" not in unchanged and index_snapshots.current_version(str(persist)) == "v000002"
+
+
+def test_rollback_and_garbage_collection(corpus):
+    docs, persist = corpus
+    _build(docs, persist)
+    (docs / "b.md").unlink()
+    _build(docs, persist)
+    assert rag_indexer.live_store(str(persist)).count() == 1
+
+    listing = rag_indexer.rollback(str(persist))
+    assert listing["current"] == "v000001"
+    assert rag_indexer.live_store(str(persist)).count() == 2
+    with pytest.raises(index_snapshots.SnapshotError):
+        rag_indexer.rollback(str(persist), "v000099")
+
+    # The next build diffs against the rolled-back manifest.
+    report = _build(docs, persist)
+    assert report["snapshot"] == "v000003" and report["removed"] == 1
+
+    removed = index_snapshots.collect_garbage(str(persist), grace_seconds=0, keep=2)
+    # v000001 was live most recently, so it is the rollback target that is kept.
+    assert removed == ["v000002"]
+    assert not os.path.exists(index_snapshots.snapshot_path(str(persist), "v000002"))
+    assert [entry["version"] for entry in index_snapshots.list_snapshots(str(persist))["snapshots"]] == [
+        "v000003",
+        "v000001",
+    ]
+
+
+def test_failed_build_leaves_live_snapshot_alone(corpus):
+    docs, persist = corpus
+    _build(docs, persist)
+    (docs / "c.md").write_text("새 문서", encoding="utf-8")
+
+    def broken(_texts):
+        raise RuntimeError("embedding API down")
+
+    with pytest.raises(RuntimeError):
+        _build(docs, persist, embed=broken)
+    assert index_snapshots.current_version(str(persist)) == "v000001"
+    assert sorted(os.listdir(persist / "snapshots")) == ["v000001"]
+    assert _build(docs, persist)["added"] == 1
+
+
+def test_backends_that_write_in_place_are_not_snapshotted(corpus, monkeypatch):
+    docs, persist = corpus
+    opened = []
+
+    def open_store(path):
+        opened.append(path)
+        return vector_store.open_vector_store(path, "numpy")
+
+    # Stands in for Chroma, which writes into its files and so is never cloned.
+    monkeypatch.setattr(rag_indexer, "store_label", lambda: "chroma")
+    monkeypatch.setattr(rag_indexer, "open_vector_store", open_store)
+    assert _top(persist, "운전자금 안내") is None and opened == []
+
+    _build(docs, persist)
+    (docs / "c.md").write_text("새 문서", encoding="utf-8")
+    assert _build(docs, persist)["added"] == 1
+    assert _top(persist, "새 문서") == "새 문서"
+    # One store (one client) per directory, shared by builds and readers.
+    assert opened == [str(persist)]
+    assert not (persist / "snapshots").exists()
+    with pytest.raises(index_snapshots.SnapshotError):
+        rag_indexer.rollback(str(persist))
@@ -0,0 +1,23 @@
+from app.services import hybrid_router
+from app.services.intent_matcher import FINANCE, POLICY, REVIEWS, SQL_TIME_SERIES, IntentMatcher, match_intents
+
+
+def test_match_returns_all_intents_and_date_hints():
+    result = match_intents("저번주 매출 추이랑 리뷰, 그리고 운영자금 대출 정책 알려줘")
+
+    assert result.intents == frozenset({SQL_TIME_SERIES, REVIEWS, FINANCE, POLICY})
+    assert result.date_hints == ("last_week",)
+    assert "운영자금" in result.keywords and "자금" in result.keywords
+
+
+def test_overlapping_keywords_are_all_reported():
+    matcher = IntentMatcher({"a": ["he", "she", "hers"], "b": ["his"]})
+    result = matcher.match("ushers")
+
+    assert result.intents == frozenset({"a"})
+    assert set(result.keywords) == {"she", "he", "hers"}
+
+
+def test_route_uses_sales_keywords():
+    assert hybrid_router.route("지난달 매출 어때?") == "SQL_TIME_SERIES"
+    assert hybrid_router.route("사잇돌 대출 자격") == "VECTOR_SEARCH"
@@ -0,0 +1,45 @@
+from app.services.lexical_index import LexicalIndex
+
+
+def _key(char):
+    return char * 64
+
+
+def test_bm25_ranking_coverage_and_partitions_survive_reopen(tmp_path):
+    index = LexicalIndex(str(tmp_path))
+    index.add(
+        [_key("a"), _key("b"), _key("c")],
+        ["사잇돌 대출 자격은 재직 6개월 이상", "햇살론 대출 신청 서류", "사잇돌 대출 금리 안내"],
+        [{}, {"tenant": "biz-1"}, {}],
+    )
+    hits = index.search("사잇돌 대출 자격", 3)
+    assert [key for key, _, _ in hits] == [_key("a"), _key("c"), _key("b")]
+    assert hits[0][2] == 1.0 and hits[1][2] < 1.0  # only "a" contains every query bigram
+    only = index.search("대출", 3, partition="biz-1")
+    assert [key for key, _, _ in only] == [_key("b")] and only[0][2] == 1.0
+    assert index.search("대출", 3, partition="biz-2") == []
+
+    index.delete([_key("c")])
+    index.update_metadata([_key("a")], [{"tenant": "biz-1"}])
+    index.flush()
+    reopened = LexicalIndex(str(tmp_path))
+    assert reopened.count() == 2
+    assert [key for key, _, _ in reopened.search("사잇돌 대출", 3, partition="biz-1")] == [_key("a"), _key("b")]
+    assert "금리" not in reopened._term_ids  # terms of deleted chunks leave the vocabulary
+
+
+def test_partitioned_scores_ignore_other_tenants(tmp_path):
+    texts = ["사잇돌 대출 자격은 재직 6개월 이상", "가게 임대차 계약서 대출 조항"]
+    alone = LexicalIndex(str(tmp_path / "alone"))
+    alone.add([_key("a"), _key("b")], texts, [{"tenant": "biz-1"}] * 2)
+
+    crowded = LexicalIndex(str(tmp_path / "crowded"))
+    crowded.add([_key("a"), _key("b")], texts, [{"tenant": "biz-1"}] * 2)
+    others = [f"{i:064d}" for i in range(40)]
+    crowded.add(
+        others,
+        ["사잇돌 대출 사잇돌 대출 신청 안내" if i % 2 else "매출 정산 내역" for i in range(40)],
+        [{"tenant": "biz-2"} if i % 3 else {} for i in range(40)],
+    )
+    assert crowded.search("사잇돌 대출", 5, partition="biz-1") == alone.search("사잇돌 대출", 5, partition="biz-1")
+    assert {key for key, _, _ in crowded.search("사잇돌 대출", 50, partition="biz-2")} <= set(others)
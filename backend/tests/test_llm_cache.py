@@ -0,0 +1,84 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from services import rag_service
+from services.llm_cache import LLMAnswerCache, make_key
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_key_depends_on_context_order_and_data_tag():
+    base = make_key("gpt-4", "sys", ["a", "b"], "이번 달 매출 어때?", "2025-09-13")
+    assert base == make_key("gpt-4", "sys", ["a", "b"], "이번 달 매출 어때?", "2025-09-13")
+    assert base != make_key("gpt-4", "sys", ["b", "a"], "이번 달 매출 어때?", "2025-09-13")
+    assert base != make_key("gpt-4", "sys", ["a", "b"], "이번 달 매출 어때?", "2025-09-14")
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    LLMAnswerCache(path).set("k", "매출이 늘었어요")
+
+    restarted = LLMAnswerCache(path)
+    assert restarted.get("k") == "매출이 늘었어요"
+    assert restarted.get("missing") is None
+
+    stats = restarted.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["tokens_saved"] > 0
+
+
+def test_stream_chat_response_replays_cached_answer(tmp_path):
+    cache = LLMAnswerCache(str(tmp_path / "cache.sqlite3"))
+
+    class OnceLLM:
+        calls = 0
+
+        async def astream(self, _messages):
+            OnceLLM.calls += 1
+            yield SimpleNamespace(content="캐시된 답변입니다")
+
+    async def _collect():
+        collected = []
+        async for item in rag_service.stream_chat_response("질문", cache_tag="2025-09-13"):
+            collected.append(item)
+        return collected
+
+    with patch("services.rag_service.build_chat_model", return_value=OnceLLM()), \
+        patch("services.rag_service.llm_cache", cache):
+        first = _run(_collect())
+        second = _run(_collect())
+
+    assert OnceLLM.calls == 1
+    assert second[-1]["response"] == first[-1]["response"] == "캐시된 답변입니다"
+    assert "".join(e["content"] for e in second if e["type"] == "chunk") == "캐시된 답변입니다"
+
+
+def test_cache_write_failure_keeps_the_generated_answer(tmp_path):
+    class LockedCache(LLMAnswerCache):
+        def set(self, key, response):
+            raise sqlite3.OperationalError("database is locked")
+
+    class StreamLLM:
+        async def astream(self, _messages):
+            yield SimpleNamespace(content="생성된 답변")
+
+    async def _collect():
+        return [item async for item in rag_service.stream_chat_response("질문", cache_tag="2025-09-13")]
+
+    fallback = AsyncMock(return_value="fallback")
+    with patch("services.rag_service.build_chat_model", return_value=StreamLLM()), \
+        patch("services.rag_service.llm_cache", LockedCache(str(tmp_path / "cache.sqlite3"))), \
+        patch("services.rag_service._generate_fallback_response", fallback):
+        events = _run(_collect())
+
+    assert events[-1]["response"] == "생성된 답변"
+    fallback.assert_not_called()
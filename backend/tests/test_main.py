@@ -84,3 +84,24 @@ def test_stream_chat_response_handles_empty_generation():
         outputs = _run(_collect())
 
     assert outputs[-1]["response"] == "empty"
+
+
+def test_build_chat_model_reuses_pooled_client(monkeypatch):
+    class RecordingChatModel:
+        created = 0
+
+        def __init__(self, **kwargs):
+            RecordingChatModel.created += 1
+            self.kwargs = kwargs
+
+    monkeypatch.setattr(rag_service, "ChatOpenAI", RecordingChatModel)
+    monkeypatch.setattr(rag_service, "_chat_models", {})
+
+    first = rag_service.build_chat_model(streaming=True)
+    second = rag_service.build_chat_model(streaming=True)
+    non_streaming = rag_service.build_chat_model(streaming=False)
+
+    assert first is second
+    assert non_streaming is not first
+    assert RecordingChatModel.created == 2
+    assert rag_service.llm_pool_stats()["models"] == 2
@@ -1,5 +1,3 @@
-import types
-
 from services import metrics_service
 
 
@@ -59,3 +57,30 @@ def test_metrics_daily_casts(monkeypatch):
     data = metrics_service.list_metrics_daily("biz-1")
     assert isinstance(data["items"][0]["gross_sales"], float)
     assert data["items"][0]["settlement_delay_count"] == 2
+
+
+def test_metrics_summaries_single_rpc_per_chunk(monkeypatch):
+    calls = []
+
+    class BatchSupabase:
+        def rpc(self, name, params):
+            calls.append((name, params))
+            rows = [
+                {"business_id": biz, "net_sales": "100.00", "settlement_delay": 1}
+                for biz in params["target_businesses"]
+                if biz != "biz-empty"
+            ]
+            return DummyResponse(rows)
+
+    monkeypatch.setattr(metrics_service, "supabase", BatchSupabase())
+    ids = [f"biz-{i}" for i in range(5)] + ["biz-empty", "biz-0"]
+
+    chunks = list(metrics_service.iter_metrics_summaries(ids, chunk_size=4))
+    results = [item for chunk in chunks for item in chunk]
+
+    assert len(calls) == 2
+    assert all(name == "metrics_summary_batch" for name, _params in calls)
+    assert [item["business_id"] for item in results] == [f"biz-{i}" for i in range(5)] + ["biz-empty"]
+    assert results[0]["net_sales"] == 100.0
+    assert results[-1]["net_sales"] == 0
+    assert results[-1]["data_delay_notice"] == metrics_service.DATA_DELAY_NOTICE
@@ -0,0 +1,105 @@
+import re
+
+import pytest
+
+from services import conversation_service
+from services.pagination import InvalidCursorError, apply_keyset, decode_cursor, encode_cursor, iter_pages
+
+
+class DummyResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class KeysetTable:
+    """Applies the newest-first keyset the way PostgREST would."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.orders = []
+        self.filter = None
+        self.limit_to = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, *_args, **_kwargs):
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def or_(self, condition):
+        self.filter = condition
+        self.cursor = (
+            re.search(r'created_at\.lt\."([^"]+)"', condition).group(1),
+            re.search(r'id\.lt\."([^"]+)"', condition).group(1),
+        )
+        return self
+
+    def limit(self, count):
+        self.limit_to = count
+        return self
+
+    def execute(self):
+        rows = sorted(self.rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)
+        if self.filter:
+            created_at, row_id = self.cursor
+            rows = [row for row in rows if (row["created_at"], row["id"]) < (created_at, row_id)]
+        return DummyResponse(rows[: self.limit_to])
+
+
+class DummySupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.tables = []
+
+    def table(self, _name):
+        table = KeysetTable(self.rows)
+        self.tables.append(table)
+        return table
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    cursor = encode_cursor("2025-03-01T10:00:00+00:00", "abc")
+    assert decode_cursor(cursor) == ("2025-03-01T10:00:00+00:00", "abc")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_condition_quotes_timestamps_and_handles_nulls():
+    table = KeysetTable([])
+    apply_keyset(table, "created_at", encode_cursor("2025-03-01T10:00:00.5+00:00", 7))
+    assert table.orders == [("created_at", True), ("id", True)]
+    assert table.filter == (
+        'created_at.lt."2025-03-01T10:00:00.5+00:00",'
+        'and(created_at.eq."2025-03-01T10:00:00.5+00:00",id.lt."7")'
+    )
+
+    table = KeysetTable([])
+    table.or_ = lambda condition: setattr(table, "filter", condition) or table
+    apply_keyset(table, "reviewed_at", encode_cursor(None, 3))
+    assert table.filter == 'and(reviewed_at.is.null,id.lt."3"),reviewed_at.not.is.null'
+
+
+def test_message_pages_walk_history_without_gaps(monkeypatch):
+    rows = [
+        {"id": f"m{i:02d}", "business_id": "biz-1", "created_at": f"2025-03-01T10:00:0{i // 3}"}
+        for i in range(8)
+    ]
+    dummy = DummySupabase(rows)
+    monkeypatch.setattr(conversation_service, "supabase", dummy)
+
+    first = conversation_service.page_messages("biz-1", limit=3)
+    assert [row["id"] for row in first["items"]] == ["m07", "m06", "m05"]
+    assert first["next_cursor"]
+
+    seen = [row["id"] for page in conversation_service.iter_messages("biz-1", page_size=3) for row in page]
+    assert seen == [f"m{i:02d}" for i in reversed(range(8))]
+    assert all(table.limit_to == 4 for table in dummy.tables)
+
+
+def test_iter_pages_stops_on_last_page():
+    pages = {None: {"items": [1, 2], "next_cursor": "a"}, "a": {"items": [3], "next_cursor": None}}
+    assert list(iter_pages(lambda _limit, cursor: pages[cursor], 2)) == [[1, 2], [3]]
@@ -0,0 +1,90 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services import policy_matcher  # noqa: E402
+
+SEED_PRODUCTS = [
+    {"id": "p-saitdol", "name": "우리 사잇돌 중금리대출", "limit_amount": "최대 2천만원", "term": "최장 5년",
+     "eligibility": "연소득 1,500만원 이상, NICE 475점 이상"},
+    {"id": "p-soho", "name": "위비 SOHO 모바일 신용대출", "limit_amount": "최대 3천만원", "term": "최장 5년",
+     "eligibility": "비씨카드 가맹점 1년 이상"},
+    {"id": "p-policy", "name": "소상공인 정책자금", "limit_amount": "최대 7천만원", "term": "최장 5년",
+     "eligibility": "창업 7년 이내 소상공인"},
+    {"id": "p-seoul-food", "name": "서울 외식업 긴급 운영자금", "limit_amount": "1억 5천만원", "term": "36개월",
+     "eligibility": "서울 소재 음식점, 월 매출 3천만원 이하, 세금 체납 없는 사업자"},
+]
+
+
+def test_parse_amounts_and_terms():
+    assert policy_matcher.parse_krw("최대 2천만원") == 2e7
+    assert policy_matcher.parse_krw("1억 5천만원") == 1.5e8
+    assert policy_matcher.parse_krw("연소득 1,500만원 이상") == 1.5e7
+    assert policy_matcher.parse_krw("NICE 475점") is None
+    assert policy_matcher.parse_term_months("최장 5년") == 60
+    assert policy_matcher.parse_term_months("36개월") == 36
+
+
+def test_compile_product_predicates():
+    saitdol, soho, policy, seoul = (policy_matcher.compile_product(row) for row in SEED_PRODUCTS)
+    assert saitdol.min_annual_sales == 1.5e7
+    assert saitdol.unverified == ("NICE 475점 이상",)
+    assert soho.min_age_years == 1
+    assert policy.max_age_years == 7 and not policy.unverified
+    assert seoul.industries == {"음식점"} and seoul.regions == {"서울"}
+    assert seoul.max_monthly_sales == 3e7
+    assert seoul.no_delay and seoul.working_capital
+    assert seoul.limit_amount == 1.5e8 and seoul.term_months == 36
+    assert math.isinf(seoul.min_annual_sales)
+
+
+def test_matrix_filters_and_ranks_per_business():
+    catalog = policy_matcher.CompiledCatalog([policy_matcher.compile_product(row) for row in SEED_PRODUCTS])
+    businesses = [
+        {"id": "seoul-chinese", "industry": "중식당", "region": "서울", "net_sales": 2e7, "settlement_delay": 0, "age_years": 3},
+        {"id": "yongin-pub", "industry": "주점", "region": "용인", "net_sales": 1e6, "settlement_delay": 2, "age_years": None},
+        {"id": "old-seoul-cafe", "industry": "카페", "region": "서울특별시", "net_sales": 5e7, "settlement_delay": 0, "age_years": 12},
+    ]
+    frame = policy_matcher.business_frame(catalog, businesses)
+    scores = policy_matcher.score_matrix(catalog, frame)
+    eligible = np.isfinite(scores)
+
+    assert eligible[0].tolist() == [True, True, True, True]
+    # 12M annual sales misses the 15M floor; a delinquent business is excluded from the no-delay product.
+    assert eligible[1].tolist() == [False, True, True, False]
+    # Too old for the startup fund and above the monthly sales cap.
+    assert eligible[2].tolist() == [True, True, False, False]
+
+    rows = policy_matcher.match(catalog, frame, k=2)
+    first = [row for row in rows if row["business_id"] == "seoul-chinese"]
+    assert [row["priority"] for row in first] == [1, 2]
+    assert first[0]["policy_id"] == "p-seoul-food"
+    assert "업종 조건(음식점) 충족" in first[0]["rationale"]
+    pub = [row for row in rows if row["business_id"] == "yongin-pub"]
+    # Settlement delays push the working-capital credit line to the top.
+    assert [row["policy_id"] for row in pub] == ["p-soho", "p-policy"]
+    assert "정산 지연 2건" in pub[0]["rationale"]
+
+
+def test_unknown_sales_are_unverified_not_a_perfect_fit():
+    catalog = policy_matcher.CompiledCatalog([policy_matcher.compile_product(row) for row in SEED_PRODUCTS])
+    businesses = [
+        {"id": "no-data", "industry": "중식당", "region": "서울", "net_sales": None, "settlement_delay": 0, "age_years": 3},
+        {"id": "small", "industry": "중식당", "region": "서울", "net_sales": 2e7, "settlement_delay": 0, "age_years": 3},
+    ]
+    frame = policy_matcher.business_frame(catalog, businesses)
+    assert math.isnan(frame.monthly_sales[0])
+    scores = policy_matcher.score_matrix(catalog, frame)
+
+    # Sales rules cannot exclude it, but they no longer score as satisfied or as a maximal limit fit.
+    assert np.isfinite(scores[0]).all()
+    assert (scores[0] < scores[1]).all()
+
+    rows = [row for row in policy_matcher.match(catalog, frame, k=4) if row["business_id"] == "no-data"]
+    seoul = next(row for row in rows if row["policy_id"] == "p-seoul-food")
+    assert "매출 기준 충족" not in seoul["rationale"]
+    assert "별도 확인 필요: 매출 기준(매출 정보 없음)" in seoul["rationale"]
+    saitdol = next(row for row in rows if row["policy_id"] == "p-saitdol")
+    assert "별도 확인 필요: NICE 475점 이상, 매출 기준(매출 정보 없음)" in saitdol["rationale"]
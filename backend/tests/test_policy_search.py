@@ -0,0 +1,64 @@
+from services import policy_service
+from services.policy_search import PolicySearchIndex, ngrams
+
+CATALOG = [
+    {
+        "id": "p-1",
+        "name": "소상공인 운전자금 대출",
+        "group_name": "정책자금",
+        "eligibility": "업력 1년 이상 소상공인",
+        "documents": "사업자등록증; 부가세 과세표준증명",
+        "application_method": "온라인 신청",
+    },
+    {
+        "id": "p-2",
+        "name": "청년 창업 보증",
+        "group_name": "보증",
+        "eligibility": "만 39세 이하 예비 창업자 및 소상공인",
+        "documents": "창업계획서",
+        "application_method": "지점 방문",
+    },
+    {
+        "id": "p-3",
+        "name": "스마트상점 기술보급",
+        "group_name": "지원사업",
+        "eligibility": "음식점 운영 사업자",
+        "documents": None,
+        "application_method": "운전자금 별도",
+    },
+]
+
+
+def test_ngrams_split_korean_words_into_bigrams():
+    assert ngrams("운전자금 대출!") == ["운전", "전자", "자금", "대출"]
+    assert ngrams("A 급") == ["a", "급"]
+
+
+def test_search_ranks_name_matches_above_other_fields():
+    index = PolicySearchIndex()
+    index.build(CATALOG)
+    assert [row["id"] for row in index.search("운전자금")] == ["p-1", "p-3"]
+    # Spacing and particles differ from the catalog text but bigrams still match.
+    assert index.search("운전 자금을")[0]["id"] == "p-1"
+    assert [row["id"] for row in index.search("소상공인", group_name="보증")] == ["p-2"]
+    assert index.search("없는단어") == []
+
+
+def test_invalidate_marks_index_stale_until_refresh():
+    index = PolicySearchIndex(ttl=60)
+    assert not index.is_fresh()
+    index.build(CATALOG)
+    assert index.is_fresh()
+    index.invalidate()
+    assert not index.is_fresh()
+
+
+def test_list_policy_products_serves_from_index(monkeypatch):
+    index = PolicySearchIndex()
+    index.build(CATALOG)
+    monkeypatch.setattr(policy_service, "policy_index", index)
+    monkeypatch.setattr(policy_service, "supabase", None)  # any database access would fail
+
+    groups = policy_service.list_policy_products(query_text="창업")
+    assert groups == [{"group_name": "보증", "products": [groups[0]["products"][0]]}]
+    assert groups[0]["products"][0]["features"] == ["창업계획서"]
@@ -0,0 +1,22 @@
+import pytest
+
+from app.services import private_documents
+
+
+def test_save_list_delete_within_the_business_directory(tmp_path):
+    saved = private_documents.save_document("biz-1", "../../lease.md", "임대차 계약서".encode("utf-8"), str(tmp_path))
+    assert saved["name"] == "lease.md" and (tmp_path / "biz-1" / "lease.md").exists()
+    assert [item["name"] for item in private_documents.list_documents("biz-1", str(tmp_path))] == ["lease.md"]
+    assert private_documents.list_documents("biz-2", str(tmp_path)) == []
+
+    assert private_documents.delete_document("biz-1", "lease.md", str(tmp_path))
+    assert not private_documents.delete_document("biz-1", "lease.md", str(tmp_path))
+
+
+@pytest.mark.parametrize(
+    "business_id, filename, data",
+    [("../biz", "a.md", b"x"), ("biz-1", "a.exe", b"x"), ("biz-1", ".hidden.md", b"x"), ("biz-1", "a.md", b"")],
+)
+def test_rejects_unsafe_or_unsupported_uploads(tmp_path, business_id, filename, data):
+    with pytest.raises(private_documents.DocumentError):
+        private_documents.save_document(business_id, filename, data, str(tmp_path))
@@ -0,0 +1,225 @@
+import os
+
+from app.services import rag_indexer
+from app.services.vector_store import VectorStore
+
+
+class FakeStore(VectorStore):
+    def __init__(self):
+        self.vectors = {}
+
+    def upsert(self, ids, embeddings, texts, metadatas):
+        for digest, vector, text, metadata in zip(ids, embeddings, texts, metadatas):
+            self.vectors[digest] = (vector, text, metadata)
+
+    def update_metadata(self, ids, metadatas):
+        for digest, metadata in zip(ids, metadatas):
+            vector, text, _ = self.vectors[digest]
+            self.vectors[digest] = (vector, text, metadata)
+
+    def delete(self, ids):
+        for digest in ids:
+            del self.vectors[digest]
+
+    def query(self, embedding, top_k, *, partition=None):
+        return []
+
+    def get(self, ids):
+        return [
+            {"page_content": self.vectors[digest][1], "metadata": self.vectors[digest][2]}
+            if digest in self.vectors
+            else None
+            for digest in ids
+        ]
+
+    def count(self):
+        return len(self.vectors)
+
+
+class SearchableStore(FakeStore):
+    def query(self, embedding, top_k, *, partition=None):
+        hits = [
+            {"page_content": text, "metadata": metadata, "score": 1.0 / (1 + abs(vector[0] - embedding[0]))}
+            for vector, text, metadata in self.vectors.values()
+            if partition is None or metadata.get("tenant") == partition
+        ]
+        return sorted(hits, key=lambda hit: hit["score"], reverse=True)[:top_k]
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return [[float(len(text))] for text in texts]
+
+
+def split_paragraphs(text):
+    return [part.strip() for part in text.split("\n\n")]
+
+
+def _build(docs, persist, store, embed):
+    return rag_indexer.build_index(
+        str(docs), str(persist), store=store, embed_documents=embed, split=split_paragraphs
+    )
+
+
+def test_rebuild_embeds_only_new_chunks_and_removes_orphans(tmp_path):
+    docs, persist = tmp_path / "docs", tmp_path / "index"
+    (docs / "sub").mkdir(parents=True)
+    (docs / "a.md").write_text("운전자금 안내\n\n신청 서류", encoding="utf-8")
+    (docs / "sub" / "b.txt").write_text("신청 서류\n\n보증 한도", encoding="utf-8")
+    (docs / "skip.png").write_bytes(b"\x89PNG")
+    store, embed = FakeStore(), CountingEmbedder()
+
+    report = _build(docs, persist, store, embed)
+    # "신청 서류" appears in both files but is embedded once.
+    assert (report["added"], report["removed"], report["skipped"]) == (3, 0, 1)
+    assert len(embed.texts) == 3 and len(store.vectors) == 3
+
+    report = _build(docs, persist, store, embed)
+    assert (report["added"], report["removed"], report["files_changed"]) == (0, 0, 0)
+    assert report["skipped"] == 4 and len(embed.texts) == 3
+
+    (docs / "a.md").write_text("운전자금 안내 (개정)\n\n신청 서류", encoding="utf-8")
+    report = _build(docs, persist, store, embed)
+    assert (report["added"], report["removed"], report["skipped"]) == (1, 1, 3)
+    assert embed.texts[-1] == "운전자금 안내 (개정)"
+
+    os.remove(docs / "a.md")
+    report = _build(docs, persist, store, embed)
+    assert (report["added"], report["removed"], report["files_removed"]) == (0, 1, 1)
+    _, _, metadata = store.vectors[rag_indexer.chunk_hash("신청 서류")]
+    assert metadata["source"].endswith("sub/b.txt") and metadata["duplicates"] == 0
+    assert len(store.vectors) == 2
+
+
+def test_touched_file_with_same_content_is_not_resplit(tmp_path):
+    docs, persist = tmp_path / "docs", tmp_path / "index"
+    docs.mkdir()
+    path = docs / "a.md"
+    path.write_text("본문", encoding="utf-8")
+    store, embed = FakeStore(), CountingEmbedder()
+    _build(docs, persist, store, embed)
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    calls = []
+    report = rag_indexer.build_index(
+        str(docs), str(persist), store=store, embed_documents=embed, split=lambda text: calls.append(text) or [text]
+    )
+    assert calls == [] and report["added"] == 0 and report["files_changed"] == 0
+    assert rag_indexer.load_manifest(str(persist), store.label)["files"]["a.md"]["mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+def test_parallel_pipeline_matches_in_process_build_and_reports_stages(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(6):
+        (docs / f"doc-{i}.md").write_text(f"공통 안내\n문서 {i} 본문", encoding="utf-8")
+    results = []
+    for workers in (1, 2):
+        store, embed = FakeStore(), CountingEmbedder()
+        # str.splitlines pickles, so workers=2 really parses in a process pool.
+        report = rag_indexer.build_index(
+            str(docs), str(tmp_path / f"index-{workers}"), store=store, embed_documents=embed,
+            split=str.splitlines, workers=workers,
+        )
+        results.append({digest: metadata for digest, (_, _, metadata) in store.vectors.items()})
+        assert (report["added"], report["skipped"]) == (7, 5) and len(embed.texts) == 7
+        assert report["stages"]["parse"]["pages"] == 6 and report["stages"]["embed"]["items"] == 7
+    assert results[0] == results[1]
+    shared = results[1][rag_indexer.chunk_hash("공통 안내")]
+    assert shared["source"].endswith("doc-0.md") and shared["duplicates"] == 5
+
+
+def test_embedding_failure_aborts_the_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_indexer, "EMBED_BATCH_SIZE", 1)
+    monkeypatch.setattr(rag_indexer, "INGEST_QUEUE_BATCHES", 1)
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(20):
+        (docs / f"doc-{i}.md").write_text(f"본문 {i}", encoding="utf-8")
+
+    def failing_embed(texts):
+        raise ValueError("quota exceeded")
+
+    store = FakeStore()
+    try:
+        _build(docs, tmp_path / "index", store, failing_embed)
+    except ValueError as error:
+        assert str(error) == "quota exceeded"
+    else:  # pragma: no cover
+        raise AssertionError("build should fail")
+    assert store.vectors == {}
+    assert rag_indexer.load_manifest(str(tmp_path / "index"), store.label)["files"] == {}
+
+
+def test_private_partition_is_isolated_and_merged_with_shared_results(tmp_path):
+    shared_docs, private_docs = tmp_path / "shared", tmp_path / "private"
+    shared_docs.mkdir()
+    (shared_docs / "policy.md").write_text("임대차 계약 안내", encoding="utf-8")
+    for business in ("biz-a", "biz-b"):
+        (private_docs / business).mkdir(parents=True)
+        (private_docs / business / "lease.md").write_text(f"임대차 계약서\n\n{business} 보증금", encoding="utf-8")
+    (private_docs / "stray.md").write_text("소유자 없음", encoding="utf-8")
+    shared, private = SearchableStore(), SearchableStore()
+    embed = CountingEmbedder()
+    _build(shared_docs, tmp_path / "shared-index", shared, embed)
+    report = rag_indexer.build_index(
+        str(private_docs), str(tmp_path / "private-index"), store=private, embed_documents=embed,
+        split=split_paragraphs, partitioned=True,
+    )
+    # The same text in two businesses is two vectors, one per tenant; stray.md belongs to nobody.
+    assert report["added"] == 4 and report["files"] == 2
+    tenants = sorted(metadata["tenant"] for _, _, metadata in private.vectors.values())
+    assert tenants == ["biz-a", "biz-a", "biz-b", "biz-b"]
+
+    hits = rag_indexer.vector_search(
+        "임대차 계약", 3, business_id="biz-a", store=shared, private_store=private,
+        embed_query=lambda text: [float(len(text))],
+    )
+    assert [hit["page_content"] for hit in hits] == ["임대차 계약서", "임대차 계약 안내", "biz-a 보증금"]
+    assert hits[0]["metadata"]["tenant"] == "biz-a"
+
+
+def test_hybrid_search_fast_path_skips_the_query_embedding(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_VECTOR_BACKEND", "numpy")
+    docs, persist = tmp_path / "docs", tmp_path / "index"
+    docs.mkdir()
+    (docs / "saitdol.md").write_text("사잇돌 대출 자격: 재직 6개월 이상 근로소득자", encoding="utf-8")
+    (docs / "sunshine.md").write_text("햇살론 신청 서류: 소득 증빙과 신분증", encoding="utf-8")
+    (docs / "rates.md").write_text("정책자금 금리는 분기마다 고시", encoding="utf-8")
+
+    def embed(texts):
+        return [[1.0, float(index)] for index, _ in enumerate(texts)]
+
+    rag_indexer.build_index(str(docs), str(persist), embed_documents=embed, split=lambda text: [text])
+    calls = []
+
+    def embed_query(text):
+        calls.append(text)
+        return [1.0, 0.0]
+
+    hits = rag_indexer.vector_search("사잇돌 대출 자격", 2, str(persist), embed_query=embed_query)
+    assert hits[0]["metadata"]["source"].endswith("saitdol.md") and calls == []
+
+    stats = rag_indexer.retrieval_stats()
+    hits = rag_indexer.vector_search("저신용 근로자 생활비", 2, str(persist), embed_query=embed_query)
+    assert len(hits) == 2 and calls == ["저신용 근로자 생활비"]  # no strong lexical match: embed and fuse
+    assert rag_indexer.retrieval_stats()["hybrid"] == stats["hybrid"] + 1
+
+    lexical = rag_indexer.vector_search("햇살론 서류", 2, str(persist), mode="lexical", embed_query=embed_query)
+    assert lexical[0]["metadata"]["source"].endswith("sunshine.md") and len(calls) == 1
+    assert len(rag_indexer.vector_search("햇살론 서류", 3, str(persist), mode="vector", embed_query=embed_query)) == 3
+
+
+def test_default_ingest_workers_follow_cpu_affinity_capped(monkeypatch):
+    monkeypatch.delenv("RAG_INGEST_WORKERS", raising=False)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _pid: set(range(64)), raising=False)
+    assert rag_indexer._default_ingest_workers() == rag_indexer.MAX_DEFAULT_INGEST_WORKERS
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _pid: {0}, raising=False)
+    assert rag_indexer._default_ingest_workers() == 1
+    monkeypatch.setenv("RAG_INGEST_WORKERS", "6")
+    assert rag_indexer._default_ingest_workers() == 6
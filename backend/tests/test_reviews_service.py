@@ -0,0 +1,81 @@
+from services import reviews_service
+
+
+class DummyResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class DummySupabase:
+    def __init__(self, rows):
+        self._rows = rows
+        self.tables = []
+        self.columns = []
+
+    def table(self, name):
+        self.tables.append(name)
+        return self
+
+    def select(self, columns, **_kwargs):
+        self.columns.append(columns)
+        return self
+
+    def eq(self, *_args, **_kwargs):
+        return self
+
+    def limit(self, *_args, **_kwargs):
+        return self
+
+    def execute(self):
+        return DummyResponse(self._rows)
+
+
+ROLLUP = {
+    "review_count": 4,
+    "rating_sum": "15.5",
+    "positive_count": 3,
+    "neutral_count": 0,
+    "negative_count": 1,
+    "rating_histogram": {"2": 1, "4": 1, "5": 2},
+    "source_counts": {"배달앱": 3, "지도": 1, "old-source": 0},
+    "monthly_counts": {"2025-02": 1, "2025-03": 3, "2025-01": 0},
+    "monthly_rating_sums": {"2025-02": "2.0", "2025-03": "13.5"},
+}
+
+
+def test_summary_reads_single_rollup_row(monkeypatch):
+    dummy = DummySupabase([ROLLUP])
+    monkeypatch.setattr(reviews_service, "supabase", dummy)
+    summary = reviews_service.get_review_summary("biz-1")
+    assert dummy.tables == ["review_rollups"]
+    assert summary["review_count"] == 4
+    assert summary["average_rating"] == 3.88
+    assert summary["negative_count"] == 1
+
+
+def test_summary_defaults_without_rollup(monkeypatch):
+    monkeypatch.setattr(reviews_service, "supabase", DummySupabase([]))
+    summary = reviews_service.get_review_summary("biz-1")
+    assert summary["review_count"] == 0
+    assert summary["average_rating"] == 0.0
+
+
+def test_rollup_histogram_and_months(monkeypatch):
+    monkeypatch.setattr(reviews_service, "supabase", DummySupabase([ROLLUP]))
+    rollup = reviews_service.get_review_rollup("biz-1")
+    assert rollup["rating_histogram"] == {"1": 0, "2": 1, "3": 0, "4": 1, "5": 2}
+    assert rollup["monthly"] == [
+        {"month": "2025-02", "count": 1, "average_rating": 2.0},
+        {"month": "2025-03", "count": 3, "average_rating": 4.5},
+    ]
+
+
+def test_source_breakdown_uses_rollup_counts(monkeypatch):
+    dummy = DummySupabase([ROLLUP])
+    monkeypatch.setattr(reviews_service, "supabase", dummy)
+    sources = reviews_service.review_source_breakdown("biz-1")
+    assert dummy.columns == ["source_counts"]
+    assert sources == [
+        {"source": "배달앱", "count": 3, "ratio": 0.75},
+        {"source": "지도", "count": 1, "ratio": 0.25},
+    ]
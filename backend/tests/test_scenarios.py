@@ -36,7 +36,7 @@ class DummySupabase:
 
 
 def test_get_review_summary_returns_defaults(monkeypatch):
-    dummy = DummySupabase({"review_summary": None})
+    dummy = DummySupabase({"review_rollups": []})
     monkeypatch.setattr(reviews_service, "supabase", dummy)
 
     summary = reviews_service.get_review_summary("biz-1")
@@ -46,8 +46,9 @@ def test_get_review_summary_returns_defaults(monkeypatch):
 
 
 def test_review_source_breakdown_handles_missing_sources(monkeypatch):
-    dummy_reviews = [{"source": None}, {"source": "배달앱"}, {"source": "배달앱"}]
-    dummy = DummySupabase({"reviews": dummy_reviews})
+    # The rollup trigger files reviews without a source under "기타".
+    dummy_rollups = [{"source_counts": {"배달앱": 2, "기타": 1}}]
+    dummy = DummySupabase({"review_rollups": dummy_rollups})
     monkeypatch.setattr(reviews_service, "supabase", dummy)
 
     sources = reviews_service.review_source_breakdown("biz-1")
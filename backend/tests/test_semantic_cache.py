@@ -0,0 +1,51 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from services.semantic_cache import SemanticCache, evaluate_false_hits  # noqa: E402
+
+VECTORS = {
+    "지난주 매출 추이": [1.0, 0.0, 0.0],
+    "저번 주 매출 어떻게 됐어": [0.98, 0.2, 0.0],
+    "대출 자격 알려줘": [0.0, 0.0, 1.0],
+}
+
+
+def fake_embed(text):
+    return VECTORS[text]
+
+
+def test_paraphrase_hits_within_same_data_version():
+    cache = SemanticCache(embed=fake_embed, threshold=0.9)
+    cache.store("biz-1", "v1", "지난주 매출 추이", "지난주 매출은 5% 늘었어요.")
+
+    hit = cache.lookup("biz-1", "v1", "저번 주 매출 어떻게 됐어")
+    assert hit["answer"] == "지난주 매출은 5% 늘었어요."
+    assert hit["similarity"] >= 0.9
+
+    assert cache.lookup("biz-1", "v1", "대출 자격 알려줘") is None
+    assert cache.lookup("biz-1", "v2", "저번 주 매출 어떻게 됐어") is None
+    assert cache.lookup("biz-2", "v1", "저번 주 매출 어떻게 됐어") is None
+
+
+def test_partition_is_bounded_and_reset_on_new_version():
+    cache = SemanticCache(embed=fake_embed, threshold=0.9, max_entries_per_tenant=2)
+    for question in VECTORS:
+        cache.store("biz-1", "v1", question, "answer")
+    assert cache.stats()["entries"] == 2
+
+    cache.store("biz-1", "v2", "대출 자격 알려줘", "answer")
+    assert cache.stats()["entries"] == 1
+
+
+def test_evaluate_false_hits_flags_disagreeing_answers():
+    logs = [
+        {"business_id": "biz-1", "role": "user", "message": "지난주 매출 추이", "created_at": "2025-09-01T10:00:00"},
+        {"business_id": "biz-1", "role": "assistant", "message": "지난주 매출은 늘었어요", "created_at": "2025-09-01T10:00:01"},
+        {"business_id": "biz-1", "role": "user", "message": "저번 주 매출 어떻게 됐어", "created_at": "2025-09-01T11:00:00"},
+        {"business_id": "biz-1", "role": "assistant", "message": "완전히 다른 대답", "created_at": "2025-09-01T11:00:01"},
+    ]
+    [report] = evaluate_false_hits(logs, fake_embed, thresholds=[0.9])
+    assert report["queries"] == 2
+    assert report["hits"] == 1
+    assert report["false_hit_rate"] == 1.0
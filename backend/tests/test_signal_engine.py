@@ -0,0 +1,215 @@
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services import signal_engine  # noqa: E402
+
+
+def _rows(business_id, days=60, sales_before=100.0, sales_now=100.0, cost_ratio=0.8, delays=0, end=date(2025, 3, 31)):
+    rows = []
+    for offset in range(days):
+        day = end - timedelta(days=offset)
+        net = sales_now if offset < 30 else sales_before
+        rows.append(
+            {
+                "business_id": business_id,
+                "metric_date": day.isoformat(),
+                "net_sales": net,
+                "cost_of_goods": net * cost_ratio,
+                "settlement_delay_count": delays if offset == 0 else 0,
+            }
+        )
+    return rows
+
+
+def test_rules_and_worst_level_wins():
+    engine = signal_engine.SignalEngine()
+    rows = (
+        _rows("healthy")
+        + _rows("shrinking", sales_before=100.0, sales_now=80.0)
+        + _rows("dipping", sales_before=100.0, sales_now=95.0)
+        + _rows("thin", cost_ratio=0.95)
+        + _rows("delayed", delays=1)
+        + _rows("very-delayed", delays=signal_engine.DELAY_RED_COUNT)
+    )
+    records = {record["business_id"]: record for record in engine.evaluate_rows(rows)}
+
+    assert records["healthy"]["signal"] == "green"
+    assert records["healthy"]["profit_margin"] == pytest.approx(0.2)
+    assert records["shrinking"]["growth_level"] == "red"
+    assert records["dipping"]["growth_level"] == "orange"
+    # 5% margin against the 15% default is a third of the industry average.
+    assert records["thin"]["margin_level"] == "red"
+    assert records["delayed"]["signal"] == "orange"
+    assert records["very-delayed"]["signal"] == "red"
+    assert engine.get("shrinking")["signal"] == "red"
+
+
+def test_industry_average_replaces_default_baseline():
+    engine = signal_engine.SignalEngine()
+    ids = [f"cafe-{i}" for i in range(signal_engine.MIN_INDUSTRY_SAMPLE)]
+    for business_id in ids:
+        engine._industries[business_id] = "cafe"
+    rows = [row for business_id in ids[:-1] for row in _rows(business_id, cost_ratio=0.5)]
+    rows += _rows(ids[-1], cost_ratio=0.8)
+    records = {record["business_id"]: record for record in engine.evaluate_rows(rows)}
+
+    # Fleet average is (4 * 0.5 + 0.2) / 5 = 0.44; 0.2 is below half of it.
+    assert records[ids[-1]]["industry_margin"] == pytest.approx(0.44)
+    assert records[ids[-1]]["margin_level"] == "red"
+    assert records[ids[0]]["margin_level"] == "green"
+
+
+class DummyResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, tables, name):
+        self.tables = tables
+        self.name = name
+        self.filters = []
+        self.order_by = None
+        self.window = None
+        self.payload = None
+        self.action = "select"
+        self.limit_to = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def limit(self, count):
+        self.limit_to = count
+        return self
+
+    def insert(self, payload):
+        self.action, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.action, self.payload = "update", payload
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: str(row.get(column)) > str(value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: str(row.get(column)) >= str(value))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def upsert(self, payload, on_conflict=None):
+        self.action, self.payload = "upsert", payload
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by = (column, desc)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1)
+        return self
+
+    def execute(self):
+        if self.action == "insert":
+            row = {"id": len(self.tables.setdefault(self.name, [])) + 1, **self.payload}
+            self.tables[self.name].append(row)
+            return DummyResponse([row])
+        if self.action == "update":
+            matched = [row for row in self.tables.get(self.name, []) if all(check(row) for check in self.filters)]
+            for row in matched:
+                row.update(self.payload)
+            return DummyResponse(matched)
+        if self.action == "upsert":
+            stored = {row["business_id"]: row for row in self.tables.setdefault(self.name, [])}
+            stored.update({row["business_id"]: row for row in self.payload})
+            self.tables[self.name] = list(stored.values())
+            return DummyResponse(self.payload)
+        rows = [row for row in self.tables.get(self.name, []) if all(check(row) for check in self.filters)]
+        if self.order_by:
+            column, desc = self.order_by
+            rows.sort(key=lambda row: str(row.get(column)), reverse=desc)
+        rows = rows[slice(*self.window)] if self.window else rows
+        return DummyResponse(rows[: self.limit_to] if self.limit_to else rows)
+
+
+class FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def table(self, name):
+        return FakeQuery(self.tables, name)
+
+
+def test_changed_businesses_follow_updated_at(monkeypatch):
+    tables = {
+        "metrics_daily": [
+            {"business_id": "biz-1", "created_at": "2025-03-01T00:00", "updated_at": "2025-03-01T00:00"},
+            {"business_id": "biz-2", "created_at": "2025-03-01T00:00", "updated_at": "2025-03-01T00:00"},
+        ]
+    }
+    monkeypatch.setattr(signal_engine, "supabase", FakeSupabase(tables))
+    engine = signal_engine.SignalEngine()
+    changed, engine._watermark = engine._changed_businesses()
+    assert changed == ["biz-1", "biz-2"]
+
+    # A corrected day is an upsert: created_at stays, the trigger bumps updated_at.
+    tables["metrics_daily"][1]["updated_at"] = "2025-03-02T00:00"
+    changed, watermark = engine._changed_businesses()
+    assert changed == ["biz-2"]
+    assert watermark == "2025-03-02T00:00"
+
+
+def test_refresh_reads_previous_signals_persisted_before_a_restart(monkeypatch):
+    recent = date.today()
+    tables = {
+        "metrics_daily": _rows("biz-1", sales_before=100.0, sales_now=80.0, end=recent),
+        "businesses": [{"id": "biz-1", "industry": "cafe"}],
+        "business_signals": [{"business_id": "biz-1", "signal": "green"}],
+    }
+    monkeypatch.setattr(signal_engine, "supabase", FakeSupabase(tables))
+
+    [(previous, record)] = signal_engine.SignalEngine().refresh(["biz-1"])
+    assert (previous, record["signal"]) == ("green", "red")
+    assert tables["business_signals"][0]["signal"] == "red"
+
+
+def test_restarted_engine_resumes_its_watermark_and_fleet_baseline(monkeypatch):
+    recent = date.today()
+    peers = [f"cafe-{i}" for i in range(signal_engine.MIN_INDUSTRY_SAMPLE)]
+    tables = {
+        "metrics_daily": [
+            {**row, "updated_at": "2025-03-01T00:00"} for business_id in peers for row in _rows(business_id, end=recent)
+        ],
+        "businesses": [{"id": business_id, "industry": "cafe"} for business_id in peers + ["cafe-new"]],
+        "business_signals": [],
+        "data_jobs": [],
+    }
+    monkeypatch.setattr(signal_engine, "supabase", FakeSupabase(tables))
+
+    first = signal_engine.SignalEngine().run()
+    assert first["evaluated"] == len(peers)
+    assert [job["status"] for job in tables["data_jobs"]] == ["success"]
+
+    # After a restart only the new business changed; its peers come from business_signals.
+    tables["metrics_daily"] += [
+        {**row, "updated_at": "2025-03-02T00:00"} for row in _rows("cafe-new", cost_ratio=0.92, end=recent)
+    ]
+    restarted = signal_engine.SignalEngine()
+    second = restarted.run()
+    assert second["evaluated"] == 1
+    record = restarted.get("cafe-new")
+    # (5 * 0.2 + 0.08) / 6: the peers evaluated before the restart still count.
+    assert record["industry_margin"] == pytest.approx(0.18)
+    assert record["margin_level"] == "red"  # against the 15% default it would only be orange
@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services import timeseries_analytics  # noqa: E402
+
+
+def _rows(days, start=date(2025, 1, 6), skip=()):
+    rows = []
+    for offset in range(days):
+        if offset in skip:
+            continue
+        rows.append(
+            {
+                "metric_date": (start + timedelta(days=offset)).isoformat(),
+                "gross_sales": "110.00",
+                "net_sales": str(100 + offset),
+                "cost_of_goods": "40.00",
+                "tax_amount": "10.00",
+                "settlement_delay_count": 1 if offset == days - 1 else 0,
+            }
+        )
+    return rows
+
+
+def test_frame_fills_missing_days_with_nan():
+    frame = timeseries_analytics.frame_from_rows(_rows(10, skip={3}))
+    assert len(frame) == 10
+    assert np.isnan(frame.columns["net_sales"][3])
+
+
+def test_compute_analytics_matches_naive_calculation():
+    rows = _rows(60)
+    stats = timeseries_analytics.compute_analytics(timeseries_analytics.frame_from_rows(rows))
+    net = [100 + offset for offset in range(60)]
+
+    assert stats["moving_avg_7"] == pytest.approx(sum(net[-7:]) / 7)
+    assert stats["wow_change"] == pytest.approx((sum(net[-7:]) - sum(net[-14:-7])) / sum(net[-14:-7]))
+    assert stats["mom_change"] == pytest.approx((sum(net[-28:]) - sum(net[-56:-28])) / sum(net[-56:-28]))
+    assert stats["margin_latest"] == pytest.approx((net[-1] - 40) / net[-1])
+    assert stats["settlement_delay_total"] == 1
+    assert stats["days_with_data"] == 60
+    # 2025-01-06 is a Monday, so Mondays carry the lowest sales in a rising series.
+    assert stats["weekday_index_mon"] < stats["weekday_index_sun"]
+
+
+def test_compute_analytics_empty_frame():
+    assert timeseries_analytics.compute_analytics(timeseries_analytics.frame_from_rows([])) == {}
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from app.services.vector_store import NumpyVectorStore, open_vector_store, store_label
+
+
+def _corpus(count=200, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    ids = [f"{i:064x}" for i in range(count)]
+    return ids, vectors
+
+
+def _exact_top(vectors, query, k):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return list(np.argsort(-(unit @ (query / np.linalg.norm(query))))[:k])
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_exact_topk_matches_float32_and_survives_reopen(tmp_path, dtype):
+    ids, vectors = _corpus()
+    store = NumpyVectorStore(str(tmp_path), dtype=dtype)
+    texts = [f"chunk {i}" for i in range(len(ids))]
+    store.upsert(ids, vectors, texts, [{"source": f"doc-{i}.md"} for i in range(len(ids))])
+    query = vectors[7] + 0.1
+    expected = [f"chunk {i}" for i in _exact_top(vectors, query, 5)]
+
+    results = store.query(query, 5)
+    found = [hit["page_content"] for hit in results]
+    # Quantisation may swap near-ties (|Δcos| ~ 1e-5 here) but not the clear winner.
+    assert found[0] == "chunk 7" and len(set(found) & set(expected)) >= 4
+    assert results[0]["metadata"] == {"source": "doc-7.md"} and results[0]["score"] > 0.9
+
+    store.flush()
+    reopened = NumpyVectorStore(str(tmp_path), dtype=dtype)
+    assert reopened.count() == len(ids)
+    assert [hit["page_content"] for hit in reopened.query(query, 5)] == found
+
+
+def test_delete_update_and_compaction(tmp_path, monkeypatch):
+    ids, vectors = _corpus(count=10)
+    store = NumpyVectorStore(str(tmp_path))
+    store.upsert(ids, vectors, [f"t{i}" for i in range(10)], [{}] * 10)
+    store.flush()
+
+    store.delete([ids[0]])
+    store.update_metadata([ids[1]], [{"source": "moved.md"}])
+    store.upsert([ids[2]], [vectors[2]], ["t2 v2"], [{"v": 2}])
+    assert store.count() == 9
+    assert [hit["page_content"] for hit in store.query(vectors[0], 10)].count("t0") == 0
+    store.flush()  # 2 of 11 rows are dead: below the compaction threshold
+
+    reopened = NumpyVectorStore(str(tmp_path))
+    assert reopened.count() == 9 and len(reopened._ids) == 11
+    assert reopened.query(vectors[1], 1)[0]["metadata"] == {"source": "moved.md"}
+    assert reopened.query(vectors[2], 1)[0]["page_content"] == "t2 v2"
+
+    reopened.delete(ids[3:6])
+    reopened.flush()
+    compacted = NumpyVectorStore(str(tmp_path))
+    assert compacted.count() == 6 and len(compacted._ids) == 6
+
+
+def test_backend_selection_and_dtype_guard(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_VECTOR_BACKEND", "numpy")
+    monkeypatch.setenv("RAG_VECTOR_DTYPE", "int8")
+    assert store_label() == "numpy:int8"
+    store = open_vector_store(str(tmp_path))
+    assert store.label == "numpy:int8"
+    ids, vectors = _corpus(count=3)
+    store.upsert(ids, vectors, ["a", "b", "c"], [{}] * 3)
+    store.flush()
+    with pytest.raises(RuntimeError):
+        NumpyVectorStore(str(tmp_path / "numpy"), dtype="float16")
+    with pytest.raises(ValueError):
+        open_vector_store(str(tmp_path), backend="faiss")
+
+
+def test_partitioned_query_filters_before_ranking(tmp_path):
+    ids, vectors = _corpus(count=300)
+    tenants = ["biz-a"] * 290 + ["biz-b"] * 10
+    store = NumpyVectorStore(str(tmp_path))
+    store.upsert(ids, vectors, [f"t{i}" for i in range(300)], [{"tenant": tenant} for tenant in tenants])
+    query = vectors[0]  # biz-a's best match; biz-b's ten rows all score lower
+
+    hits = store.query(query, 5, partition="biz-b")
+    assert len(hits) == 5 and {hit["metadata"]["tenant"] for hit in hits} == {"biz-b"}
+    expected = [f"t{290 + i}" for i in _exact_top(vectors[290:], query, 5)]
+    assert [hit["page_content"] for hit in hits][0] == expected[0]
+    assert store.query(query, 5, partition="biz-c") == []
+    assert store.query(query, 1)[0]["page_content"] == "t0"  # unpartitioned queries see everything
+
+    store.delete([ids[295]])
+    store.update_metadata([ids[0]], [{"tenant": "biz-b"}])
+    store.flush()
+    reopened = NumpyVectorStore(str(tmp_path))
+    found = {hit["page_content"] for hit in reopened.query(query, 20, partition="biz-b")}
+    assert "t0" in found and "t295" not in found and len(found) == 10
@@ -170,3 +170,227 @@ create table if not exists public.conversation_logs (
 
 create index if not exists conversation_logs_business_created_idx
   on public.conversation_logs (business_id, created_at desc);
+
+-- 8. Batch metrics summary for multi-store (franchise/admin) dashboards
+create or replace function public.metrics_summary_batch(
+  target_businesses uuid[] default null,
+  target_owner uuid default null
+)
+returns table (
+  business_id uuid,
+  latest_date date,
+  gross_sales numeric,
+  net_sales numeric,
+  cost_of_goods numeric,
+  profit numeric,
+  settlement_delay integer,
+  data_delay_notice text
+) as $$
+begin
+  return query
+    select
+      b.id,
+      max(m.metric_date) as latest_date,
+      sum(m.gross_sales) filter (where m.metric_date >= (current_date - interval '30 days')),
+      sum(m.net_sales) filter (where m.metric_date >= (current_date - interval '30 days')),
+      sum(m.cost_of_goods) filter (where m.metric_date >= (current_date - interval '30 days')),
+      sum(m.net_sales - m.cost_of_goods) filter (where m.metric_date >= (current_date - interval '30 days')),
+      sum(m.settlement_delay_count) filter (where m.metric_date >= (current_date - interval '30 days'))::int,
+      '국세청 홈택스 연동으로 1~2일 지연될 수 있어요.'
+    from public.businesses b
+    left join public.metrics_daily m on m.business_id = b.id
+    where (target_businesses is not null or target_owner is not null)
+      and (target_businesses is null or b.id = any(target_businesses))
+      and (target_owner is null or b.owner_id = target_owner)
+    group by b.id;
+end;
+$$ language plpgsql security definer;
+
+-- 9. Signal Index results (one row per business, rewritten by the signal engine)
+create table if not exists public.business_signals (
+  business_id uuid primary key references public.businesses(id) on delete cascade,
+  signal text not null,
+  margin_level text not null,
+  growth_level text not null,
+  delay_level text not null,
+  profit_margin numeric,
+  industry_margin numeric,
+  sales_growth numeric,
+  settlement_delay_count integer default 0,
+  evaluated_at timestamptz default now()
+);
+
+-- Re-ingested or corrected days are upserts on (business_id, metric_date), so the
+-- signal engine's change watermark reads updated_at rather than created_at.
+alter table public.metrics_daily add column if not exists updated_at timestamptz default now();
+
+create or replace function public.touch_updated_at()
+returns trigger as $$
+begin
+  new.updated_at := now();
+  return new;
+end;
+$$ language plpgsql;
+
+drop trigger if exists metrics_daily_touch_updated_at on public.metrics_daily;
+create trigger metrics_daily_touch_updated_at
+before update on public.metrics_daily
+for each row execute function public.touch_updated_at();
+
+-- (updated_at, id) also serves the alert scanner's keyset over corrected rows.
+drop index if exists public.metrics_daily_updated_idx;
+create index if not exists metrics_daily_updated_id_idx on public.metrics_daily(updated_at, id);
+
+-- 10. Incremental alert scans (watermarks live in data_jobs.message of job_type 'alert_scan')
+create index if not exists policy_products_created_id_idx on public.policy_products(created_at, id);
+create index if not exists data_jobs_type_status_idx on public.data_jobs(job_type, status, finished_at desc);
+
+-- 11. Incrementally maintained review rollups (one row per business)
+create table if not exists public.review_rollups (
+  business_id uuid primary key references public.businesses(id) on delete cascade,
+  review_count integer not null default 0,
+  rating_sum numeric not null default 0,
+  positive_count integer not null default 0,
+  neutral_count integer not null default 0,
+  negative_count integer not null default 0,
+  rating_histogram jsonb not null default '{}'::jsonb,  -- {"1": n, ..., "5": n}
+  source_counts jsonb not null default '{}'::jsonb,     -- {"delivery-app": n, ...}
+  monthly_counts jsonb not null default '{}'::jsonb,    -- {"2025-03": n, ...}
+  monthly_rating_sums jsonb not null default '{}'::jsonb,
+  updated_at timestamptz default now()
+);
+
+create or replace function public.jsonb_increment(doc jsonb, key text, delta numeric)
+returns jsonb as $$
+  select coalesce(doc, '{}'::jsonb) || jsonb_build_object(key, coalesce((doc->>key)::numeric, 0) + delta);
+$$ language sql immutable;
+
+create or replace function public.apply_review_rollup(
+  target_business uuid,
+  review_rating numeric,
+  review_source text,
+  review_month text,
+  delta integer
+)
+returns void as $$
+declare
+  bucket text := least(5, greatest(1, round(review_rating)))::int::text;
+  source_key text := coalesce(nullif(review_source, ''), '기타');
+begin
+  if target_business is null then
+    return;
+  end if;
+  insert into public.review_rollups (business_id) values (target_business)
+  on conflict (business_id) do nothing;
+  update public.review_rollups r set
+    review_count = r.review_count + delta,
+    rating_sum = r.rating_sum + delta * review_rating,
+    positive_count = r.positive_count + case when review_rating >= 4 then delta else 0 end,
+    neutral_count = r.neutral_count + case when review_rating = 3 then delta else 0 end,
+    negative_count = r.negative_count + case when review_rating <= 2 then delta else 0 end,
+    rating_histogram = public.jsonb_increment(r.rating_histogram, bucket, delta),
+    source_counts = public.jsonb_increment(r.source_counts, source_key, delta),
+    monthly_counts = public.jsonb_increment(r.monthly_counts, review_month, delta),
+    monthly_rating_sums = public.jsonb_increment(r.monthly_rating_sums, review_month, delta * review_rating),
+    updated_at = now()
+  where r.business_id = target_business;
+end;
+$$ language plpgsql;
+
+create or replace function public.reviews_rollup_trigger()
+returns trigger as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    perform public.apply_review_rollup(
+      old.business_id, old.rating, old.source,
+      to_char(coalesce(old.reviewed_at, old.created_at), 'YYYY-MM'), -1
+    );
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') then
+    perform public.apply_review_rollup(
+      new.business_id, new.rating, new.source,
+      to_char(coalesce(new.reviewed_at, new.created_at), 'YYYY-MM'), 1
+    );
+  end if;
+  return null;
+end;
+$$ language plpgsql;
+
+-- One-off backfill for reviews that predate the trigger. The lock blocks review
+-- writes until the trigger exists, so no review is counted twice or missed, and
+-- re-running the migration overwrites rollups with recomputed totals.
+begin;
+lock table public.reviews in share row exclusive mode;
+
+insert into public.review_rollups (
+  business_id, review_count, rating_sum, positive_count, neutral_count, negative_count,
+  rating_histogram, source_counts, monthly_counts, monthly_rating_sums
+)
+select
+  business_id,
+  count(*),
+  sum(rating),
+  count(*) filter (where rating >= 4),
+  count(*) filter (where rating = 3),
+  count(*) filter (where rating <= 2),
+  (select jsonb_object_agg(bucket, n) from (
+     select least(5, greatest(1, round(rating)))::int::text as bucket, count(*) as n
+     from public.reviews h where h.business_id = r.business_id group by 1) hist),
+  (select jsonb_object_agg(source_key, n) from (
+     select coalesce(nullif(source, ''), '기타') as source_key, count(*) as n
+     from public.reviews s where s.business_id = r.business_id group by 1) src),
+  (select jsonb_object_agg(month, n) from (
+     select to_char(coalesce(reviewed_at, created_at), 'YYYY-MM') as month, count(*) as n
+     from public.reviews m where m.business_id = r.business_id group by 1) months),
+  (select jsonb_object_agg(month, total) from (
+     select to_char(coalesce(reviewed_at, created_at), 'YYYY-MM') as month, sum(rating) as total
+     from public.reviews m where m.business_id = r.business_id group by 1) month_sums)
+from public.reviews r
+where business_id is not null
+group by business_id
+on conflict (business_id) do update set
+  review_count = excluded.review_count,
+  rating_sum = excluded.rating_sum,
+  positive_count = excluded.positive_count,
+  neutral_count = excluded.neutral_count,
+  negative_count = excluded.negative_count,
+  rating_histogram = excluded.rating_histogram,
+  source_counts = excluded.source_counts,
+  monthly_counts = excluded.monthly_counts,
+  monthly_rating_sums = excluded.monthly_rating_sums,
+  updated_at = now();
+
+drop trigger if exists reviews_rollup on public.reviews;
+create trigger reviews_rollup
+after insert or update or delete on public.reviews
+for each row execute function public.reviews_rollup_trigger();
+commit;
+
+-- 12. Keyset pagination: (business_id, <timestamp> desc, id desc) listings
+create index if not exists reviews_business_reviewed_idx
+  on public.reviews (business_id, reviewed_at desc, id desc);
+
+-- 13. Batch policy matching (backend/app/services/policy_matcher.py)
+alter table public.businesses add column if not exists opened_on date;
+alter table public.policy_recommendations
+  add column if not exists source text not null default 'manual',
+  add column if not exists score numeric;
+
+-- Replaces the engine-written recommendations of a business chunk in one transaction;
+-- manually curated rows (source = 'manual') are left alone.
+create or replace function public.replace_policy_recommendations(target_businesses uuid[], payload jsonb)
+returns integer as $$
+declare
+  inserted integer;
+begin
+  delete from public.policy_recommendations
+  where source = 'engine' and business_id = any(target_businesses);
+
+  insert into public.policy_recommendations (business_id, policy_id, priority, score, rationale, source)
+  select business_id, policy_id, priority, score, rationale, 'engine'
+  from jsonb_to_recordset(payload)
+    as r(business_id uuid, policy_id uuid, priority integer, score numeric, rationale text);
+  get diagnostics inserted = row_count;
+  return inserted;
+end;
+$$ language plpgsql;
@@ -1,7 +1,7 @@
 
 import React, { useState, useEffect, useRef, useCallback } from 'react';
 import { useAuth } from '../auth/AuthContext';
-import { useWebSocket, ReadyState } from '../hooks/useWebSocket';
+import { useWebSocket, ReadyState, WebSocketMessage } from '../hooks/useWebSocket';
 import { Send, MessageSquare, X } from 'lucide-react';
 
 const API_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
@@ -17,42 +17,62 @@ interface Message {
   sender: 'user' | 'bot';
   text: string;
   sources?: HybridSource[];
+  streaming?: boolean;
 }
 
 export const ChatWidget: React.FC = () => {
   const [messages, setMessages] = useState<Message[]>([]);
   const [input, setInput] = useState('');
   const [isOpen, setIsOpen] = useState(false);
-  const { currentUser } = useAuth();
+  const { currentUser, token } = useAuth();
 
   const bizId = currentUser?.business_id;
-  const wsUrl = bizId ? `${WS_URL}/ws/chat?business_id=${encodeURIComponent(bizId)}` : `${WS_URL}/ws/chat`;
-  const { lastMessage, readyState, sendMessage } = useWebSocket(isOpen ? wsUrl : null);
+  const wsParams = new URLSearchParams();
+  if (bizId) wsParams.set('business_id', bizId);
+  if (token) wsParams.set('token', token);
+  const wsQuery = wsParams.toString();
+  const wsUrl = wsQuery ? `${WS_URL}/ws/chat?${wsQuery}` : `${WS_URL}/ws/chat`;
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
-  useEffect(() => {
-    if (lastMessage) {
-      if (lastMessage.type === 'error') {
-        setMessages(prev => [
-          ...prev,
-          { sender: 'bot', text: lastMessage.detail || '오류가 발생했습니다. 다시 시도해주세요.' },
-        ]);
-      }
+  // Handled per frame rather than through `lastMessage`, so chunks that arrive
+  // back to back are all appended.
+  const handleMessage = useCallback((message: WebSocketMessage) => {
+    if (message.type === 'error') {
+      setMessages(prev => [
+        ...prev,
+        { sender: 'bot', text: message.detail || '오류가 발생했습니다. 다시 시도해주세요.' },
+      ]);
+    }
+
+    if (message.type === 'chunk') {
+      setMessages(prev => {
+        const last = prev[prev.length - 1];
+        if (last && last.streaming) {
+          return [...prev.slice(0, -1), { ...last, text: last.text + (message.content || '') }];
+        }
+        return [...prev, { sender: 'bot', text: message.content || '', streaming: true }];
+      });
+    }
 
-      if (lastMessage.type === 'final') {
-        const payload = lastMessage.payload || {
-          answer: lastMessage.response,
-          sources: lastMessage.sources,
-        };
-        const finalMessage: Message = {
-          sender: 'bot',
-          text: payload.answer || '답변을 받지 못했습니다.',
-          sources: payload.sources || [],
-        };
-        setMessages(prev => [...prev, finalMessage]);
-      }
+    if (message.type === 'final') {
+      const payload = message.payload || {
+        answer: message.response,
+        sources: message.sources,
+      };
+      const finalMessage: Message = {
+        sender: 'bot',
+        text: payload.answer || '답변을 받지 못했습니다.',
+        sources: payload.sources || [],
+      };
+      setMessages(prev => {
+        const last = prev[prev.length - 1];
+        const base = last && last.streaming ? prev.slice(0, -1) : prev;
+        return [...base, finalMessage];
+      });
     }
-  }, [lastMessage]);
+  }, []);
+
+  const { readyState, sendMessage } = useWebSocket(isOpen ? wsUrl : null, handleMessage);
 
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -17,14 +17,17 @@ export const useEventSource = (url: string | null) => {
       console.log('EventSource Connected');
     };
 
-    eventSource.onmessage = (event) => {
+    const handleEvent = (event: MessageEvent) => {
       const newData = JSON.parse(event.data);
       setData((prevData) => [newData, ...prevData]); // Prepend new data
     };
+    eventSource.onmessage = handleEvent;
+    // Alerts are sent as named `new_alert` events (docs/phase-4/alert-spec.md).
+    eventSource.addEventListener('new_alert', handleEvent as EventListener);
 
     eventSource.onerror = (error) => {
       console.error('EventSource failed:', error);
-      eventSource.close();
+      // Leave the source open so the browser reconnects and sends Last-Event-ID.
       setIsOpen(false);
     };
 
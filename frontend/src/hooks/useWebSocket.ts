@@ -17,10 +17,18 @@ export interface WebSocketMessage {
   detail?: string;
 }
 
-export const useWebSocket = (url: string | null) => {
+// `lastMessage` only holds the latest frame: frames that arrive back to back
+// (e.g. a replayed cached answer) can be batched into a single render. Pass
+// `onMessage` to see every frame.
+export const useWebSocket = (url: string | null, onMessage?: (message: WebSocketMessage) => void) => {
   const [lastMessage, setLastMessage] = useState<WebSocketMessage | null>(null);
   const [readyState, setReadyState] = useState<ReadyState>(ReadyState.CLOSED);
   const ws = useRef<WebSocket | null>(null);
+  const onMessageRef = useRef(onMessage);
+
+  useEffect(() => {
+    onMessageRef.current = onMessage;
+  }, [onMessage]);
 
   useEffect(() => {
     if (url) {
@@ -34,6 +42,7 @@ export const useWebSocket = (url: string | null) => {
 
       ws.current.onmessage = (event) => {
         const data = JSON.parse(event.data);
+        onMessageRef.current?.(data);
         setLastMessage(data);
       };
 